@@ -1,22 +1,21 @@
-import json
 from collections import Counter
 
-# Load marks and students data
-with open('public/data/marks.json', 'r', encoding='utf-8') as f:
-    marks = json.load(f)
+from data_store import get_store
 
-with open('public/data/students.json', 'r', encoding='utf-8') as f:
-    students = json.load(f)
+# Load marks and students data
+store = get_store()
+marks = store.marks
+students = store.students
 
 # Create student ID to name mapping
-student_map = {student['id']: student['name'] for student in students}
+student_map = {student_id: student['name'] for student_id, student in store.students_by_id.items()}
 
 print(f"📊 MARKS ANALYSIS")
 print(f"Total marks in marks.json: {len(marks)}")
 print(f"Total students in students.json: {len(students)}")
 
 # Count marks by student
-student_marks_count = Counter([mark['studentId'] for mark in marks])
+student_marks_count = {student_id: len(m) for student_id, m in store.marks_by_student.items() if m}
 print(f"\nUnique students with marks: {len(student_marks_count)}")
 
 print(f"\n📋 MARKS DISTRIBUTION BY STUDENT:")
@@ -25,8 +24,8 @@ for student_id, count in sorted(student_marks_count.items()):
     print(f"{student_id}: {count} marks - {student_name}")
 
 # Find students with marks but not in students.json
-marks_student_ids = set(mark['studentId'] for mark in marks)
-students_ids = set(student['id'] for student in students)
+marks_student_ids = set(student_marks_count)
+students_ids = set(store.students_by_id)
 
 orphaned_marks = marks_student_ids - students_ids
 missing_students = students_ids - marks_student_ids
@@ -3,29 +3,19 @@
 Analyze students with evaluations to find the missing 7 students
 """
 
-import json
+from data_store import get_store
 
 def main():
     # Load all data files
-    with open('public/data/marks.json', 'r', encoding='utf-8') as f:
-        marks = json.load(f)
-
-    with open('public/data/students.json', 'r', encoding='utf-8') as f:
-        students = json.load(f)
-
-    with open('public/data/groups.json', 'r', encoding='utf-8') as f:
-        groups = json.load(f)
-
-    with open('public/data/exams.json', 'r', encoding='utf-8') as f:
-        exams = json.load(f)
+    store = get_store()
+    marks = store.marks
+    students = store.students
 
     print('🔍 ANALYZING THE 7 MISSING STUDENTS')
     print('='*60)
 
     # Get students who have evaluations
-    students_with_marks = set()
-    for mark in marks:
-        students_with_marks.add(mark['studentId'])
+    students_with_marks = set(store.marks_by_student)
 
     print(f'📊 Students with evaluations: {len(students_with_marks)}')
     print(f'📊 Total students in database: {len(students)}')
@@ -35,10 +25,10 @@ def main():
     for student in students:
         if student['id'] in students_with_marks:
             # Get their marks
-            student_marks = [m for m in marks if m['studentId'] == student['id']]
+            student_marks = store.student_marks(student['id'])
             
             # Get their group info
-            group = next((g for g in groups if g['id'] == student.get('groupId')), None)
+            group = store.group(student.get('groupId'))
             
             analysis = {
                 'student': student,
@@ -68,7 +58,7 @@ def main():
         print(f'    📊 Evaluations: {len(marks)} marks')
         
         for mark in marks:
-            exam = next((e for e in exams if e['id'] == mark['examId']), None)
+            exam = store.exam(mark['examId'])
             exam_name = exam['name'] if exam else 'Unknown Exam'
             score = mark.get('score', 'No score')
             exam_id = mark.get('examId', 'No exam ID')
@@ -103,13 +93,13 @@ def main():
     
     print(f'📊 Students by Group:')
     for group_id, count in sorted(group_counts.items()):
-        group = next((g for g in groups if g['id'] == group_id), None)
+        group = store.group(group_id)
         group_name = group['name'] if group else 'Unknown'
         print(f'   {group_id} ({group_name}): {count} students')
     
     print(f'\n📊 Students by Exam:')
     for exam_id, count in sorted(exam_counts.items()):
-        exam = next((e for e in exams if e['id'] == exam_id), None)
+        exam = store.exam(exam_id)
         exam_name = exam['name'] if exam else 'Unknown'
         print(f'   {exam_id} ({exam_name}): {count} students')
 
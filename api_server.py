@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+API Server
+Small JSON API over the data store, so the web app can read and grade
+against live data on the local network instead of static files.
+
+Endpoints (all under /api):
+    GET  /groups                          groups with student counts
+    GET  /groups/<id>/students            students of a group (paginated)
+    GET  /groups/<id>/exams               exams available to a group
+    GET  /groups/<id>/marks               marks of a group's students (paginated)
+    GET  /students/<id>                   one student with their marks
+    GET  /students/<id>/marks             a student's marks
+    GET  /exams                           exams (?group=<id> to filter)
+    GET  /exams/<id>/marks                marks for an exam (paginated)
+    GET  /stats                           the same aggregates as analytics.json
+    PUT  /marks                           add or update a mark:
+                                          {"studentId", "examId", "score"}
+
+Lists take ?page=1&pageSize=100 and return {items, page, pageSize, total}.
+Responses carry an ETag and answer If-None-Match with 304, and are gzipped
+when the client accepts it. Marks are saved through the mark journal, and
+files changed by other scripts are picked up on the next request.
+
+The server only listens on this computer unless --host is given. PUT needs
+"Authorization: Bearer <token>"; the token is printed at startup (a new one
+each run unless --token or LMS_API_TOKEN sets it). Browsers may only call
+the API from the --origin pages (default: the local dev server).
+
+Usage:
+    python api_server.py                      # http://127.0.0.1:8765
+    python api_server.py --host 0.0.0.0 --origin http://192.168.1.20:5173 --token <secret>
+"""
+
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sys
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import mark_journal
+from build_analytics import build_analytics
+from data_store import DATA_DIR, DataStore, StaleDataError, file_version
+from grade_from_file import build_mark
+
+DEFAULT_PORT = 8765
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_ORIGINS = ('http://localhost:5173', 'http://127.0.0.1:5173')
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Responses smaller than this aren't worth compressing
+GZIP_MIN_BYTES = 1024
+
+
+def data_stamp(data_dir):
+    """Version of everything the store loads, to notice outside changes"""
+    files = [os.path.join(data_dir, f"{name}.json") for name in ('students', 'groups', 'exams', 'marks')]
+    return tuple(file_version(f) for f in files) + (mark_journal.journal_size(data_dir),)
+
+
+class ApiError(Exception):
+    """Error with an HTTP status, reported to the client as JSON"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Api:
+    """Request routing over a DataStore shared by all handler threads"""
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        self.lock = threading.Lock()
+        self.store = None
+        self.stamp = None
+        self.stats = None
+
+    def _fresh_store(self):
+        """The store, reloaded if another script changed the files (lock held)"""
+        stamp = data_stamp(self.data_dir)
+        if self.store is None or stamp != self.stamp:
+            self.store = DataStore(self.data_dir)
+            self.store.marks  # load (and index) everything now, not mid-request
+            self.store.students
+            self.store.groups
+            self.store.exams
+            self.stamp = stamp
+            self.stats = None
+        return self.store
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def get(self, path, query):
+        """JSON bytes for a GET (encoded while the lock is held, as PUTs
+        update marks in place)"""
+        with self.lock:
+            return encode(self._get(self._fresh_store(), path, query))
+
+    def _get(self, store, path, query):
+        parts = [p for p in path.split('/') if p]
+        if parts == ['groups']:
+            return [{**g, 'students': store.group_student_count(g.get('id'))} for g in store.groups]
+        if len(parts) == 3 and parts[0] == 'groups':
+            if store.group(parts[1]) is None:
+                raise ApiError(404, f"Unknown group {parts[1]}")
+            if parts[2] == 'students':
+                return paginate(store.group_students(parts[1]), query)
+            if parts[2] == 'exams':
+                return store.exams_for_group(parts[1])
+            if parts[2] == 'marks':
+                marks = [m for s in store.group_students(parts[1]) for m in store.student_marks(s.get('id'))]
+                return paginate(marks, query)
+        if len(parts) in (2, 3) and parts[0] == 'students':
+            student = store.student(parts[1])
+            if student is None:
+                raise ApiError(404, f"Unknown student {parts[1]}")
+            if len(parts) == 2:
+                return {**student, 'marks': list(store.student_marks(parts[1]))}
+            if parts[2] == 'marks':
+                return list(store.student_marks(parts[1]))
+        if parts == ['exams']:
+            group_id = first(query, 'group')
+            return store.exams_for_group(group_id) if group_id else store.exams
+        if len(parts) == 3 and parts[0] == 'exams' and parts[2] == 'marks':
+            if store.exam(parts[1]) is None:
+                raise ApiError(404, f"Unknown exam {parts[1]}")
+            return paginate(store.exam_marks(parts[1]), query)
+        if parts == ['stats']:
+            if self.stats is None:
+                self.stats = build_analytics(store)
+            return self.stats
+        raise ApiError(404, f"No such endpoint: {path}")
+
+    def put(self, path, body):
+        """Add or update a mark; returns (status, JSON bytes)"""
+        if path.strip('/') != 'marks':
+            raise ApiError(404, f"No such endpoint: {path}")
+        if not isinstance(body, dict):
+            raise ApiError(400, "Expected a JSON object")
+
+        with self.lock:
+            store = self._fresh_store()
+            student = store.student(body.get('studentId'))
+            exam = store.exam(body.get('examId'))
+            if student is None:
+                raise ApiError(422, f"Unknown student {body.get('studentId')}")
+            if exam is None:
+                raise ApiError(422, f"Unknown exam {body.get('examId')}")
+            try:
+                score = float(body.get('score'))
+            except (TypeError, ValueError):
+                raise ApiError(422, f"Score {body.get('score')!r} is not a number")
+            max_score = exam.get('maxScore') or 0
+            if not 0 <= score <= max_score:
+                raise ApiError(422, f"Score {score:g} is outside 0-{max_score} for {exam.get('name', exam['id'])}")
+
+            mark, existing = build_mark(store, student, exam, score, datetime.now())
+            store.upsert_mark(mark)
+            try:
+                store.save('marks')
+            except StaleDataError as e:
+                self.store = None
+                raise ApiError(409, str(e))
+            self.stamp = data_stamp(self.data_dir)
+            self.stats = None
+            return (200 if existing else 201), encode(mark)
+
+
+def encode(data):
+    """Compact JSON bytes"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def first(query, name, default=None):
+    """First value of a query-string parameter"""
+    return query.get(name, [default])[0]
+
+
+def paginate(items, query):
+    """Slice a list by ?page= and ?pageSize="""
+    try:
+        page = max(int(first(query, 'page', 1)), 1)
+        page_size = min(max(int(first(query, 'pageSize', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        raise ApiError(400, "page and pageSize must be numbers")
+    start = (page - 1) * page_size
+    return {'items': list(items[start:start + page_size]), 'page': page, 'pageSize': page_size, 'total': len(items)}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """HTTP layer: ETags, gzip, CORS and the write token"""
+
+    api = None
+    allowed_origins = DEFAULT_ORIGINS
+    token = None
+    server_version = "StudentLMSAPI/1.0"
+
+    def _send(self, status, payload, conditional=False):
+        gzipped = len(payload) >= GZIP_MIN_BYTES and 'gzip' in self.headers.get('Accept-Encoding', '')
+        # The gzipped bytes differ, so they get their own (strong) ETag
+        etag = f'"{hashlib.sha256(payload).hexdigest()[:20]}{"-gzip" if gzipped else ""}"'
+        if conditional and etag in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+            self._cors()
+            self.end_headers()
+            return
+
+        if gzipped:
+            payload = gzip.compress(payload, compresslevel=6)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self._cors()
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _cors(self):
+        # Only the allowed pages get an Allow-Origin header - never '*'
+        origin = self.headers.get('Origin')
+        if origin in self.allowed_origins:
+            self.send_header('Access-Control-Allow-Origin', origin)
+            self.send_header('Vary', 'Origin')
+            self.send_header('Access-Control-Expose-Headers', 'ETag')
+
+    def _authorize(self):
+        scheme, _, given = self.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not hmac.compare_digest(given.strip().encode(), self.token.encode()):
+            raise ApiError(401, "Missing or wrong API token")
+
+    def _route(self):
+        url = urlparse(self.path)
+        if not url.path.startswith('/api/'):
+            raise ApiError(404, f"No such endpoint: {url.path}")
+        return url.path[len('/api'):], parse_qs(url.query)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._cors()
+        self.send_header('Access-Control-Allow-Methods', 'GET, PUT, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Authorization, Content-Type, If-None-Match')
+        self.end_headers()
+
+    def do_GET(self):
+        try:
+            path, query = self._route()
+            self._send(200, self.api.get(path, query), conditional=True)
+        except ApiError as e:
+            self._send(e.status, encode({'error': e.message}))
+
+    def do_PUT(self):
+        try:
+            path, _ = self._route()
+            self._authorize()
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+            except ValueError:
+                raise ApiError(400, "Content-Length is not a number")
+            if length < 0:
+                raise ApiError(400, "Content-Length can't be negative")
+            try:
+                body = json.loads(self.rfile.read(length) or b'null')
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                raise ApiError(400, "Body is not valid JSON")
+            status, payload = self.api.put(path, body)
+            self._send(status, payload)
+        except ApiError as e:
+            self._send(e.status, encode({'error': e.message}))
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    port = DEFAULT_PORT
+    host = DEFAULT_HOST
+    if '--port' in args:
+        port = int(args[args.index('--port') + 1])
+    if '--host' in args:
+        host = args[args.index('--host') + 1]
+    if '--origin' in args:
+        ApiHandler.allowed_origins = tuple(args[args.index('--origin') + 1].split(','))
+    if '--token' in args:
+        ApiHandler.token = args[args.index('--token') + 1]
+    ApiHandler.token = ApiHandler.token or os.environ.get('LMS_API_TOKEN') or secrets.token_urlsafe(24)
+
+    ApiHandler.api = Api()
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    print("🌐 STUDENT LMS API")
+    print("=" * 50)
+    print(f"📡 Serving {DATA_DIR} on http://{host}:{port}/api/")
+    print(f"🌍 Allowed origins: {', '.join(ApiHandler.allowed_origins)}")
+    print(f"🔑 Token for saving marks: {ApiHandler.token}")
+    print("💡 Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped")
+    finally:
+        server.server_close()
+        # Saved marks are journaled; fold them into marks.json for the website
+        mark_journal.compact_pending(DataStore(ApiHandler.api.data_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Backup Store
+Content-addressed, deduplicated backups for the public/data JSON files.
+
+Every record of a collection (one student, one mark, ...) is keyed by the
+SHA-256 of its JSON and stored once. A snapshot is one gzip file under
+backups/<collection>/ holding the ordered record hashes - usually as a
+delta against the previous snapshot, with a full keyframe every few
+versions - plus only the records that snapshot introduced. An unchanged
+file produces no new snapshot, so disk usage and write time follow the
+amount of change rather than the number of runs.
+
+Usage:
+    python backup_store.py snapshot marks            # Back up marks.json now
+    python backup_store.py list [collection]         # List snapshots
+    python backup_store.py restore marks <id|time>   # Restore a snapshot or point in time
+    python backup_store.py prune                     # Apply the retention policy
+    python backup_store.py import-legacy             # Ingest old *_backup_* copies
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+
+from data_store import DATA_DIR, file_lock, load_json, save_json
+
+BACKUP_DIR = "backups"
+
+# Retention: always keep the newest KEEP_LAST snapshots of a collection,
+# plus the newest snapshot of each day for KEEP_DAYS days
+KEEP_LAST = 20
+KEEP_DAYS = 60
+
+# Store a full manifest after this many deltas so restores stay short
+KEYFRAME_EVERY = 10
+
+
+class BackupStore:
+    """Snapshots of data collections backed by deduplicated record objects"""
+
+    def __init__(self, backup_dir=BACKUP_DIR, data_dir=DATA_DIR):
+        self.backup_dir = backup_dir
+        self.data_dir = data_dir
+        self.index_file = os.path.join(backup_dir, "index.json")
+        self._index = None
+        self._hash_cache = {}
+
+    # ------------------------------------------------------------------
+    # Index of snapshots ({collection: [entry, ...]} in creation order)
+    # ------------------------------------------------------------------
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = load_json(self.index_file, default={})
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.backup_dir, exist_ok=True)
+        temp_file = f"{self.index_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2, ensure_ascii=False)
+        os.replace(temp_file, self.index_file)
+
+    def snapshots(self, collection):
+        """Snapshot entries of a collection, oldest first"""
+        return self.index.get(collection, [])
+
+    def find(self, collection, snapshot_id):
+        for entry in self.snapshots(collection):
+            if entry['id'] == snapshot_id:
+                return entry
+        return None
+
+    # ------------------------------------------------------------------
+    # Snapshot files
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def encode(record):
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def _snapshot_path(self, collection, snapshot_id):
+        return os.path.join(self.backup_dir, collection, f"{snapshot_id}.json.gz")
+
+    def _write_snapshot(self, collection, snapshot_id, content):
+        path = self._snapshot_path(collection, snapshot_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_file = f"{path}.tmp"
+        with gzip.open(temp_file, 'wt', encoding='utf-8') as f:
+            json.dump(content, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_file, path)
+
+    def _read_snapshot(self, collection, snapshot_id):
+        with gzip.open(self._snapshot_path(collection, snapshot_id), 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def hashes(self, collection, snapshot_id):
+        """Ordered record hashes of a snapshot (resolving deltas)"""
+        key = (collection, snapshot_id)
+        if key in self._hash_cache:
+            return self._hash_cache[key]
+
+        content = self._read_snapshot(collection, snapshot_id)
+        if content.get('base') is None:
+            result = content['hashes']
+        else:
+            base = self.hashes(collection, content['base'])
+            result = []
+            for op in content['ops']:
+                if 'copy' in op:
+                    start, end = op['copy']
+                    result.extend(base[start:end])
+                else:
+                    result.extend(op['add'])
+        self._hash_cache[key] = result
+        return result
+
+    @staticmethod
+    def delta(base, hashes):
+        """Linear-time delta of hashes against base as copy/add runs"""
+        position = {}
+        for i, digest in enumerate(base):
+            position.setdefault(digest, i)
+
+        ops = []
+        for digest in hashes:
+            i = position.get(digest)
+            last = ops[-1] if ops else None
+            if i is None:
+                if last and 'add' in last:
+                    last['add'].append(digest)
+                else:
+                    ops.append({'add': [digest]})
+            elif last and 'copy' in last and last['copy'][1] == i:
+                last['copy'][1] = i + 1
+            else:
+                ops.append({'copy': [i, i + 1]})
+        return ops
+
+    # ------------------------------------------------------------------
+    # Snapshot / restore
+    # ------------------------------------------------------------------
+
+    def snapshot(self, collection, data, label="", created_at=None):
+        """Store data as a new snapshot of a collection
+
+        Returns the snapshot entry, or the latest entry unchanged if the
+        data is identical to it.
+        """
+        is_list = isinstance(data, list)
+        records = data if is_list else [data]
+        payloads = [self.encode(record) for record in records]
+        hashes = [hashlib.sha256(payload).hexdigest() for payload in payloads]
+        digest = hashlib.sha256(''.join(hashes).encode('ascii')).hexdigest()
+
+        entries = self.index.setdefault(collection, [])
+        latest = entries[-1] if entries else None
+        if created_at and latest and created_at.isoformat(timespec='seconds') < latest['createdAt']:
+            # Back-dated snapshots (legacy imports) are stored standalone
+            latest = None
+        if latest and latest['digest'] == digest:
+            return latest
+
+        created_at = created_at or datetime.now()
+        snapshot_id = f"{created_at.strftime('%Y%m%d_%H%M%S')}_{digest[:8]}"
+        if self.find(collection, snapshot_id):
+            return self.find(collection, snapshot_id)
+
+        # Only records missing from the previous snapshot are stored
+        base_hashes = self.hashes(collection, latest['id']) if latest else []
+        known = set(base_hashes)
+        objects = {}
+        for record, record_hash in zip(records, hashes):
+            if record_hash not in known:
+                objects[record_hash] = record
+                known.add(record_hash)
+
+        depth = latest['depth'] + 1 if latest else 0
+        if latest is None or depth >= KEYFRAME_EVERY:
+            content = {'base': None, 'hashes': hashes}
+            depth = 0
+        else:
+            content = {'base': latest['id'], 'ops': self.delta(base_hashes, hashes)}
+        content['list'] = is_list
+        content['objects'] = objects
+        self._write_snapshot(collection, snapshot_id, content)
+        self._hash_cache[(collection, snapshot_id)] = hashes
+
+        entry = {
+            'id': snapshot_id,
+            'createdAt': created_at.isoformat(timespec='seconds'),
+            'digest': digest,
+            'base': content['base'],
+            'depth': depth,
+            'records': len(hashes),
+            'newRecords': len(objects),
+            'list': is_list,
+        }
+        if label:
+            entry['label'] = label
+        entries.append(entry)
+        # Legacy imports can be older than existing snapshots
+        entries.sort(key=lambda e: e['createdAt'])
+        self._save_index()
+        return entry
+
+    def snapshot_file(self, collection, label=""):
+        """Back up public/data/<collection>.json as it is on disk"""
+        path = os.path.join(self.data_dir, f"{collection}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        with file_lock(self.index_file):
+            # Another process may have added snapshots since we read the index
+            self._index = None
+            entry = self.snapshot(collection, data, label=label)
+            self.prune(collection)
+        return entry
+
+    def resolve(self, collection, when):
+        """Snapshot entry for an id, or the latest one at/before a time"""
+        entry = self.find(collection, when)
+        if entry:
+            return entry
+        try:
+            moment = datetime.fromisoformat(when)
+        except ValueError:
+            return None
+        candidates = [e for e in self.snapshots(collection)
+                      if datetime.fromisoformat(e['createdAt']) <= moment]
+        return candidates[-1] if candidates else None
+
+    def load(self, collection, snapshot_id):
+        """Rebuild the data of a snapshot"""
+        hashes = self.hashes(collection, snapshot_id)
+        missing = set(hashes)
+        found = {}
+
+        # A record lives in the snapshot that introduced it, which is
+        # never newer than the snapshots referring to it
+        entries = self.snapshots(collection)
+        position = next(i for i, e in enumerate(entries) if e['id'] == snapshot_id)
+        for entry in reversed(entries[:position + 1]):
+            objects = self._read_snapshot(collection, entry['id'])['objects']
+            for record_hash in missing.intersection(objects):
+                found[record_hash] = objects[record_hash]
+            missing.difference_update(objects)
+            if not missing:
+                break
+
+        records = [found[h] for h in hashes]
+        if not entries[position].get('list', True):
+            return records[0] if records else {}
+        return records
+
+    def restore(self, collection, when):
+        """Write a snapshot back to public/data/<collection>.json
+
+        The current file is snapshotted first so a restore can be undone.
+        """
+        entry = self.resolve(collection, when)
+        if entry is None:
+            return None
+        data = self.load(collection, entry['id'])
+        self.snapshot_file(collection, label=f"before restore of {entry['id']}")
+        filepath = os.path.join(self.data_dir, f"{collection}.json")
+        with file_lock(filepath):
+            save_json(filepath, data)
+            if collection == 'marks':
+                # The restored snapshot replaces any journaled edits
+                import mark_journal
+                mark_journal.clear(self.data_dir)
+        return entry
+
+    # ------------------------------------------------------------------
+    # Retention and eviction
+    # ------------------------------------------------------------------
+
+    def retained(self, collection, now=None):
+        """Ids kept by the retention policy"""
+        entries = self.snapshots(collection)
+        keep = {e['id'] for e in entries[-KEEP_LAST:]}
+        cutoff = (now or datetime.now()) - timedelta(days=KEEP_DAYS)
+        newest_per_day = {}
+        for entry in entries:
+            created = datetime.fromisoformat(entry['createdAt'])
+            if created >= cutoff:
+                newest_per_day[created.date()] = entry['id']
+        keep.update(newest_per_day.values())
+        return keep
+
+    def prune(self, collection=None, now=None):
+        """Evict snapshots outside the retention policy
+
+        Records still referenced by a kept snapshot move into the oldest
+        kept snapshot that uses them; everything else is dropped.
+        """
+        collections = [collection] if collection else list(self.index)
+        evicted = 0
+        for name in collections:
+            entries = self.snapshots(name)
+            keep = self.retained(name, now)
+            if len(keep) == len(entries):
+                continue
+
+            # Resolve every chain before any file changes
+            for entry in entries:
+                self.hashes(name, entry['id'])
+
+            orphaned = {}
+            for entry in entries:
+                content = self._read_snapshot(name, entry['id'])
+                if entry['id'] not in keep:
+                    orphaned.update(content['objects'])
+                    os.remove(self._snapshot_path(name, entry['id']))
+                    self._hash_cache.pop((name, entry['id']), None)
+                    evicted += 1
+                    continue
+
+                changed = False
+                adopted = orphaned.keys() & set(self.hashes(name, entry['id']))
+                if adopted:
+                    content['objects'].update({h: orphaned.pop(h) for h in adopted})
+                    changed = True
+                if entry['base'] is not None and entry['base'] not in keep:
+                    # Its base is gone, so it becomes a keyframe
+                    content['hashes'] = self.hashes(name, entry['id'])
+                    content['base'] = None
+                    content.pop('ops', None)
+                    entry['base'] = None
+                    changed = True
+                if changed:
+                    self._write_snapshot(name, entry['id'], content)
+
+            self.index[name] = [e for e in entries if e['id'] in keep]
+            by_id = {e['id']: e for e in self.index[name]}
+            for entry in self.index[name]:
+                depth, base = 0, entry['base']
+                while base is not None:
+                    depth, base = depth + 1, by_id[base]['base']
+                entry['depth'] = depth
+
+        if evicted:
+            self._save_index()
+        return evicted
+
+    # ------------------------------------------------------------------
+    # Legacy timestamped copies
+    # ------------------------------------------------------------------
+
+    LEGACY_PATTERNS = [
+        re.compile(r'^(students|marks|exams)\.json\.backup_(\d{8}_\d{6})$'),
+        re.compile(r'^(students|marks|exams)_backup_(?:cleanup_)?(\d{8}_\d{6})\.json$'),
+    ]
+
+    def legacy_backups(self):
+        """(timestamp, collection, path) of old full-copy backups, oldest first"""
+        found = []
+        if not os.path.isdir(self.data_dir):
+            return found
+        for filename in os.listdir(self.data_dir):
+            for pattern in self.LEGACY_PATTERNS:
+                match = pattern.match(filename)
+                if match:
+                    moment = datetime.strptime(match.group(2), '%Y%m%d_%H%M%S')
+                    found.append((moment, match.group(1), os.path.join(self.data_dir, filename)))
+                    break
+        return sorted(found)
+
+    def import_legacy(self, remove=False):
+        """Ingest old backup copies as snapshots, optionally deleting them"""
+        imported = []
+        for moment, collection, path in self.legacy_backups():
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entry = self.snapshot(collection, data, label=os.path.basename(path), created_at=moment)
+            imported.append((path, entry))
+            # Only delete once the snapshot round-trips to the same data
+            if remove and self.load(collection, entry['id']) == data:
+                os.remove(path)
+        return imported
+
+
+_stores = {}
+
+
+def get_backup_store(backup_dir=BACKUP_DIR, data_dir=DATA_DIR):
+    """Shared backup store (created on first use)"""
+    key = (backup_dir, data_dir)
+    if key not in _stores:
+        _stores[key] = BackupStore(backup_dir, data_dir)
+    return _stores[key]
+
+
+def backup_file(collection, data_dir=DATA_DIR, label=""):
+    """Snapshot a data file before it is overwritten and report it"""
+    store = get_backup_store(data_dir=data_dir)
+    previous = store.snapshots(collection)[-1:]
+    entry = store.snapshot_file(collection, label=label)
+    if entry is None:
+        return None
+    if previous and previous[0]['id'] == entry['id']:
+        print(f"📦 Backup unchanged: {collection}@{entry['id']}")
+    else:
+        print(f"📦 Backup snapshot: {collection}@{entry['id']} ({entry['newRecords']} new records)")
+    return entry
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    command = args[0] if args else 'list'
+    store = get_backup_store()
+
+    if command == 'snapshot' and len(args) >= 2:
+        for collection in args[1:]:
+            if backup_file(collection) is None:
+                print(f"❌ Error: {os.path.join(store.data_dir, collection + '.json')} not found")
+    elif command == 'list':
+        collections = args[1:] or sorted(store.index)
+        if not collections:
+            print("📭 No backups yet.")
+        for collection in collections:
+            print(f"\n📚 {collection}:")
+            print(f"{'Snapshot':<26} {'Created':<20} {'Records':<8} {'New':<6} {'Label'}")
+            print("-" * 80)
+            for entry in store.snapshots(collection):
+                print(f"{entry['id']:<26} {entry['createdAt']:<20} {entry['records']:<8} "
+                      f"{entry['newRecords']:<6} {entry.get('label', '')}")
+    elif command == 'restore' and len(args) == 3:
+        collection, when = args[1], args[2]
+        entry = store.restore(collection, when)
+        if entry is None:
+            print(f"❌ No {collection} snapshot matches '{when}'")
+            sys.exit(1)
+        print(f"✅ Restored {collection}.json from snapshot {entry['id']} ({entry['records']} records)")
+    elif command == 'prune':
+        with file_lock(store.index_file):
+            evicted = store.prune()
+        print(f"🧹 Evicted {evicted} snapshot(s) outside the retention policy")
+    elif command == 'import-legacy':
+        with file_lock(store.index_file):
+            imported = store.import_legacy(remove='--remove' in args)
+        for path, entry in imported:
+            print(f"📥 {path} → {entry['id']}")
+        print(f"✅ Imported {len(imported)} legacy backup file(s)")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Build Analytics
+Precomputes the numbers shown on the dashboard pages into
+public/data/analytics.json so the browser doesn't have to download every
+mark and aggregate them itself.
+
+Contents:
+    totals       - student/group/exam/mark counts, institute averages
+    levels       - marks per performance band (90/70/50)
+    groups       - per-group averages and evaluation rates, best first
+    exams        - per-exam averages and score distributions, best first
+    students     - per-student average percentage and mark count
+
+analytics.json is not committed: publish_data.py builds it before every
+deploy, and on the dev server src/utils/analytics.js computes the same
+figures from the data files (keep the two in step).
+
+To look at the figures locally:
+    python build_analytics.py
+"""
+
+import os
+
+from data_store import get_store, load_json, save_json
+
+ANALYTICS_FILE = "analytics.json"
+
+# Lower bounds of the performance bands used on the dashboard
+LEVELS = (('excellent', 90), ('good', 70), ('average', 50), ('needsImprovement', 0))
+
+# Width of the score distribution buckets, in percent
+BUCKET_WIDTH = 10
+
+
+def mark_percentage(mark):
+    """Percentage of a mark as a number (marks store it as text, e.g. '44.3')"""
+    try:
+        return float(mark.get('percentage'))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def average(values):
+    """Mean rounded to one decimal, 0 when empty"""
+    return round(sum(values) / len(values), 1) if values else 0
+
+
+def level_of(percentage):
+    """Name of the performance band a percentage falls in"""
+    for name, lower in LEVELS:
+        if percentage >= lower:
+            return name
+    return LEVELS[-1][0]
+
+
+def distribution(percentages):
+    """Count of percentages per BUCKET_WIDTH bucket, 100% in the last one"""
+    buckets = [0] * (100 // BUCKET_WIDTH)
+    for value in percentages:
+        index = min(max(int(value // BUCKET_WIDTH), 0), len(buckets) - 1)
+        buckets[index] += 1
+    return buckets
+
+
+def build_analytics(store):
+    """Aggregate the store's data in a single pass over the marks"""
+    students, groups, exams, marks = store.students, store.groups, store.exams, store.marks
+    config = load_json(os.path.join(store.data_dir, 'teaching_config.json'), default={})
+    active_groups = config.get('activeGroups', []) if isinstance(config, dict) else []
+
+    group_of_student = {s.get('id'): s.get('groupId') for s in students}
+    by_group = {}
+    by_exam = {}
+    by_student = {}
+    levels = {name: 0 for name, _ in LEVELS}
+    percentages = []
+    scores = []
+
+    for mark in marks:
+        percentage = mark_percentage(mark)
+        percentages.append(percentage)
+        scores.append(mark.get('score') or 0)
+        levels[level_of(percentage)] += 1
+        by_exam.setdefault(mark.get('examId'), []).append(percentage)
+        by_student.setdefault(mark.get('studentId'), []).append(percentage)
+        group_id = group_of_student.get(mark.get('studentId'))
+        if group_id is not None:
+            by_group.setdefault(group_id, []).append(percentage)
+
+    group_stats = []
+    for group in groups:
+        student_count = store.group_student_count(group.get('id'))
+        group_marks = by_group.get(group.get('id'), [])
+        possible = student_count * len(exams)
+        group_stats.append({
+            'id': group.get('id'),
+            'name': group.get('name'),
+            'studentCount': student_count,
+            'avgScore': average(group_marks),
+            'evaluations': len(group_marks),
+            'evaluationRate': round(len(group_marks) / possible * 100, 1) if possible else 0
+        })
+    group_stats.sort(key=lambda g: g['avgScore'], reverse=True)
+
+    exam_stats = []
+    for exam in exams:
+        exam_marks = by_exam.get(exam.get('id'), [])
+        exam_stats.append({
+            'id': exam.get('id'),
+            'name': exam.get('name'),
+            'type': exam.get('type'),
+            'maxScore': exam.get('maxScore'),
+            'date': exam.get('date'),
+            'avgScore': average(exam_marks),
+            'participantCount': len(exam_marks),
+            'assignedToGroups': len(exam['assignedGroups']) if exam.get('assignedGroups') else len(groups),
+            'distribution': distribution(exam_marks)
+        })
+    exam_stats.sort(key=lambda e: e['avgScore'], reverse=True)
+
+    student_stats = {
+        student_id: {'average': average(values), 'evaluated': len(values)}
+        for student_id, values in by_student.items()
+    }
+
+    return {
+        'totals': {
+            'students': len(students),
+            'activeStudents': sum(1 for s in students if str(s.get('groupId', '')).lower() in active_groups),
+            'groups': len(groups),
+            'exams': len(exams),
+            'evaluations': len(marks),
+            'overallAverage': average(percentages),
+            'averageScore': average(scores)
+        },
+        'levels': levels,
+        'bucketWidth': BUCKET_WIDTH,
+        'groups': group_stats,
+        'exams': exam_stats,
+        'students': student_stats
+    }
+
+
+def main():
+    """Main function"""
+    print("📊 BUILDING ANALYTICS")
+    print("=" * 50)
+
+    store = get_store()
+    analytics = build_analytics(store)
+    output_path = os.path.join(store.data_dir, ANALYTICS_FILE)
+    save_json(output_path, analytics)
+
+    totals = analytics['totals']
+    print(f"   • Students: {totals['students']} ({totals['activeStudents']} in active groups)")
+    print(f"   • Groups: {totals['groups']}")
+    print(f"   • Exams: {totals['exams']}")
+    print(f"   • Marks: {totals['evaluations']}")
+    print(f"   • Institute average: {totals['overallAverage']}%")
+    print(f"\n✅ Saved to: {output_path} ({os.path.getsize(output_path):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Build Group Shards
+Splits students and marks into one folder per group so a page showing a
+single group only downloads that group's data:
+
+    public/data/groups/manifest.json          counts and content hashes
+    public/data/groups/<groupId>/students.json
+    public/data/groups/<groupId>/marks.json
+
+Marks are placed with their student's group. Shards whose content hasn't
+changed are not rewritten, and folders of groups that no longer have any
+students are removed.
+
+The shards are not committed: publish_data.py builds them before every
+deploy, and the dev server reads students.json and marks.json themselves,
+so they can't go stale.
+
+To look at the shards locally:
+    python build_group_shards.py
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+from data_store import get_store, save_json
+
+SHARDS_DIR = "groups"
+MANIFEST_FILE = "manifest.json"
+
+
+def serialize(data):
+    """Shard bytes, in the same formatting as save_json"""
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def content_hash(payload):
+    """Short content hash used to tell whether a shard changed"""
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def write_if_changed(filepath, payload):
+    """Write bytes unless the file already holds them; returns True if written"""
+    try:
+        with open(filepath, 'rb') as f:
+            if f.read() == payload:
+                return False
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, 'wb') as f:
+        f.write(payload)
+    return True
+
+
+def build_shards(store):
+    """Group students and marks by groupId
+
+    Returns ({groupId: {'students': [...], 'marks': [...]}}, unassigned_students,
+    unassigned_marks). Groups from groups.json get a shard even when they are
+    empty; students without a groupId, and marks of unknown or such students,
+    are left out and counted.
+    """
+    shards = {g.get('id'): {'students': [], 'marks': []} for g in store.groups if g.get('id')}
+    unassigned_students = 0
+    for group_id, students in store.students_by_group.items():
+        if not group_id:
+            unassigned_students += len(students)
+            continue
+        shards.setdefault(group_id, {'students': [], 'marks': []})['students'] = list(students)
+
+    unassigned = 0
+    for mark in store.marks:
+        student = store.student(mark.get('studentId'))
+        if student is None or not student.get('groupId'):
+            unassigned += 1
+            continue
+        shards[student.get('groupId')]['marks'].append(mark)
+    return shards, unassigned_students, unassigned
+
+
+def write_shards(store):
+    """Write every shard and the manifest; returns (manifest, files_written)"""
+    shards_dir = os.path.join(store.data_dir, SHARDS_DIR)
+    shards, unassigned_students, unassigned = build_shards(store)
+
+    manifest = {
+        'totals': {
+            'groups': len(shards),
+            'students': len(store.students),
+            'marks': len(store.marks),
+            'unassignedStudents': unassigned_students,
+            'unassignedMarks': unassigned
+        },
+        'groups': {}
+    }
+    written = 0
+    for group_id, shard in shards.items():
+        group = store.group(group_id) or {}
+        entry = {'name': group.get('name', group_id)}
+        for name in ('students', 'marks'):
+            payload = serialize(shard[name])
+            entry[name] = len(shard[name])
+            entry[f'{name}Hash'] = content_hash(payload)
+            if write_if_changed(os.path.join(shards_dir, group_id, f"{name}.json"), payload):
+                written += 1
+        manifest['groups'][group_id] = entry
+
+    # Drop folders of groups that no longer exist
+    if os.path.isdir(shards_dir):
+        for name in os.listdir(shards_dir):
+            path = os.path.join(shards_dir, name)
+            if os.path.isdir(path) and name not in shards:
+                shutil.rmtree(path)
+
+    save_json(os.path.join(shards_dir, MANIFEST_FILE), manifest)
+    return manifest, written
+
+
+def main():
+    """Main function"""
+    print("🧩 BUILDING GROUP SHARDS")
+    print("=" * 50)
+
+    store = get_store()
+    manifest, written = write_shards(store)
+
+    print(f"{'Group ID':<15} {'Students':<10} {'Marks':<8}")
+    print("-" * 35)
+    for group_id, entry in manifest['groups'].items():
+        print(f"{group_id:<15} {entry['students']:<10} {entry['marks']:<8}")
+
+    totals = manifest['totals']
+    if totals['unassignedStudents']:
+        print(f"\n⚠️ {totals['unassignedStudents']} students have no group and were left out")
+    if totals['unassignedMarks']:
+        print(f"\n⚠️ {totals['unassignedMarks']} marks belong to unknown or ungrouped students and were left out")
+    print(f"\n✅ {len(manifest['groups'])} groups, {written} shard files updated")
+    print(f"📁 Manifest: {os.path.join(store.data_dir, SHARDS_DIR, MANIFEST_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Build Syllabus Chunks
+Splits each syllabus into a small index and one file per unit, so the
+Syllabus page only downloads a unit's weekly and daily plans when the unit
+is opened:
+
+    public/data/syllabi/<syllabus>/index.json         courseInfo + unit headers
+    public/data/syllabi/<syllabus>/units/<unitId>.json  one whole unit
+
+A unit header keeps what the overview shows (title, description, dates,
+phonics groups, grammar focus, ...) plus "weeks", the week numbers of its
+weekly plan, and "chunk", the data file holding the whole unit. The bulky
+fields in BODY_FIELDS are only in the unit files.
+
+Like the group shards, unchanged files are not rewritten and units that no
+longer exist are removed. The chunks are not committed: publish_data.py
+builds them before every deploy, and the dev server reads the syllabus
+files themselves, so they can't go stale.
+
+To look at the chunks locally:
+    python build_syllabus_chunks.py
+"""
+
+import os
+import re
+
+from build_group_shards import serialize, write_if_changed
+from data_store import DATA_DIR, load_json
+
+SYLLABUS_FILES = ("syllabus.json", "syllabus_new.json", "syllabus_jolly_phonics.json")
+CHUNKS_DIR = "syllabi"
+INDEX_FILE = "index.json"
+
+# Unit fields only needed once a unit is opened
+BODY_FIELDS = ('weeklyPlan', 'objectives', 'learning_objectives', 'grammar_groups',
+               'highlights', 'resources', 'visual_style')
+
+
+def chunk_name(unit_id):
+    """File name of a unit ('unit4' -> 'unit4.json')"""
+    return re.sub(r'[^\w-]', '_', str(unit_id)) + '.json'
+
+
+def unit_header(unit, chunk):
+    """Index entry of a unit: everything but BODY_FIELDS, plus weeks and chunk"""
+    header = {key: value for key, value in unit.items() if key not in BODY_FIELDS}
+    header['weeks'] = [week.get('week') for week in unit.get('weeklyPlan') or []]
+    header['chunk'] = chunk
+    return header
+
+
+def split_syllabus(syllabus, folder):
+    """(index, {file name: unit}) of one syllabus; folder is relative to public/data"""
+    units = {}
+    headers = []
+    for unit in syllabus.get('units', []):
+        name = chunk_name(unit.get('id'))
+        units[name] = unit
+        headers.append(unit_header(unit, f"{folder}/units/{name}"))
+    index = {key: value for key, value in syllabus.items() if key != 'units'}
+    index['units'] = headers
+    return index, units
+
+
+def write_chunks(data_dir=DATA_DIR):
+    """Split every syllabus; returns [(file, units, index bytes, whole bytes, files written)]"""
+    results = []
+    for filename in SYLLABUS_FILES:
+        source = os.path.join(data_dir, filename)
+        syllabus = load_json(source)
+        if not isinstance(syllabus, dict):
+            continue  # missing or not valid JSON
+
+        folder = f"{CHUNKS_DIR}/{os.path.splitext(filename)[0]}"
+        index, units = split_syllabus(syllabus, folder)
+        units_dir = os.path.join(data_dir, folder, 'units')
+
+        written = 0
+        for name, unit in units.items():
+            if write_if_changed(os.path.join(units_dir, name), serialize(unit)):
+                written += 1
+        # Drop files of units that were removed or renamed
+        for name in os.listdir(units_dir) if os.path.isdir(units_dir) else []:
+            if name not in units:
+                os.remove(os.path.join(units_dir, name))
+
+        payload = serialize(index)
+        index_path = os.path.join(data_dir, folder, INDEX_FILE)
+        if write_if_changed(index_path, payload):
+            written += 1
+        results.append((filename, len(units), len(payload), os.path.getsize(source), written))
+    return results
+
+
+def main():
+    """Main function"""
+    print("📚 BUILDING SYLLABUS CHUNKS")
+    print("=" * 50)
+
+    results = write_chunks()
+    if not results:
+        print("❌ No syllabus files found")
+        return
+
+    print(f"{'Syllabus':<30} {'Units':>5} {'Index':>10} {'Whole file':>11}")
+    print("-" * 60)
+    for filename, units, index_size, whole_size, _ in results:
+        print(f"{filename:<30} {units:>5} {index_size:>8,} B {whole_size:>9,} B")
+    print(f"\n✅ {sum(r[1] for r in results)} units, {sum(r[4] for r in results)} files updated")
+    print(f"📁 Chunks: {os.path.join(DATA_DIR, CHUNKS_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,16 @@ Clean up marks.json:
 2. Handle duplicates for remaining missing students
 """
 
-import json
-from datetime import datetime
+from backup_store import get_backup_store
+from data_store import file_lock, get_store
 
 def main():
     print('🧹 CLEANING UP MARKS DATA')
     print('='*50)
     
     # Load marks data
-    with open('public/data/marks.json', 'r', encoding='utf-8') as f:
-        marks = json.load(f)
+    store = get_store()
+    marks = list(store.marks)
     
     print(f'📊 Original marks count: {len(marks)}')
     
@@ -93,17 +93,17 @@ def main():
     print(f'• Removed placement duplicates: {removed_duplicates}')
     print(f'• Final marks: {len(marks_to_keep)}')
     
-    # Create backup
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_file = f'public/data/marks_backup_cleanup_{timestamp}.json'
-    
-    with open(backup_file, 'w', encoding='utf-8') as f:
-        json.dump(marks, f, indent=2, ensure_ascii=False)
-    print(f'💾 Backup created: {backup_file}')
+    # Create backup (of the marks as loaded, journal included), holding the
+    # backup index lock like backup_file does
+    backups = get_backup_store(data_dir=store.data_dir)
+    with file_lock(backups.index_file):
+        entry = backups.snapshot('marks', marks, label='cleanup')
+        backups.prune('marks')
+    print(f'💾 Backup created: marks@{entry["id"]}')
     
     # Save cleaned marks
-    with open('public/data/marks.json', 'w', encoding='utf-8') as f:
-        json.dump(marks_to_keep, f, indent=2, ensure_ascii=False)
+    store.replace('marks', marks_to_keep)
+    store.save('marks')
     
     print(f'✅ Cleaned marks.json saved!')
     
@@ -4,41 +4,19 @@ Create Exam Script
 This script helps you create exam entries in the JSON database
 """
 
-import json
-import os
 from datetime import datetime
 import uuid
 
-def load_data():
-    """Load existing data from JSON files"""
-    try:
-        with open('public/data/students.json', 'r', encoding='utf-8') as f:
-            students = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        students = []
-
-    try:
-        with open('public/data/groups.json', 'r', encoding='utf-8') as f:
-            groups = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        groups = []
+from backup_store import backup_file
+from data_store import get_store
 
-    try:
-        with open('public/data/exams.json', 'r', encoding='utf-8') as f:
-            exams = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        exams = []
-
-    return students, groups, exams
+def load_data():
+    """Load existing data through the shared data store"""
+    return get_store()
 
 def create_backup():
     """Create backup of existing exams.json"""
-    if os.path.exists('public/data/exams.json'):
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_name = f'public/data/exams_backup_{timestamp}.json'
-        import shutil
-        shutil.copy2('public/data/exams.json', backup_name)
-        print(f"📋 Created backup: {backup_name}")
+    backup_file('exams')
 
 def display_groups(groups):
     """Display available groups"""
@@ -160,7 +138,7 @@ def get_exam_input(groups):
         'assignedGroups': assigned_groups
     }
 
-def save_exam(exam_data, exams):
+def save_exam(exam_data, store):
     """Save exam to JSON file"""
     # Generate unique ID
     exam_id = f"exam_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
@@ -188,8 +166,8 @@ def save_exam(exam_data, exams):
         # No specific groups - exam available to all (don't set assignedGroups field)
         print(f"✅ Created exam '{exam_data['name']}' for all groups")
     
-    exams.append(new_exam)
-    return exams
+    store.add_exam(new_exam)
+    return store.exams
 
 def main():
     """Main function"""
@@ -199,7 +177,8 @@ def main():
     
     try:
         # Load existing data
-        students, groups, exams = load_data()
+        store = load_data()
+        students, groups, exams = store.students, store.groups, store.exams
         
         print(f"\n📊 Current System Status:")
         print(f"   • Students: {len(students)}")
@@ -229,12 +208,10 @@ def main():
         confirm = input("\n✅ Create this exam? (y/N): ").strip().lower()
         if confirm in ['y', 'yes']:
             # Save exam
-            updated_exams = save_exam(exam_data, exams)
+            updated_exams = save_exam(exam_data, store)
             
             # Write to file
-            os.makedirs('public/data', exist_ok=True)
-            with open('public/data/exams.json', 'w', encoding='utf-8') as f:
-                json.dump(updated_exams, f, indent=2, ensure_ascii=False)
+            store.save('exams')
             
             print(f"\n🎉 SUCCESS! Exam created successfully!")
             print(f"📁 Saved to: public/data/exams.json")
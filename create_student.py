@@ -5,46 +5,44 @@ Student Creation Script for Black Gold Training Institute
 Creates new students in the student management system
 """
 
-import json
 import os
 from datetime import datetime
-import re
+
+from backup_store import backup_file
+from data_store import get_store
+from id_allocator import IdAllocator
+
+def default_position(group_id):
+    """Position given to new students of a group when none is entered"""
+    if group_id == 'nesma':
+        return "Online Training"
+    return "Vocational Training"
 
 class StudentCreator:
     def __init__(self):
-        self.data_dir = "public/data"
-        self.students_file = os.path.join(self.data_dir, "students.json")
-        self.groups_file = os.path.join(self.data_dir, "groups.json")
+        self.store = get_store()
+        self.allocator = IdAllocator(self.store)
+        self.data_dir = self.store.data_dir
+        self.students_file = self.store.path('students')
+        self.groups_file = self.store.path('groups')
         
         # Load existing data
-        self.students = self.load_json(self.students_file)
-        self.groups = self.load_json(self.groups_file)
+        self.students = self.store.students
+        self.groups = self.store.groups
         
-    def load_json(self, filepath):
-        """Load JSON data from file"""
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            print(f"❌ Error: {filepath} not found!")
-            return []
-        except json.JSONDecodeError:
-            print(f"❌ Error: Invalid JSON in {filepath}")
-            return []
+        for filepath in (self.students_file, self.groups_file):
+            if not os.path.exists(filepath):
+                print(f"❌ Error: {filepath} not found!")
     
-    def save_json(self, data, filepath):
-        """Save JSON data to file with backup"""
+    def save_students(self):
+        """Save students.json with backup"""
+        filepath = self.students_file
         try:
             # Create backup
-            backup_path = f"{filepath}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            if os.path.exists(filepath):
-                import shutil
-                shutil.copy2(filepath, backup_path)
-                print(f"📦 Backup created: {backup_path}")
+            backup_file('students', self.data_dir)
             
             # Save new data
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self.store.save('students')
             return True
         except Exception as e:
             print(f"❌ Error saving {filepath}: {e}")
@@ -57,126 +55,29 @@ class StudentCreator:
             group_list.append({
                 'id': group['id'],
                 'name': group['name'],
-                'students_count': len([s for s in self.students if s['groupId'] == group['id']])
+                'students_count': self.store.group_student_count(group['id'])
             })
         return group_list
     
     def get_next_student_id(self, group_id):
-        """Get the next available student ID for a group"""
-        if group_id == 'nesma':
-            # For NESMA group: n001, n002, etc.
-            nesma_students = [s for s in self.students if s['groupId'] == 'nesma']
-            if not nesma_students:
-                return 'n001'
-            
-            # Find highest number
-            max_num = 0
-            for student in nesma_students:
-                match = re.search(r'n(\d+)', student['id'])
-                if match:
-                    max_num = max(max_num, int(match.group(1)))
-            return f"n{max_num + 1:03d}"
-        
-        elif group_id.startswith('saipem'):
-            # For SAIPEM groups: find next studentId number
-            group_students = [s for s in self.students if s['groupId'] == group_id]
-            if not group_students:
-                return "1"
-            
-            # Find highest studentId number
-            max_num = 0
-            for student in group_students:
-                try:
-                    num = int(student['studentId'])
-                    max_num = max(max_num, num)
-                except ValueError:
-                    continue
-            return str(max_num + 1)
-        
-        elif group_id.startswith('alfa'):
-            # For ALFA groups: alfa2_001, alfa2_002, etc.
-            group_students = [s for s in self.students if s['groupId'] == group_id]
-            if not group_students:
-                return f"{group_id}_001"
-            
-            # Find highest number
-            max_num = 0
-            for student in group_students:
-                match = re.search(rf'{group_id}_(\d+)', student['id'])
-                if match:
-                    max_num = max(max_num, int(match.group(1)))
-            return f"{group_id}_{max_num + 1:03d}"
-        
-        elif group_id == 'deye':
-            # For DEYE group: deye_001, deye_002, etc.
-            deye_students = [s for s in self.students if s['groupId'] == 'deye']
-            if not deye_students:
-                return "deye_001"
-            
-            # Find highest number
-            max_num = 0
-            for student in deye_students:
-                match = re.search(r'deye_(\d+)', student['id'])
-                if match:
-                    max_num = max(max_num, int(match.group(1)))
-            return f"deye_{max_num + 1:03d}"
-        
-        else:
-            # General case: s001, s002, etc.
-            all_s_students = [s for s in self.students if s['id'].startswith('s') and s['id'][1:].isdigit()]
-            if not all_s_students:
-                return "s001"
-            
-            # Find highest number
-            max_num = 0
-            for student in all_s_students:
-                match = re.search(r's(\d+)', student['id'])
-                if match:
-                    max_num = max(max_num, int(match.group(1)))
-            return f"s{max_num + 1:03d}"
+        """Get the next available student ID for a group (not reserved yet)"""
+        return self.allocator.peek(group_id)[0][1]
     
     def create_student(self, name, group_id, email="", position=""):
         """Create a new student"""
         # Validate group
-        valid_groups = [g['id'] for g in self.groups]
-        if group_id not in valid_groups:
+        if self.store.group(group_id) is None:
+            valid_groups = [g['id'] for g in self.groups]
             print(f"❌ Invalid group ID: {group_id}")
             print(f"Available groups: {', '.join(valid_groups)}")
             return False
         
-        # Generate IDs
-        student_id = self.get_next_student_id(group_id)
-        
-        # Generate internal ID based on group
-        if group_id == 'nesma':
-            internal_id = student_id  # n001, n002, etc.
-        elif group_id.startswith('saipem'):
-            # Find next s019_new sequence
-            existing_news = [s for s in self.students if s['id'].startswith('s019_new')]
-            if existing_news:
-                max_new_num = 0
-                for student in existing_news:
-                    match = re.search(r's019_new(\d*)', student['id'])
-                    if match:
-                        num_str = match.group(1)
-                        if num_str == '':
-                            max_new_num = max(max_new_num, 1)
-                        else:
-                            max_new_num = max(max_new_num, int(num_str))
-                internal_id = f"s019_new{max_new_num + 1}"
-            else:
-                internal_id = "s019_new"
-        else:
-            internal_id = student_id
+        # Preview IDs - they are reserved when the student is added
+        internal_id, student_id = self.allocator.peek(group_id)[0]
         
         # Set default position based on group
         if not position:
-            if group_id == 'nesma':
-                position = "Online Training"
-            elif 'saipem' in group_id:
-                position = "Vocational Training"
-            else:
-                position = "Vocational Training"
+            position = default_position(group_id)
         
         # Create student object
         new_student = {
@@ -194,26 +95,22 @@ class StudentCreator:
     
     def add_student(self, student_data):
         """Add student to the students list"""
-        # Check for duplicates
-        for existing in self.students:
-            if existing['name'] == student_data['name'] and existing['groupId'] == student_data['groupId']:
+        # Check for duplicates (only students of the same group can clash)
+        for existing in self.store.group_students(student_data['groupId']):
+            if existing['name'] == student_data['name']:
                 print(f"⚠️  Warning: Student '{student_data['name']}' already exists in {student_data['groupId']}")
                 response = input("Continue anyway? (y/n): ").lower()
                 if response != 'y':
                     return False
         
-        # Find insertion point (after last student of the same group)
-        insert_index = len(self.students)
-        for i in range(len(self.students) - 1, -1, -1):
-            if self.students[i]['groupId'] == student_data['groupId']:
-                insert_index = i + 1
-                break
+        # Reserve the IDs now (another script may have taken the previewed ones)
+        student_data['id'], student_data['studentId'] = self.allocator.reserve(student_data['groupId'])[0]
         
-        # Insert student
-        self.students.insert(insert_index, student_data)
+        # Insert student (after last student of the same group)
+        self.store.add_student(student_data)
         
         # Save to file
-        if self.save_json(self.students, self.students_file):
+        if self.save_students():
             print(f"✅ Student added successfully!")
             print(f"   Name: {student_data['name']}")
             print(f"   ID: {student_data['id']}")
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Shared Data Store
+Loads the JSON data files once and keeps hash indexes over them so the
+scripts can look up students, marks and exams without scanning the lists.
+
+Usage:
+    from data_store import get_store
+
+    store = get_store()
+    student = store.student('n001')
+    mark = store.mark_for('n001', exam_id)
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import mark_journal
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DATA_DIR = "public/data"
+
+# Index attribute -> collection that builds it
+INDEX_OWNERS = {
+    'students_by_id': 'students',
+    'students_by_group': 'students',
+    'groups_by_id': 'groups',
+    'exams_by_id': 'exams',
+    'exams_by_group': 'exams',
+    'open_exams': 'exams',
+    'marks_by_id': 'marks',
+    'marks_by_key': 'marks',
+    'marks_by_exam': 'marks',
+    'marks_by_student': 'marks',
+}
+
+
+class StaleDataError(Exception):
+    """A data file changed on disk after it was loaded"""
+
+
+def file_version(filepath):
+    """Cheap version stamp of a file (None if missing)
+
+    Every save replaces the file, so the inode changes along with the
+    size and modification time.
+    """
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def read_json(filepath, default=None):
+    """Load JSON data and the version stamp of exactly what was read
+
+    Returns (data, version); data is default if the file is missing or
+    invalid.
+    """
+    default = [] if default is None else default
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            stat = os.fstat(f.fileno())
+            version = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            try:
+                return json.load(f), version
+            except json.JSONDecodeError:
+                print(f"❌ Error: Invalid JSON in {filepath}")
+                return default, version
+    except FileNotFoundError:
+        return default, None
+
+
+def load_json(filepath, default=None):
+    """Load JSON data from file, returning default if missing or invalid"""
+    return read_json(filepath, default)[0]
+
+
+def save_json(filepath, data):
+    """Write JSON data to file in the repo's formatting
+
+    The data goes to a temporary file that is flushed to disk and then
+    replaces the original, so a crash mid-write leaves either the old or
+    the new file, never a half-written one.
+    """
+    directory = os.path.dirname(filepath) or '.'
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    if fcntl is not None:
+        # Make the rename itself durable
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+# Locks this process holds -> nesting depth, so file_lock can be re-entered
+_held_locks = {}
+
+
+@contextmanager
+def file_lock(path, timeout=30):
+    """Exclusive advisory lock on path + '.lock' while the block runs
+
+    Other processes using file_lock on the same path wait their turn; the
+    same process can nest it.
+    """
+    lock_path = os.path.abspath(f"{path}.lock")
+    if lock_path in _held_locks:
+        _held_locks[lock_path] += 1
+        try:
+            yield
+        finally:
+            _held_locks[lock_path] -= 1
+        return
+
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    with open(lock_path, 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Timed out waiting for lock on {path}")
+                    time.sleep(0.05)
+        _held_locks[lock_path] = 1
+        try:
+            yield
+        finally:
+            del _held_locks[lock_path]
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class DataStore:
+    """In-memory view of public/data with lazily built indexes
+
+    Saves are safe with several scripts running at once: each collection
+    is written under a file lock, and only if the file on disk is still
+    the version that was loaded (otherwise StaleDataError is raised).
+    Marks are the exception - journaled mark changes are merged with
+    changes other scripts saved in the meantime.
+    """
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        self._students = None
+        self._groups = None
+        self._exams = None
+        self._marks = None
+        self._pending_mark_events = []
+        self._marks_replaced = False
+        self._journal_offset = 0
+        self._versions = {}
+
+    def __getattr__(self, name):
+        # Indexes are built when their collection is first loaded
+        owner = INDEX_OWNERS.get(name)
+        if owner is None:
+            raise AttributeError(name)
+        getattr(self, owner)
+        return self.__dict__[name]
+
+    def path(self, name):
+        """Full path of a data file, e.g. path('marks') -> public/data/marks.json"""
+        return os.path.join(self.data_dir, f"{name}.json")
+
+    # ------------------------------------------------------------------
+    # Collections (each file is parsed at most once)
+    # ------------------------------------------------------------------
+
+    @property
+    def students(self):
+        if self._students is None:
+            self._students, self._versions['students'] = read_json(self.path('students'))
+            self._index_students()
+        return self._students
+
+    @property
+    def groups(self):
+        if self._groups is None:
+            self._groups, self._versions['groups'] = read_json(self.path('groups'))
+            self.groups_by_id = {g.get('id'): g for g in self._groups}
+        return self._groups
+
+    @property
+    def exams(self):
+        if self._exams is None:
+            self._exams, self._versions['exams'] = read_json(self.path('exams'))
+            self._index_exams()
+        return self._exams
+
+    @property
+    def marks(self):
+        if self._marks is None:
+            with file_lock(self.path('marks')):
+                self._load_marks()
+        return self._marks
+
+    def _load_marks(self):
+        """Snapshot plus journal (call with the marks lock held)"""
+        self._marks, self._versions['marks'] = read_json(self.path('marks'))
+        self._index_marks()
+        self._journal_offset = mark_journal.replay(self)
+
+    def marks_source(self):
+        """(marks.json version, journal offset) the loaded marks reflect"""
+        self.marks
+        return self._versions.get('marks'), self._journal_offset
+
+    # ------------------------------------------------------------------
+    # Index builders
+    # ------------------------------------------------------------------
+
+    def _index_students(self):
+        self.students_by_id = {}
+        self.students_by_group = {}
+        for student in self._students:
+            self.students_by_id.setdefault(student.get('id'), student)
+            self.students_by_group.setdefault(student.get('groupId'), []).append(student)
+
+    def _index_exams(self):
+        self.exams_by_id = {}
+        self.exams_by_group = {}
+        self.open_exams = []
+        for exam in self._exams:
+            self.exams_by_id[exam.get('id')] = exam
+            assigned = exam.get('assignedGroups') or []
+            if exam.get('groupId'):
+                # Legacy single-group exams
+                assigned = list(assigned) + [exam['groupId']]
+            if not assigned:
+                self.open_exams.append(exam)
+            for group_id in dict.fromkeys(assigned):
+                self.exams_by_group.setdefault(group_id, []).append(exam)
+
+    def _index_marks(self):
+        self.marks_by_id = {}
+        self.marks_by_key = {}
+        self.marks_by_exam = {}
+        self.marks_by_student = {}
+        for mark in self._marks:
+            self._index_mark(mark)
+
+    def _index_mark(self, mark):
+        key = (mark.get('studentId'), mark.get('examId'))
+        self.marks_by_id[mark.get('id')] = mark
+        self.marks_by_key.setdefault(key, mark)
+        self.marks_by_exam.setdefault(mark.get('examId'), []).append(mark)
+        self.marks_by_student.setdefault(mark.get('studentId'), []).append(mark)
+
+    def _unindex_mark(self, mark):
+        key = (mark.get('studentId'), mark.get('examId'))
+        self.marks_by_id.pop(mark.get('id'), None)
+        if self.marks_by_key.get(key) is mark:
+            del self.marks_by_key[key]
+        for index, value in ((self.marks_by_exam, mark.get('examId')),
+                             (self.marks_by_student, mark.get('studentId'))):
+            bucket = index.get(value, [])
+            for i, existing in enumerate(bucket):
+                if existing is mark:
+                    del bucket[i]
+                    break
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def student(self, student_id):
+        """Student record by internal id"""
+        return self.students_by_id.get(student_id)
+
+    def group(self, group_id):
+        """Group record by id"""
+        return self.groups_by_id.get(group_id)
+
+    def exam(self, exam_id):
+        """Exam record by id"""
+        return self.exams_by_id.get(exam_id)
+
+    def group_students(self, group_id):
+        """Students enrolled in a group, in file order"""
+        return self.students_by_group.get(group_id, [])
+
+    def group_student_count(self, group_id):
+        """Number of students enrolled in a group"""
+        return len(self.group_students(group_id))
+
+    def exams_for_group(self, group_id):
+        """Exams available to a group, in file order
+
+        An exam is available if it has no assignedGroups (open to all),
+        lists the group in assignedGroups, or has a matching legacy groupId.
+        """
+        available = {id(e) for e in self.open_exams}
+        available.update(id(e) for e in self.exams_by_group.get(group_id, []))
+        return [e for e in self._exams if id(e) in available]
+
+    def mark_for(self, student_id, exam_id):
+        """Mark for a (student, exam) pair, or None"""
+        return self.marks_by_key.get((student_id, exam_id))
+
+    def exam_marks(self, exam_id):
+        """All marks recorded for an exam"""
+        return self.marks_by_exam.get(exam_id, [])
+
+    def student_marks(self, student_id):
+        """All marks recorded for a student"""
+        return self.marks_by_student.get(student_id, [])
+
+    # ------------------------------------------------------------------
+    # Mutations (indexes are kept in sync)
+    # ------------------------------------------------------------------
+
+    def add_student(self, student):
+        """Insert a student after the last student of the same group"""
+        students = self.students
+        group_students = self.students_by_group.get(student['groupId'])
+        insert_index = len(students)
+        if group_students:
+            last = group_students[-1]
+            for i in range(len(students) - 1, -1, -1):
+                if students[i] is last:
+                    insert_index = i + 1
+                    break
+        students.insert(insert_index, student)
+        self.students_by_id.setdefault(student['id'], student)
+        self.students_by_group.setdefault(student['groupId'], []).append(student)
+        return student
+
+    def add_students(self, new_students):
+        """Insert many students at once, each after the last of its group
+
+        One pass over the list however many students are added.
+        """
+        students = self.students
+        by_group = {}
+        for student in new_students:
+            by_group.setdefault(student['groupId'], []).append(student)
+        after = {
+            id(self.students_by_group[group_id][-1]): group_id
+            for group_id in by_group if self.students_by_group.get(group_id)
+        }
+
+        merged = []
+        for student in students:
+            merged.append(student)
+            if id(student) in after:
+                merged.extend(by_group[after.pop(id(student))])
+        for group_id, group_new in by_group.items():
+            if not self.students_by_group.get(group_id):
+                merged.extend(group_new)
+        students[:] = merged
+
+        for student in new_students:
+            self.students_by_id.setdefault(student['id'], student)
+            self.students_by_group.setdefault(student['groupId'], []).append(student)
+        return new_students
+
+    def move_student(self, student, new_group_id):
+        """Move a student to another group and re-position it in the list"""
+        students = self.students
+        for i, existing in enumerate(students):
+            if existing is student:
+                del students[i]
+                break
+        self.students_by_group[student['groupId']] = [
+            s for s in self.students_by_group.get(student['groupId'], []) if s is not student
+        ]
+        self.students_by_id.pop(student['id'], None)
+        student['groupId'] = new_group_id
+        return self.add_student(student)
+
+    def add_exam(self, exam):
+        """Append a new exam"""
+        self.exams.append(exam)
+        self._index_exams()
+        return exam
+
+    def upsert_mark(self, mark, journal=True):
+        """Add a mark, or replace the existing mark for the same (student, exam)
+
+        Returns the previous mark (a copy) if one was replaced, else None.
+        With journal=True the change is queued for the next save('marks').
+        """
+        existing = self.marks_by_key.get((mark['studentId'], mark['examId']))
+        if existing is None:
+            existing = self.marks_by_id.get(mark.get('id'))
+        if journal:
+            op = 'add' if existing is None else 'update'
+            self._pending_mark_events.append(mark_journal.make_event(op, dict(mark)))
+        if existing is None:
+            self._marks.append(mark)
+            self._index_mark(mark)
+            return None
+
+        previous = dict(existing)
+        self._unindex_mark(existing)
+        existing.clear()
+        existing.update(mark)
+        self._index_mark(existing)
+        return previous
+
+    def delete_mark(self, mark_id, journal=True):
+        """Remove a mark by id, returning it (or None if not found)"""
+        mark = self.marks_by_id.get(mark_id)
+        if mark is None:
+            return None
+        if journal:
+            self._pending_mark_events.append(mark_journal.make_event('delete', mark_id=mark_id))
+        self._unindex_mark(mark)
+        for i, existing in enumerate(self._marks):
+            if existing is mark:
+                del self._marks[i]
+                break
+        return mark
+
+    def replace(self, name, data):
+        """Replace a whole collection (e.g. after a cleanup) and re-index it"""
+        setattr(self, f"_{name}", data)
+        {
+            'students': self._index_students,
+            'exams': self._index_exams,
+            'marks': self._index_marks,
+        }.get(name, lambda: None)()
+        if name == 'groups':
+            self.groups_by_id = {g.get('id'): g for g in data}
+        if name == 'marks':
+            # A replaced collection can't be expressed as journal events
+            self._pending_mark_events = []
+            self._marks_replaced = True
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, name):
+        """Persist changes to one collection
+
+        Marks are appended to the mark journal (cost grows with the change,
+        not the dataset); other collections rewrite public/data/<name>.json.
+        """
+        if name != 'marks' or self._marks_replaced:
+            return self.write_snapshot(name)
+
+        with file_lock(self.path('marks')):
+            self._sync_marks()
+            mark_journal.append_events(self.data_dir, self._pending_mark_events)
+            self._pending_mark_events = []
+            self._journal_offset = mark_journal.journal_size(self.data_dir)
+        if mark_journal.count_events(self.data_dir) >= mark_journal.COMPACT_THRESHOLD:
+            mark_journal.compact(self)
+        return mark_journal.journal_path(self.data_dir)
+
+    def write_snapshot(self, name):
+        """Rewrite public/data/<name>.json from memory"""
+        path = self.path(name)
+        getattr(self, name)  # load it before taking the lock
+        with file_lock(path):
+            if name == 'marks' and not self._marks_replaced:
+                self._sync_marks()
+            else:
+                self._check_version(name)
+            save_json(path, getattr(self, name))
+            self._versions[name] = file_version(path)
+            if name == 'marks':
+                mark_journal.clear(self.data_dir)
+                self._journal_offset = 0
+                self._pending_mark_events = []
+                self._marks_replaced = False
+        return path
+
+    def _check_version(self, name):
+        """Raise StaleDataError if the file changed since it was loaded"""
+        if name not in self._versions:
+            return  # never loaded - the caller replaces it outright
+        path = self.path(name)
+        changed = file_version(path) != self._versions[name]
+        if name == 'marks':
+            changed = changed or mark_journal.journal_size(self.data_dir) != self._journal_offset
+        if changed:
+            raise StaleDataError(f"{path} was changed by another program after it was loaded - "
+                                 f"nothing was saved, run the command again")
+
+    def _sync_marks(self):
+        """Bring in mark changes other scripts saved since we loaded
+        (call with the marks lock held)
+
+        Our own unsaved changes are re-applied on top, so they win.
+        """
+        offset = self._journal_offset
+        if file_version(self.path('marks')) != self._versions.get('marks'):
+            # Another script compacted the journal - start from its snapshot
+            self._load_marks()
+        else:
+            self._journal_offset = mark_journal.replay(self, offset)
+            if self._journal_offset == offset:
+                return
+        for event in self._pending_mark_events:
+            mark_journal.apply_event(self, event)
+
+
+_stores = {}
+
+
+def get_store(data_dir=DATA_DIR):
+    """Shared store for a data directory (created on first use)"""
+    if data_dir not in _stores:
+        _stores[data_dir] = DataStore(data_dir)
+    return _stores[data_dir]
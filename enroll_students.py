@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Enroll Students
+Adds a whole cohort from a roster file (CSV or XLSX) in one go, instead of
+running create_student.py once per trainee.
+
+The file needs a name column; email, position and groupId columns are
+optional (--group sets the group for the whole file). Every row is checked
+before anything is written: known group, non-empty name, and no name that
+is already enrolled in the group or appears twice in the file (names are
+compared after the same normalization as student_search.py, so spelling
+variants like أسمة/أسمه count as the same name).
+
+IDs for all new students are reserved in one batch (see id_allocator.py),
+then students.json is backed up once and written once.
+
+Usage:
+    python enroll_students.py saipem7.xlsx --group saipem7
+    python enroll_students.py roster.csv --group sam3 --skip-existing
+    python enroll_students.py roster.csv --dry-run
+"""
+
+import os
+import sys
+from datetime import datetime
+
+from backup_store import backup_file
+from create_student import default_position
+from data_store import get_store
+from grade_from_file import read_rows
+from id_allocator import IdAllocator
+from student_search import normalize
+
+# Accepted spellings of each column, after lowercasing and dropping spaces/underscores
+COLUMN_ALIASES = {
+    'name': ('name', 'studentname', 'fullname', 'الاسم', 'اسمالطالب'),
+    'email': ('email', 'e-mail', 'mail'),
+    'position': ('position', 'jobtitle', 'title'),
+    'groupId': ('groupid', 'group'),
+}
+
+
+def validate_rows(store, rows, default_group_id=None, skip_existing=False):
+    """Validate all rows in one pass
+
+    Returns (valid_rows, skipped, errors); valid_rows are (row, group_id)
+    and skipped are (line, row) already enrolled in their group.
+    """
+    valid = []
+    skipped = []
+    errors = []
+    enrolled = {}
+    seen = {}
+
+    for line, row in enumerate(rows, 2):  # line 1 is the header
+        group_id = row.get('groupId') or default_group_id
+        if not group_id:
+            errors.append(f"line {line}: no group - add a groupId column or pass --group")
+            continue
+        if store.group(group_id) is None:
+            errors.append(f"line {line}: unknown group '{group_id}'")
+            continue
+
+        name = ' '.join(row.get('name', '').split())
+        if not name:
+            errors.append(f"line {line}: empty name")
+            continue
+        row['name'] = name
+
+        if group_id not in enrolled:
+            enrolled[group_id] = {normalize(s.get('name', '')): s for s in store.group_students(group_id)}
+        key = (group_id, normalize(name))
+        existing = enrolled[group_id].get(key[1])
+        if existing is not None:
+            if skip_existing:
+                skipped.append((line, row))
+            else:
+                errors.append(f"line {line}: {name} is already enrolled in {group_id} as {existing['id']}")
+            continue
+        if key in seen:
+            errors.append(f"line {line}: duplicate of line {seen[key]} ({name})")
+            continue
+        seen[key] = line
+        valid.append((row, group_id))
+
+    return valid, skipped, errors
+
+
+def build_students(store, valid_rows):
+    """Student records for the valid rows, with IDs reserved per group"""
+    allocator = IdAllocator(store)
+    by_group = {}
+    for row, group_id in valid_rows:
+        by_group.setdefault(group_id, []).append(row)
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    students = []
+    for group_id, rows in by_group.items():
+        for row, (internal_id, student_id) in zip(rows, allocator.reserve(group_id, len(rows))):
+            students.append({
+                "id": internal_id,
+                "name": row['name'],
+                "studentId": student_id,
+                "groupId": group_id,
+                "email": row.get('email', ''),
+                "subject": "English",
+                "position": row.get('position') or default_position(group_id),
+                "dateEnrolled": today
+            })
+    return students
+
+
+def enroll_students(filepath, group_id=None, skip_existing=False, dry_run=False, store=None):
+    """Validate and enroll every student in a roster file; returns True on success"""
+    store = store or get_store()
+    rows, columns = read_rows(filepath, COLUMN_ALIASES)
+
+    if 'name' not in columns:
+        print("❌ The file needs a name column.")
+        return False
+    if 'groupId' not in columns and not group_id:
+        print("❌ No groupId column - pass the group with --group GROUP_ID.")
+        return False
+    if not rows:
+        print("❌ No rows found.")
+        return False
+
+    valid, skipped, errors = validate_rows(store, rows, group_id, skip_existing)
+    if errors:
+        print(f"❌ {len(errors)} invalid row(s) - nothing was saved:")
+        for error in errors:
+            print(f"   • {error}")
+        return False
+
+    for line, row in skipped:
+        print(f"⏭️  line {line}: {row['name']} is already enrolled - skipped")
+    if not valid:
+        print("✅ Nothing new to enroll.")
+        return True
+
+    if dry_run:
+        preview = IdAllocator(store)
+        counts = {}
+        for _, row_group in valid:
+            counts[row_group] = counts.get(row_group, 0) + 1
+        for row_group, count in counts.items():
+            ids = preview.peek(row_group, count)
+            print(f"📋 {row_group}: {count} new student(s), IDs {ids[0][0]} … {ids[-1][0]}")
+        print("🔍 Dry run - nothing was saved.")
+        return True
+
+    students = build_students(store, valid)
+    backup_file('students', store.data_dir)
+    store.add_students(students)
+    saved_path = store.save('students')
+
+    print(f"{'ID':<12} {'No.':<10} {'Name':<45} {'Group':<12}")
+    print("-" * 80)
+    for student in students:
+        print(f"{student['id']:<12} {student['studentId']:<10} {student['name'][:44]:<45} {student['groupId']:<12}")
+    print(f"\n✅ Enrolled {len(students)} student(s), skipped {len(skipped)}")
+    print(f"📁 Saved to: {saved_path}")
+    return True
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    group_id = None
+    skip_existing = False
+    dry_run = False
+    filepath = None
+
+    while args:
+        arg = args.pop(0)
+        if arg == '--group' and args:
+            group_id = args.pop(0)
+        elif arg == '--skip-existing':
+            skip_existing = True
+        elif arg == '--dry-run':
+            dry_run = True
+        elif filepath is None and not arg.startswith('--'):
+            filepath = arg
+        else:
+            filepath = None
+            break
+
+    if not filepath:
+        print(__doc__)
+        sys.exit(1)
+    if not os.path.exists(filepath):
+        print(f"❌ File not found: {filepath}")
+        sys.exit(1)
+
+    print("🎓 BULK ENROLLMENT")
+    print("=" * 50)
+    if not enroll_students(filepath, group_id, skip_existing, dry_run):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,49 +4,17 @@ Evaluate Students Script
 This script helps you add or edit student marks for exams
 """
 
-import json
-import os
 from datetime import datetime
 import uuid
 
-def load_data():
-    """Load existing data from JSON files"""
-    try:
-        with open('public/data/students.json', 'r', encoding='utf-8') as f:
-            students = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        students = []
-
-    try:
-        with open('public/data/groups.json', 'r', encoding='utf-8') as f:
-            groups = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        groups = []
-
-    try:
-        with open('public/data/exams.json', 'r', encoding='utf-8') as f:
-            exams = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        exams = []
-
-    try:
-        with open('public/data/marks.json', 'r', encoding='utf-8') as f:
-            marks = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        marks = []
+import mark_journal
+from data_store import get_store
 
-    return students, groups, exams, marks
-
-def create_backup():
-    """Create backup of existing marks.json"""
-    if os.path.exists('public/data/marks.json'):
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_name = f'public/data/marks_backup_{timestamp}.json'
-        import shutil
-        shutil.copy2('public/data/marks.json', backup_name)
-        print(f"📋 Created backup: {backup_name}")
+def load_data():
+    """Load existing data through the shared data store"""
+    return get_store()
 
-def display_groups(groups, students):
+def display_groups(groups, store):
     """Display available groups"""
     if not groups:
         print("❌ No groups found in the system.")
@@ -59,14 +27,14 @@ def display_groups(groups, students):
     
     for i, group in enumerate(groups, 1):
         # Count students in this group
-        students_count = len([s for s in students if s.get('groupId') == group.get('id')])
+        students_count = store.group_student_count(group.get('id'))
         print(f"{i:<4} {group.get('id', 'N/A'):<15} {group.get('name', 'N/A'):<25} {students_count:<10}")
     
     return groups
 
-def select_group(groups, students):
+def select_group(groups, store):
     """Let user select a group"""
-    available_groups = display_groups(groups, students)
+    available_groups = display_groups(groups, store)
     if not available_groups:
         return None
     
@@ -82,22 +50,13 @@ def select_group(groups, students):
         except (ValueError, IndexError):
             print("❌ Invalid input. Please try again.")
 
-def display_exams(exams, group_id=None):
+def display_exams(store, group_id=None):
     """Display available exams for a group"""
-    # Filter exams for the selected group
+    # Filter exams for the selected group (see DataStore.exams_for_group)
     if group_id:
-        available_exams = []
-        for exam in exams:
-            # Exam is available if:
-            # 1. It has no assignedGroups (available to all), OR
-            # 2. It has assignedGroups and includes this group_id, OR  
-            # 3. Legacy: it has groupId that matches (backward compatibility)
-            if (not exam.get('assignedGroups') and not exam.get('groupId')) or \
-               (exam.get('assignedGroups') and group_id in exam.get('assignedGroups', [])) or \
-               (exam.get('groupId') == group_id):
-                available_exams.append(exam)
+        available_exams = store.exams_for_group(group_id)
     else:
-        available_exams = exams
+        available_exams = store.exams
     
     if not available_exams:
         print("❌ No exams found for this group.")
@@ -113,9 +72,9 @@ def display_exams(exams, group_id=None):
     
     return available_exams
 
-def select_exam(exams, group_id):
+def select_exam(store, group_id):
     """Let user select an exam"""
-    available_exams = display_exams(exams, group_id)
+    available_exams = display_exams(store, group_id)
     if not available_exams:
         return None
     
@@ -131,12 +90,12 @@ def select_exam(exams, group_id):
         except (ValueError, IndexError):
             print("❌ Invalid input. Please try again.")
 
-def get_students_in_group(students, group_id):
+def get_students_in_group(store, group_id):
     """Get students in the selected group"""
-    group_students = [s for s in students if s.get('groupId') == group_id]
+    group_students = store.group_students(group_id)
     return sorted(group_students, key=lambda x: x.get('name', ''))
 
-def display_students(students, exam_id, marks):
+def display_students(students, exam_id, store):
     """Display students with their current marks if any"""
     if not students:
         print("❌ No students found in this group.")
@@ -149,7 +108,7 @@ def display_students(students, exam_id, marks):
     
     for i, student in enumerate(students, 1):
         # Check if student already has a mark for this exam
-        existing_mark = next((m for m in marks if m.get('studentId') == student.get('id') and m.get('examId') == exam_id), None)
+        existing_mark = store.mark_for(student.get('id'), exam_id)
         
         current_mark = "Not evaluated"
         if existing_mark:
@@ -170,7 +129,7 @@ def display_students(students, exam_id, marks):
             # Fallback if there are encoding issues
             print(f"{i:<4} {student_id:<12} {repr(name):<40} {current_mark:<15}")
 
-def evaluate_students(students, selected_exam, marks):
+def evaluate_students(students, selected_exam, store):
     """Main evaluation loop"""
     print(f"\n🎯 EVALUATING EXAM: {selected_exam['name']}")
     print(f"📊 Maximum Score: {selected_exam['maxScore']}")
@@ -179,7 +138,6 @@ def evaluate_students(students, selected_exam, marks):
     print("   • Enter 'q' to quit and save progress")
     print("   • Enter 'list' to see students again")
     
-    updated_marks = marks.copy()
     changes_made = False
     
     while True:
@@ -189,7 +147,7 @@ def evaluate_students(students, selected_exam, marks):
         if choice == 'q':
             break
         elif choice == 'list':
-            display_students(students, selected_exam['id'], updated_marks)
+            display_students(students, selected_exam['id'], store)
             continue
         
         try:
@@ -198,7 +156,7 @@ def evaluate_students(students, selected_exam, marks):
                 student = students[student_num - 1]
                 
                 # Check if student already has a mark
-                existing_mark = next((m for m in updated_marks if m.get('studentId') == student.get('id') and m.get('examId') == selected_exam['id']), None)
+                existing_mark = store.mark_for(student.get('id'), selected_exam['id'])
                 
                 print(f"\n👨‍🎓 Evaluating: {student['name']} (ID: {student['id']})")
                 
@@ -237,13 +195,11 @@ def evaluate_students(students, selected_exam, marks):
                     "createdAt": datetime.now().isoformat()
                 }
                 
+                # Add new mark or replace the existing one
+                store.upsert_mark(new_mark)
                 if existing_mark:
-                    # Update existing mark
-                    existing_mark.update(new_mark)
                     print(f"✅ Updated mark for {student['name']}: {score}/{selected_exam['maxScore']} ({percentage:.1f}%)")
                 else:
-                    # Add new mark
-                    updated_marks.append(new_mark)
                     print(f"✅ Added mark for {student['name']}: {score}/{selected_exam['maxScore']} ({percentage:.1f}%)")
                 
                 changes_made = True
@@ -254,7 +210,7 @@ def evaluate_students(students, selected_exam, marks):
         except ValueError:
             print("❌ Invalid input. Please try again.")
     
-    return updated_marks, changes_made
+    return changes_made
 
 def main():
     """Main function"""
@@ -264,7 +220,8 @@ def main():
     
     try:
         # Load existing data
-        students, groups, exams, marks = load_data()
+        store = load_data()
+        students, groups, exams, marks = store.students, store.groups, store.exams, store.marks
         
         print(f"\n📊 Current System Status:")
         print(f"   • Students: {len(students)}")
@@ -280,21 +237,21 @@ def main():
             print("\n❌ No exams found. Please create exams first.")
             return
         
-        # Create backup
-        create_backup()
+        # No full backup needed: saves only append to the mark journal,
+        # marks.json itself is untouched until compaction
         
         # Step 1: Select group
-        selected_group = select_group(groups, students)
+        selected_group = select_group(groups, store)
         if not selected_group:
             return
         
         # Step 2: Select exam
-        selected_exam = select_exam(exams, selected_group['id'])
+        selected_exam = select_exam(store, selected_group['id'])
         if not selected_exam:
             return
         
         # Step 3: Get students in group
-        group_students = get_students_in_group(students, selected_group['id'])
+        group_students = get_students_in_group(store, selected_group['id'])
         if not group_students:
             print(f"\n❌ No students found in group: {selected_group['name']}")
             return
@@ -314,20 +271,19 @@ def main():
             print("❌ Please enter 1, 2, or 3.")
         
         # Step 5: Display current status
-        display_students(group_students, selected_exam['id'], marks)
+        display_students(group_students, selected_exam['id'], store)
         
         # Step 6: Start evaluation
-        updated_marks, changes_made = evaluate_students(group_students, selected_exam, marks)
+        changes_made = evaluate_students(group_students, selected_exam, store)
         
         if changes_made:
             # Save changes
-            os.makedirs('public/data', exist_ok=True)
-            with open('public/data/marks.json', 'w', encoding='utf-8') as f:
-                json.dump(updated_marks, f, indent=2, ensure_ascii=False)
+            store.save('marks')
+            mark_journal.compact_pending(store)
             
             print(f"\n🎉 SUCCESS! Marks saved successfully!")
-            print(f"📁 Saved to: public/data/marks.json")
-            print(f"📊 Total marks: {len(updated_marks)}")
+            print(f"📁 Saved to: {store.path('marks')}")
+            print(f"📊 Total marks: {len(store.marks)}")
         else:
             print(f"\n📝 No changes made.")
     
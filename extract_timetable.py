@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Extract Timetable
+Reads the instructors' timetable PDF ("attendace and timetables/جدول حضور
+المدربين.pdf") and updates public/data/weekly_schedule_template.json from it.
+
+The PDF is an Excel export with one table row per instructor: number,
+instructor, subject, room and one cell per hourly slot (8h-9h ... 15h-16h)
+naming the group taught then. A slot merged over two hours is one cell
+spanning both columns. Arabic text comes out of the PDF in visual order
+and is turned back into reading order.
+
+The rows for the template's room (schedule_info.room, e.g. "Room 8") are
+compared with the template for each working day, and the differences are
+listed as added, changed and removed slots. The PDF has no weekdays, so
+--write needs --days naming the days it is for; without --write every
+working day is compared and nothing is saved.
+
+Slots written from a PDF are marked "source": "timetable", and only those
+are ever changed or (with --prune) removed. Slots entered by hand are kept
+and listed when the PDF disagrees with them.
+
+Pages are extracted in a process pool, so several multi-page PDFs for a
+term import in about the time of the slowest page.
+
+Usage:
+    python extract_timetable.py "attendace and timetables/جدول حضور  المدربين.pdf"
+    python extract_timetable.py timetable.pdf --days sunday,tuesday --write
+    python extract_timetable.py timetable.pdf --room 7 --days monday --write --prune
+    python extract_timetable.py timetable.pdf --list            # every instructor's slots
+
+Requirements:
+    pip install pdfplumber
+"""
+
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from backup_store import backup_file
+from data_store import DATA_DIR, file_lock, load_json, save_json
+
+TEMPLATE_FILE = "weekly_schedule_template.json"
+
+# "source" of template slots written by this script
+SOURCE = "timetable"
+
+ARABIC = re.compile('[؀-ۿ]')
+LTR_RUN = re.compile('[0-9A-Za-z][0-9A-Za-z.+/\\- ]*[0-9A-Za-z]|[0-9A-Za-z]')
+SLOT_HEADER = re.compile(r'^(\d{1,2})\s*h\s*-\s*\d{1,2}\s*h$', re.IGNORECASE)
+TATWEEL = 'ـ'
+
+# Subjects as the template names them; anything else is kept as written
+SUBJECTS = {
+    'إنجليزية': 'English', 'انجليزية': 'English', 'إنجليزي': 'English', 'انجليزي': 'English',
+    'safety': 'Safety',
+}
+
+# PDF spellings of groups -> the template's group labels
+GROUP_ALIASES = {
+    'FAHSS/AMA/ELC': 'FAHSS/AMAN/ELC',
+    'FAHSS+AMAN+ELC': 'FAHSS/AMAN/ELC',
+}
+
+
+def logical(text):
+    """Reading-order text of a PDF cell ('ةيزيلجنإ' -> 'إنجليزية')"""
+    text = ' '.join(str(text or '').replace(TATWEEL, '').split())
+    if not ARABIC.search(text):
+        return text
+    # Arabic is extracted right-to-left; numbers and Latin runs inside it read left-to-right
+    return LTR_RUN.sub(lambda m: m.group()[::-1], text[::-1])
+
+
+def group_label(text):
+    """Template label of a group cell ('Saipem6' -> 'SAIPEM6', 'SAM 2' -> 'SAM2')"""
+    label = re.sub(r'\s+', '', str(text or '')).upper()
+    return GROUP_ALIASES.get(label, label)
+
+
+def room_number(text):
+    """Room number of a room cell ('القاعة عدد 8' -> '8'), '' for workshops/labs"""
+    match = re.search(r'\d+', text)
+    return match.group() if match else ''
+
+
+def fill_merged(cells):
+    """Cells with merged (None) cells taking the text of their left neighbour"""
+    filled = []
+    for cell in cells:
+        filled.append(filled[-1] if cell is None and filled else (cell or ''))
+    return filled
+
+
+def parse_table(table):
+    """Slots of one instructor table: [{time, group, instructor, subject, room}]"""
+    header = [str(cell or '').strip() for cell in table[0]]
+    times = {}
+    for i, cell in enumerate(header):
+        match = SLOT_HEADER.match(cell)
+        if match:
+            times[i] = f"{int(match.group(1)):02d}:00"
+    if not times:
+        return []
+    # Columns right of the slots (in page order): room, subject, instructor, number
+    info = [i for i in range(len(header)) if i not in times]
+    if len(info) < 4:
+        return []  # the trainees' table (one row per group) - no instructors
+    room_col, subject_col, instructor_col = info[0], info[1], info[2]
+
+    slots = []
+    for row in table[1:]:
+        row = list(row) + [None] * (len(header) - len(row))
+        instructor = logical(row[instructor_col])
+        if not instructor:
+            continue
+        subject = logical(row[subject_col])
+        room = logical(row[room_col])
+        cells = fill_merged([row[i] for i in sorted(times)])
+        for i, cell in zip(sorted(times), cells):
+            group = group_label(cell)
+            if group:
+                slots.append({
+                    'time': times[i],
+                    'group': group,
+                    'instructor': instructor,
+                    'subject': SUBJECTS.get(subject.lower(), subject),
+                    'room': room_number(room),
+                })
+    return slots
+
+
+def extract_page(job):
+    """Slots on one page of a PDF (runs in worker processes)"""
+    import pdfplumber
+
+    path, page_number = job
+    start = time.perf_counter()
+    with pdfplumber.open(path) as pdf:
+        tables = pdf.pages[page_number].extract_tables()
+    slots = [slot for table in tables if table for slot in parse_table(table)]
+    return path, page_number, slots, time.perf_counter() - start
+
+
+def extract_slots(paths, workers=None):
+    """Slots of every page of every PDF, in file and page order"""
+    import pdfplumber
+
+    jobs = []
+    for path in paths:
+        with pdfplumber.open(path) as pdf:
+            jobs.extend((path, n) for n in range(len(pdf.pages)))
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(extract_page, jobs))
+    else:
+        results = [extract_page(job) for job in jobs]
+    return results
+
+
+def room_schedule(slots, room=None, instructor=None):
+    """{time: slot} for one room (or one instructor); later pages win"""
+    schedule = {}
+    for slot in slots:
+        if room and slot['room'] != room:
+            continue
+        if instructor and instructor not in slot['instructor']:
+            continue
+        schedule[slot['time']] = slot
+    return schedule
+
+
+def diff_day(current, extracted, prune=False):
+    """Changes for one day: [(kind, time, old slot, new slot)]
+
+    Slots entered by hand are never changed; a disagreement with one is
+    reported as 'kept'.
+    """
+    by_time = {slot.get('time'): slot for slot in current}
+    changes = []
+    for slot_time, slot in sorted(extracted.items()):
+        old = by_time.get(slot_time)
+        if old is None:
+            changes.append(('added', slot_time, None, slot))
+        elif (old.get('group'), old.get('subject')) != (slot['group'], slot['subject']):
+            kind = 'changed' if old.get('source') == SOURCE else 'kept'
+            changes.append((kind, slot_time, old, slot))
+    if prune:
+        for slot_time in sorted(set(by_time) - set(extracted)):
+            if by_time[slot_time].get('source') == SOURCE:
+                changes.append(('removed', slot_time, by_time[slot_time], None))
+    return changes
+
+
+def apply_changes(day_slots, changes):
+    """Day's slot list with the changes applied, in time order"""
+    by_time = {slot.get('time'): slot for slot in day_slots}
+    for kind, slot_time, old, new in changes:
+        if kind == 'removed':
+            by_time.pop(slot_time, None)
+        elif kind != 'kept':
+            by_time[slot_time] = {**(old or {'type': 'Lecture'}), 'time': slot_time,
+                                  'group': new['group'], 'subject': new['subject'], 'source': SOURCE}
+    return [by_time[t] for t in sorted(by_time)]
+
+
+def describe(kind, slot_time, old, new):
+    if kind == 'added':
+        return f"➕ {slot_time} {new['group']} ({new['subject']})"
+    if kind == 'removed':
+        return f"➖ {slot_time} {old.get('group')} ({old.get('subject')})"
+    if kind == 'kept':
+        return f"⚠️ {slot_time} {old.get('group')} kept - entered by hand (PDF: {new['group']})"
+    return f"✏️ {slot_time} {old.get('group')} → {new['group']} ({new['subject']})"
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    options = {}
+    flags = set()
+    paths = []
+    while args:
+        arg = args.pop(0)
+        if arg in ('--room', '--instructor', '--days', '--workers') and args:
+            options[arg] = args.pop(0)
+        elif arg.startswith('--'):
+            flags.add(arg)
+        else:
+            paths.append(arg)
+
+    if not paths:
+        print(__doc__)
+        sys.exit(1)
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing:
+        print(f"❌ File not found: {', '.join(missing)}")
+        sys.exit(1)
+    try:
+        import pdfplumber  # noqa: F401
+    except ImportError:
+        print("❌ Reading PDF timetables needs pdfplumber: pip install pdfplumber")
+        sys.exit(1)
+
+    print("🗓️ TIMETABLE EXTRACTION")
+    print("=" * 50)
+    start = time.perf_counter()
+    workers = int(options['--workers']) if '--workers' in options else None
+    results = extract_slots(paths, workers)
+    slots = [slot for _, _, page_slots, _ in results for slot in page_slots]
+    for path, page_number, page_slots, seconds in results:
+        print(f"📄 {os.path.basename(path)} p.{page_number + 1}: {len(page_slots)} slots ({seconds * 1000:.0f} ms)")
+    print(f"⏱️  Extracted in {time.perf_counter() - start:.2f} s")
+
+    if '--list' in flags:
+        by_instructor = {}
+        for slot in slots:
+            by_instructor.setdefault((slot['instructor'], slot['subject'], slot['room']), []).append(slot)
+        for (instructor, subject, room), own in by_instructor.items():
+            print(f"\n👤 {instructor} · {subject} · room {room or '-'}")
+            for slot in sorted(own, key=lambda s: s['time']):
+                print(f"   {slot['time']}  {slot['group']}")
+        return
+
+    if '--write' in flags and '--days' not in options:
+        print("❌ The PDF doesn't say which days it covers - pass --days (e.g. --days sunday,tuesday) with --write")
+        sys.exit(1)
+
+    path = os.path.join(DATA_DIR, TEMPLATE_FILE)
+    with file_lock(path):
+        template = load_json(path, default={})
+        info = template.get('schedule_info', {})
+        room = options.get('--room') or room_number(info.get('room', ''))
+        extracted = room_schedule(slots, room, options.get('--instructor'))
+        if not extracted:
+            print(f"❌ No slots found for room {room}" + (f" / {options['--instructor']}" if '--instructor' in options else ''))
+            sys.exit(1)
+        days = options['--days'].lower().split(',') if '--days' in options else info.get('working_days', [])
+
+        weekly = template.setdefault('weekly_schedule', {})
+        changed = kept = 0
+        for day in days:
+            changes = diff_day(weekly.get(day, []), extracted, prune='--prune' in flags)
+            count = sum(1 for kind, *_ in changes if kind != 'kept')
+            kept += len(changes) - count
+            print(f"\n📅 {day.capitalize()}: {count or 'no'} change(s)")
+            for change in changes:
+                print(f"   {describe(*change)}")
+            if count:
+                weekly[day] = apply_changes(weekly.get(day, []), changes)
+                changed += count
+
+        if kept:
+            print(f"\n💡 {kept} slot(s) entered by hand differ from the PDF - edit them in {TEMPLATE_FILE} if the PDF is right.")
+        if not changed:
+            print("\n✅ Nothing to update from the timetable.")
+        elif '--write' not in flags:
+            print(f"\n🔍 {changed} change(s) found - run again with --write to save them.")
+        else:
+            template.setdefault('_instructions', {})['last_updated'] = datetime.now().strftime("%Y-%m-%d")
+            backup_file('weekly_schedule_template')
+            save_json(path, template)
+            print(f"\n✅ {changed} slot(s) updated in {path}")
+
+
+if __name__ == "__main__":
+    main()
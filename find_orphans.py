@@ -3,22 +3,20 @@
 Find orphaned student marks (students with marks but no student records)
 """
 
-import json
+from data_store import get_store
 
 def main():
     # Load marks data
-    with open('public/data/marks.json', 'r', encoding='utf-8') as f:
-        marks = json.load(f)
-
-    with open('public/data/students.json', 'r', encoding='utf-8') as f:
-        students = json.load(f)
+    store = get_store()
+    marks = store.marks
+    students = store.students
 
     # Get all student IDs from marks
-    marks_student_ids = set(mark['studentId'] for mark in marks)
+    marks_student_ids = set(store.marks_by_student)
     print(f'📊 Unique student IDs in marks.json: {len(marks_student_ids)}')
 
     # Get all student IDs from students.json  
-    students_student_ids = set(student['id'] for student in students)
+    students_student_ids = set(store.students_by_id)
     print(f'📊 Unique student IDs in students.json: {len(students_student_ids)}')
 
     # Find marks for students not in students.json
@@ -29,7 +27,7 @@ def main():
         print(f'\n🚫 ORPHANED STUDENT MARKS (THE MISSING 4):')
         print('='*60)
         for student_id in sorted(orphan_marks):
-            student_marks = [m for m in marks if m['studentId'] == student_id]
+            student_marks = store.student_marks(student_id)
             print(f'👻 {student_id}: {len(student_marks)} mark(s)')
             for mark in student_marks:
                 exam_id = mark.get('examId', 'N/A')
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Grade From File
+Non-interactive bulk grading: reads a CSV or XLSX file of scores and saves
+all of them at once.
+
+The file needs a score column and a student column - either `id` (internal
+id like n001) or `studentId` (the number from the roster). Roster numbers
+restart in every group, so `studentId` is looked up in the group given by a
+`groupId` column or --group. The exam comes from an `examId` column or from
+--exam for the whole file.
+
+Every row is validated before anything is written (known exam, known
+student, score between 0 and the exam's maxScore, no duplicate rows). If
+any row fails nothing is saved; otherwise all marks go to the mark journal
+in one write.
+
+Usage:
+    python grade_from_file.py scores.csv --exam exam_20250905_161518_8859ceae_nesma
+    python grade_from_file.py quiz.csv --exam exam_20250905_162701_295c91e9 --group saipem6
+    python grade_from_file.py quiz3.xlsx --dry-run
+"""
+
+import csv
+import os
+import sys
+import uuid
+from datetime import datetime
+
+import mark_journal
+from data_store import get_store
+
+# Accepted spellings of each column, after lowercasing and dropping spaces/underscores
+COLUMN_ALIASES = {
+    'examId': ('examid', 'exam'),
+    'groupId': ('groupid', 'group'),
+    'id': ('id', 'internalid'),
+    'studentId': ('studentid', 'studentnumber', 'studentno'),
+    'score': ('score', 'mark', 'marks', 'result'),
+}
+
+# CSV encodings tried in order: UTF-8 (with or without BOM), then the Windows
+# Arabic code page Excel uses for a plain "CSV (Comma delimited)" save
+CSV_ENCODINGS = ('utf-8-sig', 'cp1256')
+
+
+def normalize_header(name):
+    """'Student ID' -> 'studentid'"""
+    return str(name or '').strip().lower().replace(' ', '').replace('_', '')
+
+
+def cell_text(value):
+    """Spreadsheet cell as text ('12.0' -> '12', None -> '')"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def read_csv(filepath):
+    """CSV records, trying each of CSV_ENCODINGS in turn"""
+    for encoding in CSV_ENCODINGS:
+        try:
+            with open(filepath, 'r', encoding=encoding, newline='') as f:
+                records = list(csv.DictReader(f))
+        except UnicodeDecodeError:
+            continue
+        if encoding != CSV_ENCODINGS[0]:
+            print(f"📄 {os.path.basename(filepath)} is not UTF-8 - read it as {encoding}")
+        return records
+    print(f"❌ Could not read {filepath} - save it as CSV UTF-8 and try again")
+    sys.exit(1)
+
+
+def read_rows(filepath, aliases=COLUMN_ALIASES):
+    """Read a CSV or XLSX file into a list of {column: text} dicts
+
+    Returns (rows, columns) where columns maps each field of aliases
+    to the header it was found under.
+    """
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext in ('.xlsx', '.xlsm'):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            print("❌ Reading Excel files needs openpyxl: pip install openpyxl")
+            sys.exit(1)
+        workbook = load_workbook(filepath, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None) or []
+        records = [dict(zip(header, row)) for row in rows]
+        workbook.close()
+    else:
+        records = read_csv(filepath)
+
+    columns = {}
+    for field, names in aliases.items():
+        for header in (records[0].keys() if records else []):
+            if normalize_header(header) in names:
+                columns[field] = header
+                break
+
+    result = []
+    for record in records:
+        row = {field: cell_text(record.get(header)) for field, header in columns.items()}
+        if any(row.values()):
+            result.append(row)
+    return result, columns
+
+
+def resolve_student(store, row, exam, group_id, roster_cache):
+    """Find the student for a row by internal id, or by roster number
+    within the group (or the exam's groups when no group is given)"""
+    if row.get('id'):
+        return store.student(row['id']), None
+
+    number = row.get('studentId', '')
+    key = (exam['id'], group_id)
+    if key not in roster_cache:
+        if group_id:
+            groups = [group_id]
+        else:
+            groups = exam.get('assignedGroups') or []
+            if exam.get('groupId'):
+                groups = list(groups) + [exam['groupId']]
+        candidates = store.students if not groups else [
+            s for g in dict.fromkeys(groups) for s in store.group_students(g)
+        ]
+        roster = {}
+        for student in candidates:
+            roster.setdefault(str(student.get('studentId', '')).strip(), []).append(student)
+        roster_cache[key] = roster
+
+    matches = roster_cache[key].get(number, [])
+    if len(matches) > 1:
+        return None, f"studentId {number} matches {len(matches)} students - give the group or use the id column"
+    return (matches[0] if matches else None), None
+
+
+def validate_rows(store, rows, default_exam_id=None, default_group_id=None):
+    """Validate all rows in one pass
+
+    Returns (grades, errors) where grades is a list of
+    (student, exam, score) tuples.
+    """
+    grades = []
+    errors = []
+    seen = {}
+    roster_cache = {}
+
+    for line, row in enumerate(rows, 2):  # line 1 is the header
+        exam_id = row.get('examId') or default_exam_id
+        exam = store.exam(exam_id) if exam_id else None
+        if exam is None:
+            errors.append(f"line {line}: unknown exam '{exam_id or ''}'")
+            continue
+
+        group_id = row.get('groupId') or default_group_id
+        if group_id and store.group(group_id) is None:
+            errors.append(f"line {line}: unknown group '{group_id}'")
+            continue
+
+        student, problem = resolve_student(store, row, exam, group_id, roster_cache)
+        if student is None:
+            label = row.get('id') or row.get('studentId') or '(blank)'
+            errors.append(f"line {line}: {problem or f'unknown student {label}'}")
+            continue
+
+        try:
+            score = float(row.get('score', ''))
+        except ValueError:
+            errors.append(f"line {line}: score '{row.get('score', '')}' is not a number")
+            continue
+
+        max_score = exam.get('maxScore') or 0
+        if not 0 <= score <= max_score:
+            errors.append(f"line {line}: score {score:g} is outside 0-{max_score} for {exam.get('name', exam_id)}")
+            continue
+
+        key = (student['id'], exam['id'])
+        if key in seen:
+            errors.append(f"line {line}: duplicate of line {seen[key]} for {student['id']}")
+            continue
+        seen[key] = line
+        grades.append((student, exam, score))
+
+    return grades, errors
+
+
+def build_mark(store, student, exam, score, now):
+    """Mark record in the same shape as evaluate_students.py writes"""
+    existing = store.mark_for(student['id'], exam['id'])
+    percentage = score / exam['maxScore'] * 100 if exam['maxScore'] else 0
+    return {
+        # Keep the id of a mark we're updating so references stay valid
+        "id": existing['id'] if existing else f"mark_{now.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}",
+        "studentId": student['id'],
+        "examId": exam['id'],
+        "score": score,
+        "maxScore": exam['maxScore'],
+        "percentage": f"{percentage:.1f}",
+        "date": now.strftime('%Y-%m-%d'),
+        "createdAt": now.isoformat()
+    }, existing
+
+
+def grade_from_file(filepath, exam_id=None, group_id=None, dry_run=False, store=None):
+    """Validate and save all grades in a file; returns True on success"""
+    store = store or get_store()
+    rows, columns = read_rows(filepath)
+
+    if 'score' not in columns or not ({'id', 'studentId'} & columns.keys()):
+        print("❌ The file needs a score column and an id or studentId column.")
+        return False
+    if 'examId' not in columns and not exam_id:
+        print("❌ No examId column - pass the exam with --exam EXAM_ID.")
+        return False
+    if not rows:
+        print("❌ No rows found.")
+        return False
+
+    grades, errors = validate_rows(store, rows, exam_id, group_id)
+    if errors:
+        print(f"❌ {len(errors)} invalid row(s) - nothing was saved:")
+        for error in errors:
+            print(f"   • {error}")
+        return False
+
+    now = datetime.now()
+    added = updated = unchanged = 0
+    for student, exam, score in grades:
+        mark, existing = build_mark(store, student, exam, score, now)
+        if existing and existing.get('score') == score and existing.get('maxScore') == exam['maxScore']:
+            unchanged += 1
+            continue
+        if not dry_run:
+            store.upsert_mark(mark)
+        if existing:
+            updated += 1
+        else:
+            added += 1
+
+    print(f"✅ {len(grades)} rows valid: {added} new, {updated} updated, {unchanged} unchanged")
+    if dry_run:
+        print("🔍 Dry run - nothing was saved.")
+        return True
+
+    if added or updated:
+        store.save('marks')
+        mark_journal.compact_pending(store)
+        print(f"📁 Saved to: {store.path('marks')}")
+    return True
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    exam_id = None
+    group_id = None
+    dry_run = False
+    filepath = None
+
+    while args:
+        arg = args.pop(0)
+        if arg == '--exam' and args:
+            exam_id = args.pop(0)
+        elif arg == '--group' and args:
+            group_id = args.pop(0)
+        elif arg == '--dry-run':
+            dry_run = True
+        elif filepath is None and not arg.startswith('--'):
+            filepath = arg
+        else:
+            filepath = None
+            break
+
+    if not filepath:
+        print(__doc__)
+        sys.exit(1)
+    if not os.path.exists(filepath):
+        print(f"❌ File not found: {filepath}")
+        sys.exit(1)
+
+    print("📝 BULK GRADING")
+    print("=" * 50)
+    if not grade_from_file(filepath, exam_id, group_id, dry_run):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
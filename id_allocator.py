@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+ID Allocator
+Hands out new student IDs from sequences kept in
+public/data/id_sequences.json, so creating a student doesn't scan the
+roster for the highest number in use.
+
+Each group follows one of the existing schemes:
+
+    nesma      id = studentId = n001, n002, ...
+    alfa*      id = studentId = alfa2_001, alfa2_002, ...
+    deye       id = studentId = deye_001, deye_002, ...
+    saipem*    id = s019_new, s019_new2, ...   studentId = 1, 2, ... per group
+    others     id = studentId = s001, s002, ...
+
+Each sequence stores the highest number handed out. The file is seeded
+from students.json the first time (or with `resync`), allocation happens
+under a file lock so two scripts running at once never get the same
+number, and a batch of IDs for a bulk enrollment costs one write.
+
+Usage:
+    python id_allocator.py                # show the sequences
+    python id_allocator.py peek saipem6   # next IDs for a group (nothing reserved)
+    python id_allocator.py resync         # re-seed from students.json
+"""
+
+import os
+import re
+import sys
+
+from data_store import file_lock, get_store, load_json, save_json
+
+SEQUENCES_FILE = "id_sequences.json"
+SEQUENCES_VERSION = 1
+
+# Internal ID patterns -> sequence they count towards
+ID_PATTERNS = (
+    (re.compile(r'^n(\d+)$'), lambda m: 'n'),
+    (re.compile(r'^deye_(\d+)$'), lambda m: 'deye'),
+    (re.compile(r'^(alfa\d*)_(\d+)$'), lambda m: m.group(1)),
+    (re.compile(r'^s019_new(\d*)$'), lambda m: 's019_new'),
+    (re.compile(r'^s(\d+)$'), lambda m: 's'),
+)
+
+
+def scheme(group_id):
+    """(id sequence, studentId sequence or None) for a group
+
+    None means the studentId is the same as the internal id.
+    """
+    if group_id == 'nesma':
+        return 'n', None
+    if group_id.startswith('saipem'):
+        return 's019_new', f"number:{group_id}"
+    if group_id.startswith('alfa'):
+        return group_id, None
+    if group_id == 'deye':
+        return 'deye', None
+    return 's', None
+
+
+def format_id(sequence, number):
+    """Internal id for a sequence number: ('deye', 7) -> 'deye_007'"""
+    if sequence == 's019_new':
+        # The first one was created without a number
+        return 's019_new' if number == 1 else f"s019_new{number}"
+    if sequence in ('n', 's'):
+        return f"{sequence}{number:03d}"
+    return f"{sequence}_{number:03d}"
+
+
+def scan_students(students):
+    """Highest number in use for every sequence"""
+    highest = {}
+    for student in students:
+        student_id = str(student.get('id', ''))
+        for pattern, sequence_of in ID_PATTERNS:
+            match = pattern.match(student_id)
+            if match:
+                sequence = sequence_of(match)
+                digits = match.groups()[-1]
+                number = int(digits) if digits else 1
+                highest[sequence] = max(highest.get(sequence, 0), number)
+                break
+
+        group_id = student.get('groupId') or ''
+        if group_id.startswith('saipem'):
+            try:
+                number = int(student.get('studentId'))
+            except (TypeError, ValueError):
+                continue
+            sequence = f"number:{group_id}"
+            highest[sequence] = max(highest.get(sequence, 0), number)
+    return highest
+
+
+class IdAllocator:
+    """Sequence-backed student ID allocation"""
+
+    def __init__(self, store=None):
+        self.store = store or get_store()
+        self.filepath = os.path.join(self.store.data_dir, SEQUENCES_FILE)
+        self._numbers_by_group = {}
+
+    # ------------------------------------------------------------------
+    # Sequences file
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        data = load_json(self.filepath, default={})
+        if isinstance(data, dict) and data.get('version') == SEQUENCES_VERSION:
+            return data['sequences']
+        # First use (or an unreadable file): seed from the roster
+        return scan_students(self.store.students)
+
+    def _save(self, sequences):
+        save_json(self.filepath, {'version': SEQUENCES_VERSION, 'sequences': dict(sorted(sequences.items()))})
+
+    def sequences(self):
+        """Current high-water marks, {sequence: highest number handed out}"""
+        return self._load()
+
+    def resync(self):
+        """Raise every sequence to at least the highest number in students.json"""
+        with file_lock(self.filepath):
+            sequences = self._load()
+            for sequence, number in scan_students(self.store.students).items():
+                sequences[sequence] = max(sequences.get(sequence, 0), number)
+            self._save(sequences)
+        return sequences
+
+    # ------------------------------------------------------------------
+    # Allocation
+    # ------------------------------------------------------------------
+
+    def _id_taken(self, student_id):
+        return student_id in self.store.students_by_id
+
+    def _number_taken(self, group_id, number):
+        # Guards against students added without the allocator (e.g. imports)
+        if group_id not in self._numbers_by_group:
+            self._numbers_by_group[group_id] = {
+                str(s.get('studentId')).strip() for s in self.store.group_students(group_id)
+            }
+        return str(number) in self._numbers_by_group[group_id]
+
+    def _take(self, sequences, sequence, count, taken):
+        """Next `count` free numbers of a sequence, advancing it"""
+        numbers = []
+        number = sequences.get(sequence, 0)
+        while len(numbers) < count:
+            number += 1
+            if not taken(number):
+                numbers.append(number)
+        sequences[sequence] = number
+        return numbers
+
+    def _allocate(self, sequences, group_id, count):
+        id_sequence, number_sequence = scheme(group_id)
+        ids = [format_id(id_sequence, n) for n in
+               self._take(sequences, id_sequence, count, lambda n: self._id_taken(format_id(id_sequence, n)))]
+        if number_sequence is None:
+            return list(zip(ids, ids))
+        numbers = self._take(sequences, number_sequence, count, lambda n: self._number_taken(group_id, n))
+        return list(zip(ids, (str(n) for n in numbers)))
+
+    def reserve(self, group_id, count=1):
+        """Reserve IDs for `count` new students of a group
+
+        Returns a list of (internal id, studentId). Reserved numbers are never
+        handed out again, even if the students end up not being saved.
+        """
+        with file_lock(self.filepath):
+            sequences = self._load()
+            allocated = self._allocate(sequences, group_id, count)
+            self._save(sequences)
+        return allocated
+
+    def peek(self, group_id, count=1):
+        """IDs the next reserve() would return, without reserving them"""
+        return self._allocate(self._load(), group_id, count)
+
+    def reserve_student_numbers(self, group_id, count=1):
+        """Reserve only studentIds of a numbered group (e.g. moving into saipem6)"""
+        _, number_sequence = scheme(group_id)
+        if number_sequence is None:
+            raise ValueError(f"Group {group_id} doesn't number its students separately")
+        with file_lock(self.filepath):
+            sequences = self._load()
+            numbers = self._take(sequences, number_sequence, count, lambda n: self._number_taken(group_id, n))
+            self._save(sequences)
+        return [str(n) for n in numbers]
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    allocator = IdAllocator()
+
+    if args and args[0] == 'resync':
+        sequences = allocator.resync()
+        print(f"✅ Sequences re-seeded from {allocator.store.path('students')}")
+    elif args and args[0] == 'peek' and len(args) > 1:
+        count = int(args[2]) if len(args) > 2 and args[2].isdigit() else 1
+        for internal_id, student_id in allocator.peek(args[1], count):
+            print(f"   ID: {internal_id:<15} Student ID: {student_id}")
+        return
+    else:
+        sequences = allocator.sequences()
+
+    print(f"\n🔢 ID SEQUENCES ({allocator.filepath})")
+    print("-" * 40)
+    for sequence, number in sorted(sequences.items()):
+        print(f"{sequence:<20} {number}")
+
+
+if __name__ == "__main__":
+    main()
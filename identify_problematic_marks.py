@@ -1,15 +1,12 @@
-import json
-from collections import Counter
+from data_store import get_store
 
 # Load marks and students data
-with open('public/data/marks.json', 'r', encoding='utf-8') as f:
-    marks = json.load(f)
-
-with open('public/data/students.json', 'r', encoding='utf-8') as f:
-    students = json.load(f)
+store = get_store()
+marks = store.marks
+students = store.students
 
 # Create student ID to name mapping
-student_map = {student['id']: student['name'] for student in students}
+student_map = {student_id: student['name'] for student_id, student in store.students_by_id.items()}
 
 print("🔍 POTENTIALLY PROBLEMATIC MARKS:")
 print("=" * 50)
@@ -44,13 +41,12 @@ for i, mark in enumerate(marks):
         print()
 
 print("\n📋 STUDENTS WITH MULTIPLE MARKS:")
-student_counts = Counter([mark['studentId'] for mark in marks])
-for student_id, count in sorted(student_counts.items()):
+for student_id, student_marks in sorted(store.marks_by_student.items()):
+    count = len(student_marks)
     if count > 1:
         student_name = student_map.get(student_id, "Unknown")
         print(f"{student_id} ({student_name}): {count} marks")
         # Show the marks for this student
-        student_marks = [mark for mark in marks if mark['studentId'] == student_id]
         for mark in student_marks:
             print(f"  - {mark['id']}: Score {mark.get('score', 'N/A')} on {mark.get('date', 'N/A')}")
         print()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Import Attendance
+Reads the weekly attendance workbooks ("attendace and timetables/كشوفات
+الغياب الاسبوعي.xlsx" and filled-in copies of it) into
+public/data/attendance.json.
+
+Each sheet is one group (SAIPEM 6, SAM 1, Dabal +Fahss, ...) and holds one
+or more weekly blocks: a "Names" row with the weekdays, a row of dates, a
+row of period numbers (1-4 per day) and then one row per trainee with the
+number, name and ID. A cell under a period is read as:
+
+    P  present   (ح, حاضر, p, /, ✓, 1)
+    A  absent    (غ, غائب, a, x, 0)
+    L  late      (ت, متأخر, l)
+    E  excused   (ع, عذر, مستأذن, e)
+
+A period is taken as recorded when any trainee of the block has something
+in it; empty cells of a recorded period count as present. Trainees are
+matched to students by normalized name within the sheet's group, then by
+name across the institute, then by the ID column within the sheet's group
+(trainee numbers are only unique inside a group).
+
+Sheets are read row by row in openpyxl's read-only mode and only one
+weekly block is held at a time, so memory doesn't grow with the workbook.
+
+attendance.json keeps one string per student per day with a letter per
+period ('-' = not recorded), e.g. {"s001": {"2025-08-31": "PPAP"}}, plus
+absence rates per group. Imports merge into it, so weekly files can be
+imported one after another.
+
+Usage:
+    python import_attendance.py "attendace and timetables/كشوفات الغياب الاسبوعي.xlsx"
+    python import_attendance.py week1.xlsx week2.xlsx week3.xlsx
+    python import_attendance.py weeks/ --dry-run          # every .xlsx in a folder
+    python import_attendance.py --report                  # rates from attendance.json
+"""
+
+import os
+import sys
+import time
+from datetime import date, datetime
+
+from backup_store import backup_file
+from data_store import file_lock, get_store, load_json, save_json
+from grade_from_file import cell_text
+from student_search import normalize
+
+ATTENDANCE_FILE = "attendance.json"
+
+PERIODS_PER_DAY = 4
+NOT_RECORDED = '-'
+
+MARKS = {
+    'P': ('ح', 'حاضر', 'p', 'present', '/', '✓', '✔', '√', '1'),
+    'A': ('غ', 'غائب', 'غياب', 'a', 'absent', 'x', '×', '0'),
+    'L': ('ت', 'تأخير', 'متأخر', 'l', 'late'),
+    'E': ('ع', 'عذر', 'مستأذن', 'e', 'excused'),
+}
+CODE_OF = {text: code for code, texts in MARKS.items() for text in texts}
+
+WEEKDAYS = ('saturday', 'sunday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday')
+
+
+def classify(value):
+    """Attendance letter of a cell, None if empty, '?' if unreadable"""
+    text = cell_text(value).lower()
+    if not text:
+        return None
+    return CODE_OF.get(text, '?')
+
+
+def sheet_group_id(title, store):
+    """Group id of a sheet title ('SAIPEM 6 ' -> saipem6, 'Dabal +Fahss' -> dabal_fahss)"""
+    key = title.strip().lower().replace('+', '_').replace(' ', '')
+    return key if store.group(key) is not None else None
+
+
+class StudentMatcher:
+    """Finds the student for a sheet row"""
+
+    def __init__(self, store):
+        self.store = store
+        self.by_group = {}
+        self.by_name = {}
+        for student in store.students:
+            self.by_name.setdefault(normalize(student.get('name', '')), []).append(student)
+        self.by_number = {(s.get('groupId'), str(s.get('studentId'))): s
+                          for s in store.students if s.get('studentId')}
+
+    def match(self, name, number, group_id):
+        key = normalize(name)
+        if group_id:
+            if group_id not in self.by_group:
+                self.by_group[group_id] = {normalize(s.get('name', '')): s
+                                           for s in self.store.group_students(group_id)}
+            student = self.by_group[group_id].get(key)
+            if student is not None:
+                return student
+        candidates = self.by_name.get(key, [])
+        if len(candidates) == 1:
+            return candidates[0]
+        return self.by_number.get((group_id, number)) if number and group_id else None
+
+
+def read_blocks(sheet):
+    """Yield (columns, rows) for each weekly block of a sheet
+
+    columns maps a column index to (date, period); rows are
+    (name, number, {column: letter}) for every trainee row.
+    """
+    columns = None
+    day_starts = None
+    day_dates = {}
+    rows = []
+    for values in sheet.iter_rows(values_only=True):
+        texts = [cell_text(v).lower() for v in values]
+        if 'names' in texts:
+            if columns:
+                yield columns, rows
+            day_starts = [i for i, t in enumerate(texts) if t in WEEKDAYS]
+            day_dates = {}
+            columns = {}
+            rows = []
+            continue
+        if day_starts is None:
+            continue
+
+        dates = {i: v.date() for i, v in enumerate(values)
+                 if i in day_starts and isinstance(v, (datetime, date))}
+        if dates:
+            day_dates = dates
+            continue
+        if not columns and day_starts and all(isinstance(values[i], (int, float)) for i in day_starts if i < len(values)):
+            # Period numbers under each day
+            starts = sorted(day_dates)
+            for i, value in enumerate(values):
+                owners = [s for s in starts if s <= i]
+                if owners and isinstance(value, (int, float)) and 1 <= value <= PERIODS_PER_DAY:
+                    columns[i] = (day_dates[owners[-1]].isoformat(), int(value))
+            continue
+
+        if columns and len(values) > 1 and cell_text(values[0]).isdigit() \
+                and isinstance(values[1], str) and values[1].strip():
+            number = cell_text(values[2]) if len(values) > 2 else ''
+            marks = {}
+            for i in columns:
+                if i < len(values):
+                    letter = classify(values[i])
+                    if letter:
+                        marks[i] = letter
+            rows.append((values[1].strip(), number, marks))
+    if columns:
+        yield columns, rows
+
+
+def block_days(columns, marks):
+    """{date: 'PPAP'} for one trainee row; recorded periods default to present"""
+    days = {}
+    for i, (day, period) in columns.items():
+        letters = days.setdefault(day, [NOT_RECORDED] * PERIODS_PER_DAY)
+        letter = marks.get(i)
+        if letter is None:
+            continue
+        letters[period - 1] = letter
+    return days
+
+
+def import_workbook(filepath, attendance, store, matcher, stats):
+    """Merge one workbook into attendance['students']"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            group_id = sheet_group_id(sheet.title, store)
+            if group_id is None:
+                print(f"⚠️ {os.path.basename(filepath)} / {sheet.title.strip()}: no matching group - "
+                      f"matching names across all groups")
+            for columns, rows in read_blocks(sheet):
+                recorded = {i for _, _, marks in rows for i, letter in marks.items() if letter != '?'}
+                for name, number, marks in rows:
+                    stats['rows'] += 1
+                    stats['unreadable'] += sum(1 for letter in marks.values() if letter == '?')
+                    student = matcher.match(name, number, group_id)
+                    if student is None:
+                        stats['unmatched'].append(f"{sheet.title.strip()}: {name}")
+                        continue
+                    filled = {i: marks.get(i, 'P') for i in recorded}
+                    filled = {i: letter for i, letter in filled.items() if letter != '?'}
+                    student_days = attendance['students'].setdefault(student['id'], {})
+                    for day, letters in block_days(columns, filled).items():
+                        old = student_days.get(day, NOT_RECORDED * PERIODS_PER_DAY)
+                        merged = ''.join(new if new != NOT_RECORDED else was for new, was in zip(letters, old))
+                        if merged != NOT_RECORDED * PERIODS_PER_DAY:
+                            student_days[day] = merged
+                            stats['days'] += 1
+                    stats['matched'] += 1
+    finally:
+        workbook.close()
+
+
+def count_letters(days):
+    """{letter: count} over a student's day strings"""
+    counts = {code: 0 for code in MARKS}
+    for letters in days.values():
+        for letter in letters:
+            if letter in counts:
+                counts[letter] += 1
+    return counts
+
+
+def group_rates(attendance, store):
+    """Absence figures per group from the per-student days"""
+    groups = {}
+    for student_id, days in attendance['students'].items():
+        student = store.student(student_id) or {}
+        group = groups.setdefault(student.get('groupId') or 'unknown', {
+            'students': 0, 'days': set(), 'recorded': 0,
+            **{name: 0 for name in ('present', 'absent', 'late', 'excused')}
+        })
+        counts = count_letters(days)
+        group['students'] += 1
+        group['days'].update(days)
+        group['present'] += counts['P']
+        group['absent'] += counts['A']
+        group['late'] += counts['L']
+        group['excused'] += counts['E']
+        group['recorded'] += sum(counts.values())
+
+    for group in groups.values():
+        group['days'] = len(group['days'])
+        group['absenceRate'] = round(group['absent'] / group['recorded'] * 100, 1) if group['recorded'] else 0.0
+    return dict(sorted(groups.items()))
+
+
+def workbook_paths(args):
+    """Workbooks named on the command line (folders expand to their .xlsx files)"""
+    paths = []
+    for arg in args:
+        if os.path.isdir(arg):
+            paths.extend(sorted(os.path.join(arg, name) for name in os.listdir(arg)
+                                if name.lower().endswith(('.xlsx', '.xlsm')) and not name.startswith('~$')))
+        else:
+            paths.append(arg)
+    return paths
+
+
+def import_attendance(paths, dry_run=False, store=None):
+    """Import workbooks into attendance.json; returns the import stats"""
+    store = store or get_store()
+    path = os.path.join(store.data_dir, ATTENDANCE_FILE)
+    matcher = StudentMatcher(store)
+    stats = {'rows': 0, 'matched': 0, 'days': 0, 'unreadable': 0, 'unmatched': []}
+
+    with file_lock(path):
+        attendance = load_json(path, default={})
+        if not isinstance(attendance, dict) or 'students' not in attendance:
+            attendance = {'periodsPerDay': PERIODS_PER_DAY, 'students': {}, 'groups': {}}
+        for filepath in paths:
+            print(f"📖 Reading {filepath}")
+            import_workbook(filepath, attendance, store, matcher, stats)
+        attendance['groups'] = group_rates(attendance, store)
+        attendance['updatedAt'] = datetime.now().isoformat(timespec='seconds')
+        stats['attendance'] = attendance
+
+        if not dry_run and stats['days']:
+            backup_file('attendance', store.data_dir)
+            save_json(path, attendance)
+            stats['saved'] = path
+    return stats
+
+
+def print_rates(groups):
+    print(f"\n{'Group':<14} {'Students':>8} {'Days':>5} {'Periods':>8} {'Absent':>7} {'Late':>5} {'Excused':>8} {'Absence%':>9}")
+    print("-" * 75)
+    for group_id, group in sorted(groups.items(), key=lambda item: -item[1]['absenceRate']):
+        print(f"{group_id:<14} {group['students']:>8} {group['days']:>5} {group['recorded']:>8} "
+              f"{group['absent']:>7} {group['late']:>5} {group['excused']:>8} {group['absenceRate']:>8.1f}%")
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    dry_run = '--dry-run' in args
+    report = '--report' in args
+    paths = workbook_paths([a for a in args if not a.startswith('--')])
+
+    print("🗓️ ATTENDANCE IMPORT")
+    print("=" * 50)
+    store = get_store()
+    if report:
+        attendance = load_json(os.path.join(store.data_dir, ATTENDANCE_FILE), default={})
+        if not attendance.get('students'):
+            print("❌ No attendance imported yet.")
+            sys.exit(1)
+        print_rates(group_rates(attendance, store))
+        return
+    if not paths:
+        print(__doc__)
+        sys.exit(1)
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing:
+        print(f"❌ File not found: {', '.join(missing)}")
+        sys.exit(1)
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        print("❌ Reading Excel files needs openpyxl: pip install openpyxl")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    stats = import_attendance(paths, dry_run, store)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n✅ {stats['matched']}/{stats['rows']} trainee rows matched, {stats['days']} student-days recorded")
+    if stats['unreadable']:
+        print(f"⚠️ {stats['unreadable']} cell(s) with unrecognised marks were ignored")
+    if stats['unmatched']:
+        print(f"⚠️ {len(stats['unmatched'])} row(s) not matched to a student:")
+        for row in stats['unmatched']:
+            print(f"   • {row}")
+    if stats['days']:
+        print_rates(stats['attendance']['groups'])
+    else:
+        print("ℹ️ No attendance marks found - the sheets are empty.")
+    if dry_run:
+        print("\n🔍 Dry run - nothing was saved.")
+    elif stats.get('saved'):
+        print(f"\n📁 Saved to: {stats['saved']}")
+    print(f"⏱️  {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Institute Analytics
+Offline performance report for the whole institute, computed with pandas
+group-bys over the marks as columns instead of looping over lists.
+
+For every group, exam and student it reports the number of marks, mean,
+median, 25th/75th/90th percentiles, the pass bands used on the Exams page
+(excellent ≥70%, good 50-69%, needs help <50%) and evaluation coverage:
+the share of (student, exam) pairs that have a mark, counting only the
+exams available to each student's group.
+
+Usage:
+    python institute_analytics.py                   # institute + group report
+    python institute_analytics.py --exams           # also list every exam
+    python institute_analytics.py --group saipem6   # students of one group
+    python institute_analytics.py --json report.json
+
+Requirements:
+    pip install pandas numpy
+"""
+
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_store import get_store
+
+# Lower bounds of the pass bands on the Exams page, best first
+BANDS = (('excellent', 70), ('good', 50), ('needsHelp', 0))
+
+PERCENTILES = (0.25, 0.75, 0.9)
+
+
+def marks_frame(store):
+    """Marks as columns, with each student's group attached"""
+    marks = pd.DataFrame.from_records(
+        store.marks, columns=['studentId', 'examId', 'score', 'maxScore', 'percentage', 'date']
+    )
+    marks['percentage'] = pd.to_numeric(marks['percentage'], errors='coerce').astype('float64')
+    marks['score'] = pd.to_numeric(marks['score'], errors='coerce').astype('float64')
+    group_of = pd.Series({s.get('id'): s.get('groupId') for s in store.students}, dtype='object')
+    marks['groupId'] = marks['studentId'].map(group_of)
+    # The same (student, exam) twice is a data error; count it once
+    marks = marks.dropna(subset=['percentage']).drop_duplicates(['studentId', 'examId'], keep='last')
+    # Categorical keys make every group-by below a pass over integer codes
+    for key in ('studentId', 'examId', 'groupId'):
+        marks[key] = marks[key].astype('category')
+    # One 0/1 column per band, so band counts are plain sums
+    percentages = marks['percentage'].to_numpy()
+    upper = np.inf
+    for name, lower in BANDS:
+        marks[name] = ((percentages >= lower) & (percentages < upper)).astype('int64')
+        upper = lower
+    return marks
+
+
+def exams_per_group(store):
+    """Number of exams available to each group (assigned ones + open ones)"""
+    open_exams = len(store.open_exams)
+    counts = {group_id: len(exams) for group_id, exams in store.exams_by_group.items()}
+    return pd.Series(
+        {g.get('id'): counts.get(g.get('id'), 0) + open_exams for g in store.groups}, dtype='int64'
+    )
+
+
+def summarize(marks, key):
+    """Count, mean, median, percentiles and band counts of percentage per key"""
+    grouped = marks.groupby(key, sort=False, observed=True)
+    stats = grouped['percentage'].agg(['count', 'mean', 'median'])
+    for q in PERCENTILES:
+        stats[f"p{int(q * 100)}"] = grouped['percentage'].quantile(q)
+    stats = stats.join(grouped[[name for name, _ in BANDS]].sum())
+    stats.index = stats.index.astype('object')
+    return stats.rename(columns={'count': 'marks'})
+
+
+def with_coverage(frame, possible):
+    """Zero counts where nothing was marked and add coverage = marks / possible (%)"""
+    counts = ['marks'] + [name for name, _ in BANDS]
+    frame[counts] = frame[counts].fillna(0).astype('int64')
+    frame['coverage'] = np.where(possible > 0, frame['marks'] / possible.where(possible > 0, 1) * 100, 0.0)
+    return frame
+
+
+def institute_report(store):
+    """All report tables as DataFrames: institute, groups, exams, students"""
+    marks = marks_frame(store)
+    students = pd.DataFrame.from_records(store.students, columns=['id', 'name', 'groupId']).drop_duplicates('id')
+    available = exams_per_group(store)
+
+    # Groups: coverage = marks / (students x exams available to the group)
+    groups = pd.DataFrame.from_records(store.groups, columns=['id', 'name']).set_index('id')
+    groups['students'] = students.groupby('groupId').size().reindex(groups.index, fill_value=0)
+    groups['examsAvailable'] = available.reindex(groups.index, fill_value=0)
+    groups = groups.join(summarize(marks.dropna(subset=['groupId']), 'groupId'))
+    possible = groups['students'] * groups['examsAvailable']
+    groups = with_coverage(groups, possible)
+
+    # Exams: coverage = marks / students of the groups it is open to
+    exams = pd.DataFrame.from_records(store.exams, columns=['id', 'name', 'type', 'date', 'maxScore']).set_index('id')
+    assignments = pd.DataFrame(
+        [(exam_id, group_id) for group_id, group_exams in store.exams_by_group.items()
+         for exam_id in (e.get('id') for e in group_exams)],
+        columns=['examId', 'groupId']
+    ).drop_duplicates()
+    assignments['students'] = assignments['groupId'].map(groups['students']).fillna(0)
+    exams['eligible'] = assignments.groupby('examId')['students'].sum().reindex(exams.index, fill_value=0)
+    open_exams = exams.index.isin([e.get('id') for e in store.open_exams])
+    exams.loc[open_exams, 'eligible'] = groups['students'].sum()
+    exams['eligible'] = exams['eligible'].astype('int64')
+    exams = with_coverage(exams.join(summarize(marks, 'examId')), exams['eligible'])
+
+    # Students: coverage = marks / exams available to their group
+    per_student = students.set_index('id')
+    per_student['examsAvailable'] = per_student['groupId'].map(available).fillna(0).astype('int64')
+    per_student = with_coverage(per_student.join(summarize(marks, 'studentId')), per_student['examsAvailable'])
+
+    values = marks['percentage'].to_numpy()
+    possible_total = int(possible.sum())
+    institute = {
+        'students': len(per_student),
+        'groups': len(groups),
+        'exams': len(exams),
+        'marks': int(values.size),
+        'mean': float(values.mean()) if values.size else 0.0,
+        'median': float(np.median(values)) if values.size else 0.0,
+        **{f"p{int(q * 100)}": float(np.quantile(values, q)) if values.size else 0.0 for q in PERCENTILES},
+        **{name: int(marks[name].sum()) for name, _ in BANDS},
+        'coverage': float(groups['marks'].sum() / possible_total * 100) if possible_total else 0.0,
+    }
+    return {'institute': institute, 'groups': groups, 'exams': exams, 'students': per_student}
+
+
+def report_to_dict(report):
+    """Report as plain JSON-ready data, numbers rounded to one decimal"""
+    def records(frame):
+        frame = frame.round(1).astype(object).where(frame.notna(), None)
+        return {str(index): row for index, row in frame.to_dict(orient='index').items()}
+
+    return {
+        'institute': {k: round(v, 1) if isinstance(v, float) else v for k, v in report['institute'].items()},
+        'groups': records(report['groups']),
+        'exams': records(report['exams']),
+        'students': records(report['students']),
+    }
+
+
+def fmt(value):
+    """One-decimal number, '-' for missing"""
+    return '-' if pd.isna(value) else f"{value:.1f}"
+
+
+def print_table(title, frame, label):
+    """Print one report table"""
+    print(f"\n{title}")
+    print(f"{label:<32} {'Marks':>6} {'Mean':>6} {'Median':>7} {'P25':>6} {'P75':>6} {'P90':>6} "
+          f"{'≥70':>5} {'50-69':>6} {'<50':>5} {'Cover%':>7}")
+    print("-" * 108)
+    for _, row in frame.sort_values('mean', ascending=False, na_position='last').iterrows():
+        print(f"{str(row['name'])[:31]:<32} {int(row['marks']):>6} {fmt(row['mean']):>6} {fmt(row['median']):>7} "
+              f"{fmt(row['p25']):>6} {fmt(row['p75']):>6} {fmt(row['p90']):>6} "
+              f"{row['excellent']:>5} {row['good']:>6} {row['needsHelp']:>5} {fmt(row['coverage']):>7}")
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    group_id = args[args.index('--group') + 1] if '--group' in args and args.index('--group') + 1 < len(args) else None
+    json_file = args[args.index('--json') + 1] if '--json' in args and args.index('--json') + 1 < len(args) else None
+
+    print("📊 INSTITUTE ANALYTICS")
+    print("=" * 60)
+    store = get_store()
+    store.marks, store.students, store.exams, store.groups  # load before timing
+    start = time.perf_counter()
+    report = institute_report(store)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    institute = report['institute']
+    print(f"   • Students: {institute['students']}, groups: {institute['groups']}, "
+          f"exams: {institute['exams']}, marks: {institute['marks']}")
+    print(f"   • Mean {institute['mean']:.1f}% · median {institute['median']:.1f}% · "
+          f"P25 {institute['p25']:.1f}% · P75 {institute['p75']:.1f}% · P90 {institute['p90']:.1f}%")
+    print(f"   • Excellent (≥70%): {institute['excellent']} · Good (50-69%): {institute['good']} · "
+          f"Needs help (<50%): {institute['needsHelp']}")
+    print(f"   • Evaluation coverage: {institute['coverage']:.1f}%")
+
+    groups = report['groups']
+    print_table("🏫 GROUPS", groups[groups['students'] > 0], "Group")
+    if '--exams' in args:
+        print_table("📝 EXAMS", report['exams'], "Exam")
+    if group_id:
+        students = report['students']
+        print_table(f"👨‍🎓 STUDENTS OF {group_id}", students[students['groupId'] == group_id], "Student")
+
+    if json_file:
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(report_to_dict(report), f, indent=2, ensure_ascii=False)
+        print(f"\n📁 Report saved to {json_file}")
+    print(f"\n⏱️  Computed in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,16 @@
 List all 32 valid students to identify the 3 being filtered
 """
 
-import json
+from data_store import get_store
 
 def main():
     # Load data
-    with open('public/data/marks.json', 'r', encoding='utf-8') as f:
-        marks = json.load(f)
-    with open('public/data/students.json', 'r', encoding='utf-8') as f:
-        students = json.load(f)
+    store = get_store()
+    students = store.students
 
     # Get valid student IDs (exist in both files)
-    marks_ids = set(mark['studentId'] for mark in marks)
-    student_ids = set(s['id'] for s in students)
+    marks_ids = {student_id for student_id, m in store.marks_by_student.items() if m}
+    student_ids = set(store.students_by_id)
     valid_ids = marks_ids & student_ids
 
     print(f'🔍 VALID STUDENTS (exist in both files): {len(valid_ids)}')
@@ -29,7 +27,7 @@ def main():
         student_id = student['id']
         group_id = student.get('groupId', 'No group')
         name = student.get('name', 'No name')
-        student_marks = [m for m in marks if m['studentId'] == student_id]
+        student_marks = store.student_marks(student_id)
         
         print(f'{i:2d}. {student_id:12} | {group_id:8} | {name[:30]:30} | {len(student_marks)} marks')
 
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Mark Journal
+Append-only journal of mark changes that sits next to marks.json.
+
+Saving a mark appends one line per add/update/delete event to
+public/data/marks.journal.jsonl instead of rewriting the whole marks.json.
+The data store replays the journal on top of the snapshot when it loads,
+and compaction folds the journal into a fresh marks.json snapshot.
+
+The website only reads marks.json, so every script that saves marks calls
+compact_pending() before it exits (the API server when it stops), and
+publish_data.py compacts again before deploying. Saves within one run stay
+cheap appends. To compact by hand:
+    python mark_journal.py compact
+
+Usage:
+    python mark_journal.py status     # Show snapshot and journal sizes
+    python mark_journal.py compact    # Fold the journal into marks.json
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+
+JOURNAL_FILE = "marks.journal.jsonl"
+
+# Compact automatically once the journal holds this many events
+COMPACT_THRESHOLD = 200
+
+
+def journal_path(data_dir):
+    """Path of the marks journal for a data directory"""
+    return os.path.join(data_dir, JOURNAL_FILE)
+
+
+def make_event(op, mark=None, mark_id=None):
+    """Build a journal event ('add', 'update' or 'delete')"""
+    event = {"op": op, "ts": datetime.now().isoformat()}
+    if op == 'delete':
+        event["id"] = mark_id if mark_id is not None else mark.get('id')
+    else:
+        event["mark"] = mark
+    return event
+
+
+def append_events(data_dir, events):
+    """Append events to the journal with a single write
+
+    If a crash left a torn last line, it is closed off with a newline first
+    so the new events don't run into it. Bytes are never removed, so offsets
+    readers already hold stay valid; read_events skips the torn line.
+    """
+    from data_store import file_lock
+
+    if not events:
+        return 0
+    payload = ''.join(json.dumps(e, ensure_ascii=False) + '\n' for e in events).encode('utf-8')
+    # Same lock DataStore.save takes (re-entrant, so callers may hold it)
+    with file_lock(os.path.join(data_dir, "marks.json")):
+        with open(journal_path(data_dir), 'ab+') as f:
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    payload = b'\n' + payload
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+    return len(events)
+
+
+def read_events(data_dir, offset=0):
+    """Read journal events after a byte offset, in order
+
+    Returns (events, end_offset); pass end_offset back in to read only
+    events appended since. A torn trailing line is skipped.
+    """
+    path = journal_path(data_dir)
+    if not os.path.exists(path):
+        return [], 0
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        payload = f.read()
+
+    events = []
+    for line_number, line in enumerate(payload.decode('utf-8', errors='replace').splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            events.append(json.loads(line))
+        except json.JSONDecodeError:
+            # A crash mid-append can only damage the last line
+            print(f"⚠️ Ignoring unreadable journal line in {path} (line {line_number} after byte {offset})")
+    return events, offset + len(payload)
+
+
+def follow(store, source, apply, reconcile, watch=()):
+    """Catch state derived from the marks up with them
+
+    source is what the previous call returned ({} the first time). If
+    marks.json and the watched collections (e.g. ('exams',)) are unchanged
+    since then, only the journal events appended since are passed to
+    apply(event). Otherwise reconcile(marks) compares the state with the
+    store's marks and returns the number of changes.
+
+    Returns (changes, source to keep for the next call).
+    """
+    from data_store import file_lock, file_version
+
+    files = {'snapshot': 'marks', **{name: name for name in watch}}
+    with file_lock(store.path('marks')):
+        versions = {key: file_version(store.path(name)) for key, name in files.items()}
+        offset = source.get('journalOffset', 0)
+        if all(v is not None and list(v) == source.get(key) for key, v in versions.items()) \
+                and journal_size(store.data_dir) >= offset:
+            events, offset = read_events(store.data_dir, offset)
+            for event in events:
+                apply(event)
+            changes = len(events)
+        else:
+            changes = reconcile(store.marks)
+            # The store's marks are its snapshot plus the journal up to here
+            versions['snapshot'], offset = store.marks_source()
+
+    source = {key: list(v) if v else None for key, v in versions.items()}
+    source['journalOffset'] = offset
+    return changes, source
+
+
+def journal_size(data_dir):
+    """Size of the journal in bytes (0 if there is none)"""
+    try:
+        return os.path.getsize(journal_path(data_dir))
+    except FileNotFoundError:
+        return 0
+
+
+def count_events(data_dir):
+    """Number of events currently in the journal"""
+    path = journal_path(data_dir)
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb') as f:
+        return sum(1 for line in f if line.strip())
+
+
+def apply_event(store, event):
+    """Apply one event to a store's marks (idempotent)"""
+    if event.get('op') == 'delete':
+        store.delete_mark(event.get('id'), journal=False)
+    elif event.get('mark'):
+        store.upsert_mark(event['mark'], journal=False)
+
+
+def replay(store, offset=0):
+    """Apply journal events after a byte offset to a store's marks
+
+    Returns the offset up to which the journal has been applied.
+    """
+    events, end_offset = read_events(store.data_dir, offset)
+    for event in events:
+        apply_event(store, event)
+    return end_offset
+
+
+def clear(data_dir):
+    """Remove the journal once its events are in the snapshot"""
+    path = journal_path(data_dir)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def compact(store):
+    """Write the current marks as a new snapshot and empty the journal
+
+    Replaying is idempotent, so a crash between writing the snapshot and
+    clearing the journal leaves the data unchanged.
+    """
+    from backup_store import backup_file
+    from data_store import file_lock
+
+    marks_file = store.path('marks')
+    store.marks  # loads the snapshot and replays the journal
+    with file_lock(marks_file):
+        backup_file('marks', store.data_dir)
+        store.write_snapshot('marks')
+    return marks_file
+
+
+def compact_pending(store):
+    """Compact if the journal holds events; returns how many were folded
+
+    Scripts that save marks call this before exiting, so the website, which
+    only reads marks.json, shows their marks.
+    """
+    events = count_events(store.data_dir)
+    if events:
+        compact(store)
+        print(f"📝 Folded {events} journal events into marks.json")
+    return events
+
+
+def main():
+    """Main function"""
+    from data_store import get_store
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    store = get_store()
+
+    if command == 'status':
+        events = count_events(store.data_dir)
+        print(f"📁 Snapshot: {store.path('marks')}")
+        print(f"📝 Journal: {journal_path(store.data_dir)} ({events} events)")
+        print(f"📊 Current marks: {len(store.marks)}")
+    elif command == 'compact':
+        events = count_events(store.data_dir)
+        if not events:
+            print("✅ Journal is empty - marks.json is up to date.")
+            return
+        saved_path = compact(store)
+        print(f"✅ Folded {events} journal events into {saved_path}")
+        print(f"📊 Total marks: {len(store.marks)}")
+    else:
+        print("Usage:")
+        print("  python mark_journal.py status")
+        print("  python mark_journal.py compact")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,19 @@
-import json
-import shutil
-from datetime import datetime
+from backup_store import backup_file
+from data_store import get_store
+from id_allocator import IdAllocator
 
 def move_student_between_groups():
     # Create backup first
-    backup_time = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_file = f"public/data/students_backup_{backup_time}.json"
-    shutil.copy2("public/data/students.json", backup_file)
-    print(f"📦 Backup created: {backup_file}")
+    backup_file('students')
     
     # Load students data
-    with open('public/data/students.json', 'r', encoding='utf-8') as f:
-        students = json.load(f)
+    store = get_store()
     
     # Find راشد محمد يحي كليبي
     target_student = None
-    for i, student in enumerate(students):
-        if student['name'] == 'راشد محمد يحي كليبي' and student['groupId'] == 'saipem5':
+    for student in store.group_students('saipem5'):
+        if student['name'] == 'راشد محمد يحي كليبي':
             target_student = student
-            student_index = i
             break
     
     if not target_student:
@@ -31,42 +26,19 @@ def move_student_between_groups():
     print(f"   Current Student ID: {target_student['studentId']}")
     print(f"   Internal ID: {target_student['id']}")
     
-    # Find next available student ID in SAIPEM6
-    saipem6_students = [s for s in students if s['groupId'] == 'saipem6']
-    max_student_id = 0
-    for student in saipem6_students:
-        try:
-            student_id_num = int(student['studentId'])
-            max_student_id = max(max_student_id, student_id_num)
-        except ValueError:
-            continue
-    
-    new_student_id = str(max_student_id + 1)
+    # Next available student ID in SAIPEM6
+    new_student_id = IdAllocator(store).reserve_student_numbers('saipem6')[0]
     
     print(f"\n🔄 Moving to SAIPEM6:")
     print(f"   New Group: saipem6")
     print(f"   New Student ID: {new_student_id}")
     
-    # Update student record
-    target_student['groupId'] = 'saipem6'
+    # Update student record and move it after the last SAIPEM6 student
     target_student['studentId'] = new_student_id
-    
-    # Remove from current position
-    students.pop(student_index)
-    
-    # Find insertion point (after last SAIPEM6 student)
-    insert_index = len(students)
-    for i in range(len(students) - 1, -1, -1):
-        if students[i]['groupId'] == 'saipem6':
-            insert_index = i + 1
-            break
-    
-    # Insert at new position
-    students.insert(insert_index, target_student)
+    store.move_student(target_student, 'saipem6')
     
     # Save updated data
-    with open('public/data/students.json', 'w', encoding='utf-8') as f:
-        json.dump(students, f, ensure_ascii=False, indent=2)
+    store.save('students')
     
     print(f"\n✅ Successfully moved student!")
     print(f"   Name: {target_student['name']}")
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Phonics Mastery
+Tracks which of the 42 Jolly Phonics sounds each student has mastered,
+from the phonics quiz marks, and answers class-wide questions like "which
+sounds have fewer than 60% of SAIPEM6 mastered".
+
+The sounds are the phonics_groups of syllabus_jolly_phonics.json; sound i
+is bit i of an integer, so a student's mastered and tested sounds are two
+small bitsets. A quiz tests the sounds of its phonics groups - the exam's
+"phonicsGroups" field, else the groups in its name ("Jolly Phonics Group
+(1,2,3)"). A mark masters every sound it tests when it is MASTERY_PERCENT
+or more, unless it lists the sounds shown in "soundsMastered". The latest
+quiz on a sound decides.
+
+Like progress_tracker.py, the state (cache/phonics_mastery.json) is updated
+from the mark journal since the last run (mark_journal.follow), and
+reconciled mark by mark when marks.json or exams.json was replaced. The
+state file is rewritten whenever something changed. Class figures are numpy popcounts
+over the group's bitsets.
+
+Usage:
+    python phonics_mastery.py                         # update, then summary per group
+    python phonics_mastery.py --group saipem6         # mastery of every sound in a group
+    python phonics_mastery.py --group saipem6 --below 60   # taught sounds under 60%
+    python phonics_mastery.py --student s001
+    python phonics_mastery.py --rebuild
+
+Requirements:
+    pip install numpy
+"""
+
+import os
+import re
+import sys
+
+import numpy as np
+
+import mark_journal
+from data_store import DATA_DIR, get_store, load_json, save_json
+from progress_tracker import mark_day, mark_percentage
+
+STATE_FILE = os.path.join("cache", "phonics_mastery.json")
+STATE_VERSION = 1
+SYLLABUS_FILE = "syllabus_jolly_phonics.json"
+
+# A quiz mark at or above this masters the sounds it tests
+MASTERY_PERCENT = 70
+
+# Default threshold of --below, in percent of the group
+CLASS_THRESHOLD = 60
+
+PHONICS_GROUPS = re.compile(r'groups?\s*\(?\s*(\d+(?:\s*[-,&]\s*\d+)*)', re.IGNORECASE)
+
+
+def load_sounds(data_dir=DATA_DIR):
+    """(sounds in bit order, {phonics group number: bitset}) from the syllabus"""
+    syllabus = load_json(os.path.join(data_dir, SYLLABUS_FILE), default={}) or {}
+    sounds = []
+    groups = {}
+    for unit in syllabus.get('units', []):
+        for group in unit.get('phonics_groups') or []:
+            bits = 0
+            for sound in group.get('sounds', []):
+                if sound not in sounds:
+                    sounds.append(sound)
+                bits |= 1 << sounds.index(sound)
+            groups[int(group.get('group_id'))] = groups.get(int(group.get('group_id')), 0) | bits
+    return sounds, groups
+
+
+def exam_groups(exam):
+    """Phonics group numbers an exam tests ([] for other exams)"""
+    if exam.get('phonicsGroups'):
+        return [int(g) for g in exam['phonicsGroups']]
+    name = str(exam.get('name', ''))
+    if 'phonics' not in name.lower():
+        return []
+    match = PHONICS_GROUPS.search(name)
+    if not match:
+        return []
+    numbers = []
+    for part in re.split(r'\s*[,&]\s*', match.group(1)):
+        low, _, high = part.partition('-')
+        numbers.extend(range(int(low), int(high or low) + 1))
+    return numbers
+
+
+def bits_of(sounds, names):
+    """Bitset of sound names (unknown names are ignored)"""
+    return sum(1 << sounds.index(name) for name in set(names) if name in sounds)
+
+
+def popcount(values):
+    """Number of set bits of each uint64"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values).astype(np.int64)
+    return np.unpackbits(values.astype('<u8').view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def sound_counts(values, count):
+    """Number of bitsets with each of the first `count` bits set"""
+    if not len(values):
+        return np.zeros(count, dtype=np.int64)
+    columns = np.unpackbits(values.astype('<u8').view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    return columns.sum(axis=0)[:count].astype(np.int64)
+
+
+class MasteryTracker:
+    """Incrementally maintained per-student sound bitsets"""
+
+    def __init__(self, sounds, phonics_groups, state=None):
+        state = state or {}
+        self.sounds = sounds
+        self.phonics_groups = phonics_groups
+        self.source = state.get('source', {})
+        # studentId -> {examId: [markId, day, tested, mastered]}
+        self.results = state.get('results', {})
+        # studentId -> [tested, mastered], folded from results in date order
+        self.students = {sid: tuple(bits) for sid, bits in state.get('students', {}).items()}
+        self.key_of_id = {entry[0]: (sid, exam_id)
+                          for sid, exams in self.results.items() for exam_id, entry in exams.items()}
+        self.exam_bits = {}
+
+    def to_dict(self):
+        return {'version': STATE_VERSION, 'sounds': self.sounds, 'source': self.source,
+                'results': self.results, 'students': {sid: list(bits) for sid, bits in self.students.items()}}
+
+    # ------------------------------------------------------------------
+    # Updates - each costs O(quizzes of one student)
+    # ------------------------------------------------------------------
+
+    def tested_bits(self, exam_id, store):
+        if exam_id not in self.exam_bits:
+            groups = exam_groups(store.exam(exam_id) or {})
+            self.exam_bits[exam_id] = sum(self.phonics_groups.get(g, 0) for g in set(groups))
+        return self.exam_bits[exam_id]
+
+    def entry(self, mark, store):
+        """[markId, day, tested, mastered] of a mark, None if it tests no sounds"""
+        tested = self.tested_bits(mark.get('examId'), store)
+        percentage = mark_percentage(mark)
+        if not tested or percentage is None:
+            return None
+        if mark.get('soundsMastered') is not None:
+            mastered = bits_of(self.sounds, mark['soundsMastered']) & tested
+        else:
+            mastered = tested if percentage >= MASTERY_PERCENT else 0
+        return [mark.get('id'), mark_day(mark), tested, mastered]
+
+    def refold(self, student_id):
+        """Recompute a student's bitsets: the latest quiz on each sound decides"""
+        tested = mastered = 0
+        for _, _, quiz_tested, quiz_mastered in sorted(self.results.get(student_id, {}).values(),
+                                                       key=lambda e: (e[1], str(e[0]))):
+            tested |= quiz_tested
+            mastered = (mastered & ~quiz_tested) | quiz_mastered
+        if tested:
+            self.students[student_id] = (tested, mastered)
+        else:
+            self.students.pop(student_id, None)
+            self.results.pop(student_id, None)
+
+    def remove(self, student_id, exam_id):
+        entry = self.results.get(student_id, {}).pop(exam_id, None)
+        if entry is not None:
+            self.key_of_id.pop(entry[0], None)
+            self.refold(student_id)
+
+    def remove_id(self, mark_id):
+        key = self.key_of_id.get(mark_id)
+        if key is not None:
+            self.remove(*key)
+
+    def upsert(self, mark, store):
+        """Add a mark, replacing the one for the same (student, exam)"""
+        student_id, exam_id = str(mark.get('studentId')), mark.get('examId')
+        self.remove(student_id, exam_id)
+        self.remove_id(mark.get('id'))
+        entry = self.entry(mark, store)
+        if entry is None:
+            return
+        self.results.setdefault(student_id, {})[exam_id] = entry
+        self.key_of_id[entry[0]] = (student_id, exam_id)
+        self.refold(student_id)
+
+    # ------------------------------------------------------------------
+    # Syncing with the data files
+    # ------------------------------------------------------------------
+
+    def sync(self, store):
+        """Bring the state up to date; returns the number of changes applied"""
+
+        def apply(event):
+            if event.get('op') == 'delete':
+                self.remove_id(event.get('id'))
+            elif event.get('mark'):
+                self.upsert(event['mark'], store)
+
+        def reconcile(marks):
+            # marks.json or exams.json was replaced - compare mark by mark
+            changes = 0
+            current = set()
+            for mark in marks:
+                student_id, exam_id = str(mark.get('studentId')), mark.get('examId')
+                entry = self.entry(mark, store)
+                if entry is None:
+                    continue
+                current.add((student_id, exam_id))
+                if self.results.get(student_id, {}).get(exam_id) != entry:
+                    self.upsert(mark, store)
+                    changes += 1
+            for key in [(sid, exam_id) for sid, exam_results in self.results.items()
+                        for exam_id in exam_results if (sid, exam_id) not in current]:
+                self.remove(*key)
+                changes += 1
+            return changes
+
+        changes, self.source = mark_journal.follow(store, self.source, apply, reconcile, watch=('exams',))
+        return changes
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def bitsets(self, student_ids):
+        """(tested, mastered) uint64 arrays for the students, 0 for untested ones"""
+        empty = (0, 0)
+        pairs = [self.students.get(str(sid), empty) for sid in student_ids]
+        tested = np.fromiter((p[0] for p in pairs), dtype=np.uint64, count=len(pairs))
+        mastered = np.fromiter((p[1] for p in pairs), dtype=np.uint64, count=len(pairs))
+        return tested, mastered
+
+    def class_mastery(self, student_ids):
+        """Per-sound figures of a class: {students, assessed, mastered[], tested[], perStudent[]}"""
+        tested, mastered = self.bitsets(student_ids)
+        return {
+            'students': len(tested),
+            'assessed': int(np.count_nonzero(tested)),
+            'mastered': sound_counts(mastered, len(self.sounds)),
+            'tested': sound_counts(tested, len(self.sounds)),
+            'perStudent': popcount(mastered),
+        }
+
+    def sounds_below(self, student_ids, percent=CLASS_THRESHOLD):
+        """[(sound, % of the class that mastered it)] under percent, weakest first
+
+        Only sounds some student of the class was tested on - sounds not
+        taught yet would all be at 0%.
+        """
+        figures = self.class_mastery(student_ids)
+        if not figures['students']:
+            return []
+        shares = figures['mastered'] * 100.0 / figures['students']
+        return [(self.sounds[i], float(shares[i])) for i in np.argsort(shares, kind='stable')
+                if shares[i] < percent and figures['tested'][i]]
+
+    def student_sounds(self, student_id):
+        """(mastered, tested but not mastered) sound names of a student"""
+        tested, mastered = self.students.get(str(student_id), (0, 0))
+        return ([s for i, s in enumerate(self.sounds) if mastered >> i & 1],
+                [s for i, s in enumerate(self.sounds) if (tested & ~mastered) >> i & 1])
+
+
+def load_tracker(data_dir=DATA_DIR, rebuild=False):
+    """Tracker from STATE_FILE (a fresh one if missing, outdated, for other sounds or rebuild=True)"""
+    sounds, phonics_groups = load_sounds(data_dir)
+    state = {} if rebuild else load_json(STATE_FILE, default={})
+    if not isinstance(state, dict) or state.get('version') != STATE_VERSION or state.get('sounds') != sounds:
+        state = {}
+    return MasteryTracker(sounds, phonics_groups, state)
+
+
+def update(store=None, rebuild=False):
+    """Sync the saved state with the data and save it; returns (tracker, changes)"""
+    store = store or get_store()
+    tracker = load_tracker(store.data_dir, rebuild)
+    changes = tracker.sync(store)
+    if changes or rebuild or not os.path.exists(STATE_FILE):
+        save_json(STATE_FILE, tracker.to_dict())
+    return tracker, changes
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    group_id = args[args.index('--group') + 1] if '--group' in args and args.index('--group') + 1 < len(args) else None
+    student_id = args[args.index('--student') + 1] if '--student' in args and args.index('--student') + 1 < len(args) else None
+    below = float(args[args.index('--below') + 1]) if '--below' in args and args.index('--below') + 1 < len(args) else None
+
+    store = get_store()
+    tracker, changes = update(store, rebuild='--rebuild' in args)
+    print("🔤 PHONICS MASTERY")
+    print("=" * 60)
+    if not tracker.sounds:
+        print(f"❌ No phonics groups found in {SYLLABUS_FILE}")
+        sys.exit(1)
+    print(f"🔄 {changes} mark change(s) applied · {len(tracker.sounds)} sounds · "
+          f"{len(tracker.students)} students assessed")
+
+    if student_id:
+        student = store.student(student_id) or {}
+        mastered, not_yet = tracker.student_sounds(student_id)
+        print(f"\n👨‍🎓 {student.get('name', student_id)} ({student.get('groupId', '?')})")
+        print(f"   ✅ Mastered ({len(mastered)}): {' '.join(mastered) or '-'}")
+        print(f"   ⚠️ Not yet ({len(not_yet)}): {' '.join(not_yet) or '-'}")
+        return
+
+    if group_id:
+        ids = [s.get('id') for s in store.group_students(group_id)]
+        figures = tracker.class_mastery(ids)
+        print(f"\n🏫 {group_id}: {figures['students']} students, {figures['assessed']} assessed")
+        if not figures['students']:
+            return
+        if below is not None:
+            weak = tracker.sounds_below(ids, below)
+            print(f"\n⚠️ SOUNDS MASTERED BY FEWER THAN {below:g}% ({len(weak)})")
+            for sound, share in weak:
+                print(f"   {sound:<14} {share:5.1f}%")
+            return
+        print(f"\n{'Sound':<14} {'Mastered':>9} {'Tested':>7} {'% class':>8}")
+        print("-" * 42)
+        for i, sound in enumerate(tracker.sounds):
+            mastered = int(figures['mastered'][i])
+            print(f"{sound:<14} {mastered:>9} {int(figures['tested'][i]):>7} "
+                  f"{mastered * 100 / figures['students']:>7.1f}%")
+        return
+
+    print(f"\n{'Group':<15} {'Students':>8} {'Assessed':>9} {'Avg sounds':>11}  Below {CLASS_THRESHOLD}%")
+    print("-" * 70)
+    for group_id, students in store.students_by_group.items():
+        ids = [s.get('id') for s in students]
+        figures = tracker.class_mastery(ids)
+        if not figures['assessed']:
+            continue
+        weak = tracker.sounds_below(ids)
+        print(f"{group_id:<15} {figures['students']:>8} {figures['assessed']:>9} "
+              f"{figures['perStudent'].mean():>11.1f}  {len(weak)} sound(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Progress Tracker
+Follows each student's and group's percentages over time (e.g. Placement
+Test -> Jolly Phonics quizzes) and flags students who may need help:
+
+    low_average   rolling average of the last marks below 50%
+    declining     rolling trend falling by DECLINE_PER_MONTH points a month or more
+    sharp_drop    latest mark SHARP_DROP points or more below their earlier average
+
+The series are kept in cache/progress_state.json and updated
+incrementally: only the mark journal since the last run is read and
+applied (see mark_journal.follow). When marks.json itself is replaced
+(compaction, restore) the state is reconciled against it mark by mark
+instead of being rebuilt. The state file is rewritten whenever something
+changed.
+
+Usage:
+    python progress_tracker.py                    # update, then list at-risk students
+    python progress_tracker.py --group saipem6    # trends of every student in a group
+    python progress_tracker.py --student s001     # one student's series
+    python progress_tracker.py --rebuild          # start the state over
+"""
+
+import os
+import sys
+from bisect import insort
+from datetime import date
+
+import mark_journal
+from data_store import get_store, load_json, save_json
+
+STATE_FILE = os.path.join("cache", "progress_state.json")
+STATE_VERSION = 1
+
+# Number of latest marks (or exams, for groups) the rolling figures cover
+WINDOW = 5
+
+# At-risk thresholds, in percentage points
+LOW_AVERAGE = 50
+DECLINE_PER_MONTH = 5
+SHARP_DROP = 20
+
+EPOCH = date(2000, 1, 1)
+
+
+def mark_day(mark):
+    """Day number of a mark (from its date, else createdAt)"""
+    text = str(mark.get('date') or mark.get('createdAt') or '')[:10]
+    try:
+        return (date.fromisoformat(text) - EPOCH).days
+    except ValueError:
+        return 0
+
+
+def mark_percentage(mark):
+    """Percentage of a mark as a number, None if it can't be worked out"""
+    try:
+        return float(mark.get('percentage'))
+    except (TypeError, ValueError):
+        try:
+            return float(mark['score']) / float(mark['maxScore']) * 100
+        except (KeyError, TypeError, ValueError, ZeroDivisionError):
+            return None
+
+
+def rolling(points):
+    """(average, slope per 30 days) of the last WINDOW (day, value) points"""
+    points = points[-WINDOW:]
+    if not points:
+        return None, None
+    values = [v for _, v in points]
+    mean = sum(values) / len(values)
+    days = [d for d, _ in points]
+    mean_day = sum(days) / len(days)
+    spread = sum((d - mean_day) ** 2 for d in days)
+    if len(points) < 2 or spread == 0:
+        return mean, None
+    slope = sum((d - mean_day) * (v - mean) for d, v in points) / spread
+    return mean, slope * 30
+
+
+class ProgressTracker:
+    """Incrementally maintained per-student and per-group series"""
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.source = state.get('source', {})
+        # "studentId|examId" -> [markId, groupId, day, percentage]
+        self.marks = state.get('marks', {})
+        # studentId -> [[day, percentage, examId], ...] sorted by day
+        self.students = state.get('students', {})
+        # groupId -> {examId: [count, sum, day]}
+        self.groups = state.get('groups', {})
+        self.key_of_id = {entry[0]: key for key, entry in self.marks.items()}
+
+    def to_dict(self):
+        return {'version': STATE_VERSION, 'source': self.source, 'marks': self.marks,
+                'students': self.students, 'groups': self.groups}
+
+    # ------------------------------------------------------------------
+    # Updates - each costs O(marks of one student), whatever the history
+    # ------------------------------------------------------------------
+
+    def remove(self, key):
+        entry = self.marks.pop(key, None)
+        if entry is None:
+            return
+        mark_id, group_id, day, percentage = entry
+        self.key_of_id.pop(mark_id, None)
+        student_id, exam_id = key.split('|', 1)
+
+        series = self.students.get(student_id, [])
+        for i, point in enumerate(series):
+            if point[2] == exam_id:
+                del series[i]
+                break
+        if not series:
+            self.students.pop(student_id, None)
+
+        exam = self.groups.get(group_id, {}).get(exam_id)
+        if exam:
+            exam[0] -= 1
+            exam[1] -= percentage
+            if exam[0] <= 0:
+                del self.groups[group_id][exam_id]
+
+    def remove_id(self, mark_id):
+        key = self.key_of_id.get(mark_id)
+        if key is not None:
+            self.remove(key)
+
+    def upsert(self, mark, group_id):
+        """Add a mark, replacing the one for the same (student, exam)"""
+        percentage = mark_percentage(mark)
+        key = f"{mark.get('studentId')}|{mark.get('examId')}"
+        self.remove(key)
+        self.remove_id(mark.get('id'))
+        if percentage is None:
+            return
+        day = mark_day(mark)
+        self.marks[key] = [mark.get('id'), group_id, day, percentage]
+        self.key_of_id[mark.get('id')] = key
+        insort(self.students.setdefault(str(mark.get('studentId')), []), [day, percentage, mark.get('examId')])
+
+        exam = self.groups.setdefault(group_id, {}).setdefault(mark.get('examId'), [0, 0.0, day])
+        exam[0] += 1
+        exam[1] += percentage
+        exam[2] = min(exam[2], day)
+
+    def unchanged(self, mark, group_id):
+        """True if the state already holds exactly this mark"""
+        entry = self.marks.get(f"{mark.get('studentId')}|{mark.get('examId')}")
+        return entry == [mark.get('id'), group_id, mark_day(mark), mark_percentage(mark)]
+
+    # ------------------------------------------------------------------
+    # Syncing with the data files
+    # ------------------------------------------------------------------
+
+    def sync(self, store):
+        """Bring the state up to date; returns the number of changes applied"""
+        group_of = {s.get('id'): s.get('groupId') for s in store.students}
+
+        def apply(event):
+            if event.get('op') == 'delete':
+                self.remove_id(event.get('id'))
+            elif event.get('mark'):
+                mark = event['mark']
+                self.upsert(mark, group_of.get(mark.get('studentId')))
+
+        def reconcile(marks):
+            # marks.json was replaced - compare mark by mark
+            changes = 0
+            current = set()
+            for mark in marks:
+                key = f"{mark.get('studentId')}|{mark.get('examId')}"
+                current.add(key)
+                group_id = group_of.get(mark.get('studentId'))
+                if not self.unchanged(mark, group_id):
+                    self.upsert(mark, group_id)
+                    changes += 1
+            for key in [k for k in self.marks if k not in current]:
+                self.remove(key)
+                changes += 1
+            return changes
+
+        changes, self.source = mark_journal.follow(store, self.source, apply, reconcile)
+        return changes
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def student_trend(self, student_id):
+        """Latest figures and at-risk flags for a student (None if no marks)"""
+        series = self.students.get(student_id)
+        if not series:
+            return None
+        points = [(day, value) for day, value, _ in series]
+        average, slope = rolling(points)
+        flags = []
+        if average < LOW_AVERAGE:
+            flags.append('low_average')
+        if slope is not None and len(points) >= 3 and slope <= -DECLINE_PER_MONTH:
+            flags.append('declining')
+        if len(points) >= 2:
+            earlier = [v for _, v in points[-WINDOW - 1:-1]]
+            if sum(earlier) / len(earlier) - points[-1][1] >= SHARP_DROP:
+                flags.append('sharp_drop')
+        return {
+            'marks': len(series),
+            'latest': points[-1][1],
+            'rollingAverage': average,
+            'slopePerMonth': slope,
+            'flags': flags,
+            'series': series,
+        }
+
+    def group_trend(self, group_id):
+        """Exam-by-exam averages of a group with rolling figures"""
+        exams = sorted(self.groups.get(group_id, {}).items(), key=lambda item: item[1][2])
+        points = [(day, total / count) for _, (count, total, day) in exams if count]
+        average, slope = rolling(points)
+        return {'exams': [(exam_id, total / count) for exam_id, (count, total, _) in exams if count],
+                'rollingAverage': average, 'slopePerMonth': slope}
+
+
+def load_tracker(rebuild=False):
+    """Tracker from STATE_FILE (a fresh one if missing, outdated or rebuild=True)"""
+    state = {} if rebuild else load_json(STATE_FILE, default={})
+    if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+        state = {}
+    return ProgressTracker(state)
+
+
+def update(store=None, rebuild=False):
+    """Sync the saved state with the data and save it; returns (tracker, changes)"""
+    store = store or get_store()
+    tracker = load_tracker(rebuild)
+    changes = tracker.sync(store)
+    if changes or rebuild or not os.path.exists(STATE_FILE):
+        save_json(STATE_FILE, tracker.to_dict())
+    return tracker, changes
+
+
+def fmt(value, suffix=''):
+    return '-' if value is None else f"{value:+.1f}{suffix}" if suffix else f"{value:.1f}"
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    group_id = args[args.index('--group') + 1] if '--group' in args and args.index('--group') + 1 < len(args) else None
+    student_id = args[args.index('--student') + 1] if '--student' in args and args.index('--student') + 1 < len(args) else None
+
+    store = get_store()
+    tracker, changes = update(store, rebuild='--rebuild' in args)
+    print("📈 STUDENT PROGRESS")
+    print("=" * 60)
+    print(f"🔄 {changes} mark change(s) applied · tracking {len(tracker.students)} students")
+
+    if student_id:
+        trend = tracker.student_trend(student_id)
+        student = store.student(student_id) or {}
+        print(f"\n👨‍🎓 {student.get('name', student_id)} ({student.get('groupId', '?')})")
+        if trend is None:
+            print("   No marks yet.")
+            return
+        for day, value, exam_id in trend['series']:
+            exam = store.exam(exam_id) or {}
+            print(f"   {EPOCH.fromordinal(EPOCH.toordinal() + day)}  {value:5.1f}%  {exam.get('name', exam_id)}")
+        print(f"   Rolling average: {fmt(trend['rollingAverage'])}% · trend {fmt(trend['slopePerMonth'], ' pts/month')}")
+        print(f"   Flags: {', '.join(trend['flags']) or 'none'}")
+        return
+
+    if group_id:
+        group = tracker.group_trend(group_id)
+        print(f"\n🏫 {group_id}: rolling average {fmt(group['rollingAverage'])}% · "
+              f"trend {fmt(group['slopePerMonth'], ' pts/month')}")
+        for exam_id, value in group['exams']:
+            print(f"   {value:5.1f}%  {(store.exam(exam_id) or {}).get('name', exam_id)}")
+        students = store.group_students(group_id)
+    else:
+        students = store.students
+
+    rows = []
+    for student in students:
+        trend = tracker.student_trend(student.get('id'))
+        if trend and (group_id or trend['flags']):
+            rows.append((student, trend))
+    rows.sort(key=lambda r: (-len(r[1]['flags']), r[1]['rollingAverage']))
+
+    title = f"STUDENTS OF {group_id}" if group_id else "AT-RISK STUDENTS"
+    print(f"\n⚠️ {title} ({len(rows)})" if not group_id else f"\n👨‍🎓 {title} ({len(rows)})")
+    print(f"{'ID':<12} {'Name':<36} {'Group':<10} {'Marks':>5} {'Latest':>7} {'Avg':>6} {'Trend':>7}  Flags")
+    print("-" * 110)
+    for student, trend in rows:
+        print(f"{student.get('id'):<12} {student.get('name', '')[:35]:<36} {student.get('groupId', ''):<10} "
+              f"{trend['marks']:>5} {trend['latest']:>7.1f} {trend['rollingAverage']:>6.1f} "
+              f"{fmt(trend['slopePerMonth']):>7}  {', '.join(trend['flags'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Publish Data
+Prepares public/data for deployment so browsers can cache it forever:
+
+    1. validates the data (see validate_data.py) and stops on errors,
+       folds the mark journal into marks.json and rebuilds analytics.json,
+       the group shards and the syllabus chunks
+    2. minifies every data file (including the group shards)
+    3. writes it as public/data/published/<name>.<hash>.json
+       (with --precompress also .gz, and .br when the brotli module is
+       installed, for servers that serve those - GitHub Pages can't, and
+       compresses on the fly instead)
+    4. writes public/data/data-manifest.json mapping each file to its
+       hashed copy - the app reads this once and fetches the hashed names
+
+A file's name only changes when its content does, so unchanged data can be
+served with a far-future cache header. Old hashed copies are removed.
+
+It runs automatically before `npm run build` (and so `npm run deploy`);
+the published folder and manifest are build output and aren't committed.
+
+Vite copies all of public/ into dist; vite.config.js removes the files the
+site never reads (mark journal, lock files, ID sequences, backups) from
+the build.
+
+Usage:
+    python publish_data.py
+    python publish_data.py --force         # publish even if validation fails
+    python publish_data.py --precompress   # also write .gz/.br copies
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+
+import mark_journal
+from build_analytics import ANALYTICS_FILE, build_analytics
+from build_group_shards import write_shards
+from build_syllabus_chunks import write_chunks
+from data_store import DATA_DIR, get_store, save_json
+from id_allocator import SEQUENCES_FILE
+from validate_data import validate
+
+PUBLISHED_DIR = "published"
+MANIFEST_FILE = "data-manifest.json"
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def data_files(data_dir):
+    """Relative paths of the JSON files the site reads (backups and ID sequences excluded)"""
+    files = []
+    for root, dirs, names in os.walk(data_dir):
+        dirs[:] = sorted(d for d in dirs if d != PUBLISHED_DIR)
+        for name in sorted(names):
+            if not name.endswith('.json') or 'backup' in name or name in (MANIFEST_FILE, SEQUENCES_FILE):
+                continue
+            files.append(os.path.relpath(os.path.join(root, name), data_dir).replace(os.sep, '/'))
+    return files
+
+
+def minify(filepath):
+    """File content as compact JSON bytes"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def hashed_name(relative_path, payload):
+    """'groups/nesma/marks.json' -> 'groups/nesma/marks.1a2b3c4d5e.json'"""
+    digest = hashlib.sha256(payload).hexdigest()[:10]
+    base, ext = os.path.splitext(relative_path)
+    return f"{base}.{digest}{ext}"
+
+
+def write_file(filepath, payload):
+    """Write bytes, creating folders as needed"""
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, 'wb') as f:
+        f.write(payload)
+
+
+def publish(data_dir=DATA_DIR, precompress=False):
+    """Publish every data file; returns (manifest, stats)
+
+    Gzip sizes are always reported; the .gz/.br copies are only written
+    with precompress=True.
+    """
+    published_dir = os.path.join(data_dir, PUBLISHED_DIR)
+    manifest = {'files': {}}
+    stats = {'files': 0, 'written': 0, 'original': 0, 'minified': 0, 'gzip': 0, 'brotli': 0}
+    keep = set()
+
+    for relative_path in data_files(data_dir):
+        source = os.path.join(data_dir, relative_path)
+        try:
+            payload = minify(source)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            print(f"⚠️ Skipping {relative_path} - not valid JSON")
+            continue
+
+        target_name = hashed_name(relative_path, payload)
+        target = os.path.join(published_dir, target_name)
+        manifest['files'][relative_path] = f"{PUBLISHED_DIR}/{target_name}"
+        keep.add(target)
+        if precompress:
+            keep.update({target + '.gz', target + '.br'})
+
+        stats['files'] += 1
+        stats['original'] += os.path.getsize(source)
+        stats['minified'] += len(payload)
+
+        compressed = gzip.compress(payload, compresslevel=9, mtime=0)
+        stats['gzip'] += len(compressed)
+        if not os.path.exists(target):
+            # Same name means same content, so existing copies are reused
+            write_file(target, payload)
+            stats['written'] += 1
+        if precompress:
+            if not os.path.exists(target + '.gz'):
+                write_file(target + '.gz', compressed)
+            if brotli is not None:
+                if not os.path.exists(target + '.br'):
+                    write_file(target + '.br', brotli.compress(payload))
+                stats['brotli'] += os.path.getsize(target + '.br')
+
+    # Remove hashed copies of old versions
+    for root, dirs, names in os.walk(published_dir, topdown=False):
+        for name in names:
+            path = os.path.join(root, name)
+            if path not in keep:
+                os.remove(path)
+        if root != published_dir and not os.listdir(root):
+            os.rmdir(root)
+
+    save_json(os.path.join(data_dir, MANIFEST_FILE), manifest)
+    return manifest, stats
+
+
+def main():
+    """Main function"""
+    print("🚀 PUBLISHING DATA")
+    print("=" * 50)
+
+    store = get_store()
+    report, _ = validate(store)
+    if report.errors:
+        print(f"❌ Validation found {report.errors} error(s) - run 'python validate_data.py' for details")
+        if '--force' not in sys.argv[1:]:
+            sys.exit(1)
+        print("⚠️ Publishing anyway (--force)")
+    else:
+        print(f"🔎 Validation passed ({report.warnings} warning(s))")
+
+    mark_journal.compact_pending(store)
+    save_json(os.path.join(store.data_dir, ANALYTICS_FILE), build_analytics(store))
+    write_shards(store)
+    write_chunks(store.data_dir)
+    print("📊 Rebuilt analytics.json, group shards and syllabus chunks")
+
+    precompress = '--precompress' in sys.argv[1:]
+    manifest, stats = publish(store.data_dir, precompress)
+
+    print(f"   • Files: {stats['files']} ({stats['written']} new versions)")
+    print(f"   • Original: {stats['original']:,} bytes")
+    print(f"   • Minified: {stats['minified']:,} bytes")
+    print(f"   • Gzip: {stats['gzip']:,} bytes" + ("" if precompress else " (served compressed by the host)"))
+    if precompress:
+        if brotli is not None:
+            print(f"   • Brotli: {stats['brotli']:,} bytes")
+        else:
+            print("   • Brotli: skipped (pip install brotli to enable)")
+    print(f"\n✅ Manifest: {os.path.join(store.data_dir, MANIFEST_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
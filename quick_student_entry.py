@@ -4,64 +4,31 @@ Quick Student Mark Entry Script
 This script provides quick access to add or edit marks for individual students
 """
 
-import json
-import os
 from datetime import datetime
 import uuid
 
-def load_data():
-    """Load existing data from JSON files"""
-    try:
-        with open('public/data/students.json', 'r', encoding='utf-8') as f:
-            students = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        students = []
-
-    try:
-        with open('public/data/groups.json', 'r', encoding='utf-8') as f:
-            groups = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        groups = []
-
-    try:
-        with open('public/data/exams.json', 'r', encoding='utf-8') as f:
-            exams = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        exams = []
-
-    try:
-        with open('public/data/marks.json', 'r', encoding='utf-8') as f:
-            marks = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        marks = []
+import mark_journal
+from data_store import get_store
+from student_search import get_index
 
-    return students, groups, exams, marks
+def load_data():
+    """Load existing data through the shared data store"""
+    return get_store()
 
-def create_backup():
-    """Create backup of existing marks.json"""
-    if os.path.exists('public/data/marks.json'):
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_name = f'public/data/marks_backup_{timestamp}.json'
-        import shutil
-        shutil.copy2('public/data/marks.json', backup_name)
-        print(f"📋 Created backup: {backup_name}")
+def search_students(store, search_term):
+    """Search for students by name or ID (tolerates Arabic spelling variants)
 
-def search_students(students, search_term):
-    """Search for students by name or ID"""
-    search_term = search_term.lower().strip()
-    matching_students = []
-    
-    for student in students:
-        student_name = student.get('name', '').lower()
-        student_id = str(student.get('id', '')).lower()
-        student_number = str(student.get('studentId', '')).lower()
-        
-        if (search_term in student_name or 
-            search_term in student_id or 
-            search_term in student_number):
-            matching_students.append(student)
-    
-    return matching_students
+    Names go through the cached search index; IDs and student numbers also
+    match on any part, so 'n00' lists n001-n009.
+    """
+    found = [student for _, student in get_index(store).search(search_term, limit=None)]
+    term = search_term.lower().strip()
+    seen = {student.get('id') for student in found}
+    for student in store.students:
+        if student.get('id') not in seen and any(
+                term in str(student.get(key) or '').lower() for key in ('id', 'studentId')):
+            found.append(student)
+    return found
 
 def display_students(students):
     """Display students list"""
@@ -94,18 +61,10 @@ def display_students(students):
     
     return students
 
-def display_exams_for_student(exams, student_group_id):
+def display_exams_for_student(store, student_group_id):
     """Display exams available for the student's group"""
-    available_exams = []
-    for exam in exams:
-        # Exam is available if:
-        # 1. It has no assignedGroups (available to all), OR
-        # 2. It has assignedGroups and includes this group_id, OR  
-        # 3. Legacy: it has groupId that matches (backward compatibility)
-        if (not exam.get('assignedGroups') and not exam.get('groupId')) or \
-           (exam.get('assignedGroups') and student_group_id in exam.get('assignedGroups', [])) or \
-           (exam.get('groupId') == student_group_id):
-            available_exams.append(exam)
+    # See DataStore.exams_for_group for the availability rules
+    available_exams = store.exams_for_group(student_group_id)
     
     if not available_exams:
         print("❌ No exams found for this student's group.")
@@ -121,14 +80,13 @@ def display_exams_for_student(exams, student_group_id):
     
     return available_exams
 
-def get_student_current_marks(student, marks):
+def get_student_current_marks(student, store):
     """Get all current marks for a student"""
-    student_marks = [m for m in marks if m.get('studentId') == student.get('id')]
-    return student_marks
+    return store.student_marks(student.get('id'))
 
-def display_student_marks(student, exams, marks):
+def display_student_marks(student, store):
     """Display student's current marks"""
-    student_marks = get_student_current_marks(student, marks)
+    student_marks = get_student_current_marks(student, store)
     
     if not student_marks:
         print(f"\n📝 {student['name']} has no marks yet.")
@@ -140,7 +98,7 @@ def display_student_marks(student, exams, marks):
     print("-" * 70)
     
     for mark in student_marks:
-        exam = next((e for e in exams if e.get('id') == mark.get('examId')), None)
+        exam = store.exam(mark.get('examId'))
         exam_name = exam.get('name', 'Unknown Exam') if exam else 'Unknown Exam'
         score_display = f"{mark.get('score', 'N/A')}/{mark.get('maxScore', 'N/A')}"
         percentage = f"{mark.get('percentage', 'N/A')}%"
@@ -148,14 +106,14 @@ def display_student_marks(student, exams, marks):
         
         print(f"{exam_name:<25} {score_display:<15} {percentage:<12} {date:<12}")
 
-def evaluate_student_for_exam(student, exam, marks):
+def evaluate_student_for_exam(student, exam, store):
     """Evaluate a specific student for a specific exam"""
     print(f"\n🎯 EVALUATING: {student['name']}")
     print(f"📚 Exam: {exam['name']}")
     print(f"📊 Maximum Score: {exam['maxScore']}")
     
     # Check if student already has a mark for this exam
-    existing_mark = next((m for m in marks if m.get('studentId') == student.get('id') and m.get('examId') == exam.get('id')), None)
+    existing_mark = store.mark_for(student.get('id'), exam.get('id'))
     
     if existing_mark:
         print(f"\n⚠️ EXISTING MARK FOUND:")
@@ -166,7 +124,7 @@ def evaluate_student_for_exam(student, exam, marks):
         proceed = input("\nDo you want to UPDATE this mark? (y/N): ").strip().lower()
         if proceed not in ['y', 'yes']:
             print("❌ Operation cancelled.")
-            return marks, False
+            return False
     
     # Get new score
     while True:
@@ -174,7 +132,7 @@ def evaluate_student_for_exam(student, exam, marks):
             score_input = input(f"\nEnter score (0-{exam['maxScore']}): ").strip()
             if score_input.lower() == 'q':
                 print("❌ Operation cancelled.")
-                return marks, False
+                return False
                 
             score = float(score_input)
             
@@ -198,7 +156,7 @@ def evaluate_student_for_exam(student, exam, marks):
     confirm = input("\nSave this mark? (y/N): ").strip().lower()
     if confirm not in ['y', 'yes']:
         print("❌ Mark not saved.")
-        return marks, False
+        return False
     
     # Create/update mark
     new_mark = {
@@ -212,21 +170,14 @@ def evaluate_student_for_exam(student, exam, marks):
         "createdAt": datetime.now().isoformat()
     }
     
-    updated_marks = marks.copy()
-    
+    # Add new mark or replace the existing one
+    store.upsert_mark(new_mark)
     if existing_mark:
-        # Update existing mark
-        for i, mark in enumerate(updated_marks):
-            if mark.get('id') == existing_mark.get('id'):
-                updated_marks[i] = new_mark
-                break
         print(f"✅ Updated mark for {student['name']}: {score}/{exam['maxScore']} ({percentage:.1f}%)")
     else:
-        # Add new mark
-        updated_marks.append(new_mark)
         print(f"✅ Added new mark for {student['name']}: {score}/{exam['maxScore']} ({percentage:.1f}%)")
     
-    return updated_marks, True
+    return True
 
 def main():
     """Main function"""
@@ -234,9 +185,11 @@ def main():
     print("=" * 50)
     print("This tool provides quick access to add or edit individual student marks.")
     
+    store = None
     try:
         # Load existing data
-        students, groups, exams, marks = load_data()
+        store = load_data()
+        students, exams, marks = store.students, store.exams, store.marks
         
         print(f"\n📊 System Status: {len(students)} students, {len(exams)} exams, {len(marks)} marks")
         
@@ -248,8 +201,8 @@ def main():
             print("\n❌ No exams found. Please create exams first.")
             return
         
-        # Create backup
-        create_backup()
+        # No full backup needed: saves only append to the mark journal,
+        # marks.json itself is untouched until compaction
         
         # Main loop
         while True:
@@ -268,7 +221,7 @@ def main():
                 continue
             
             # Search for students
-            found_students = search_students(students, search_input)
+            found_students = search_students(store, search_input)
             
             if not found_students:
                 print(f"❌ No students found matching: '{search_input}'")
@@ -296,10 +249,10 @@ def main():
             print(f"\n👨‍🎓 Selected Student: {selected_student['name']} (Group: {selected_student.get('groupId', 'N/A')})")
             
             # Show current marks
-            display_student_marks(selected_student, exams, marks)
+            display_student_marks(selected_student, store)
             
             # Show available exams
-            available_exams = display_exams_for_student(exams, selected_student.get('groupId'))
+            available_exams = display_exams_for_student(store, selected_student.get('groupId'))
             if not available_exams:
                 continue
             
@@ -314,16 +267,12 @@ def main():
                         selected_exam = available_exams[int(exam_choice) - 1]
                         
                         # Evaluate student for this exam
-                        updated_marks, changed = evaluate_student_for_exam(selected_student, selected_exam, marks)
+                        changed = evaluate_student_for_exam(selected_student, selected_exam, store)
                         
                         if changed:
                             # Save changes
-                            os.makedirs('public/data', exist_ok=True)
-                            with open('public/data/marks.json', 'w', encoding='utf-8') as f:
-                                json.dump(updated_marks, f, indent=2, ensure_ascii=False)
-                            
-                            marks = updated_marks  # Update local copy
-                            print(f"\n💾 Changes saved to marks.json")
+                            store.save('marks')
+                            print(f"\n💾 Changes saved to the mark journal")
                         
                         break
                     else:
@@ -336,6 +285,10 @@ def main():
     except Exception as e:
         print(f"\n❌ Error: {e}")
         print("Please check your data files and try again.")
+    finally:
+        # Marks were journaled as they were entered; fold them into marks.json
+        if store is not None:
+            mark_journal.compact_pending(store)
 
 if __name__ == "__main__":
     main()
@@ -4,37 +4,20 @@ Script to remove duplicate student IDs from students.json.
 This fixes cases where different students have the same ID but different names.
 """
 
-import json
 import os
-from datetime import datetime
 import sys
 
-def load_json_file(filepath):
-    """Load JSON file safely."""
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"❌ Error: File {filepath} not found")
-        sys.exit(1)
-    except json.JSONDecodeError as e:
-        print(f"❌ Error: Invalid JSON in {filepath}: {e}")
-        sys.exit(1)
+from backup_store import backup_file
+from data_store import get_store
 
-def save_json_file(filepath, data):
-    """Save JSON file safely with backup."""
+def save_json_file(store, name, data):
+    """Save a data collection safely with backup."""
     # Create backup first
-    backup_name = f"{filepath}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-    if os.path.exists(filepath):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            backup_data = f.read()
-        with open(backup_name, 'w', encoding='utf-8') as f:
-            f.write(backup_data)
-        print(f"📋 Backup created: {backup_name}")
-    
-    # Save new data
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    backup_file(name, store.data_dir)
+    
+    # Save new data (a full snapshot, which also folds in the mark journal)
+    store.replace(name, data)
+    store.write_snapshot(name)
 
 def find_id_duplicates(students):
     """Find duplicate students based on identical IDs."""
@@ -76,8 +59,9 @@ def main():
     print("=" * 60)
     
     # Define file paths
-    students_file = "public/data/students.json"
-    marks_file = "public/data/marks.json"
+    store = get_store()
+    students_file = store.path('students')
+    marks_file = store.path('marks')
     
     # Check if files exist
     if not os.path.exists(students_file):
@@ -90,11 +74,11 @@ def main():
     
     # Load data
     print("📂 Loading student data...")
-    students = load_json_file(students_file)
+    students = store.students
     print(f"📊 Total students loaded: {len(students)}")
     
     print("📂 Loading marks data...")
-    marks = load_json_file(marks_file)
+    marks = store.marks
     print(f"📊 Total marks loaded: {len(marks)}")
     
     # Find ID duplicates
@@ -116,7 +100,7 @@ def main():
         return
     
     # Get IDs of duplicate students
-    duplicate_ids = [student['id'] for student in duplicates]
+    duplicate_ids = {student['id'] for student in duplicates}
     print(f"\n🗑️  Removing {len(duplicate_ids)} duplicate student IDs...")
     
     # Remove duplicates from students list (keep only first occurrence of each ID)
@@ -133,8 +117,8 @@ def main():
     
     # Save cleaned data
     print("\n💾 Saving cleaned data...")
-    save_json_file(students_file, cleaned_students)
-    save_json_file(marks_file, cleaned_marks)
+    save_json_file(store, 'students', cleaned_students)
+    save_json_file(store, 'marks', cleaned_marks)
     
     # Summary
     print("\n" + "=" * 60)
@@ -146,7 +130,7 @@ def main():
     for student in duplicates:
         print(f"   • {student['name']} (ID: {student['id']}, Group: {student.get('groupId', 'N/A')})")
     
-    print("\n💡 Tip: Check the backup files if you need to restore any data")
+    print("\n💡 Tip: Use 'python backup_store.py list' to find a snapshot if you need to restore any data")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
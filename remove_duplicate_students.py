@@ -1,148 +1,346 @@
 #!/usr/bin/env python3
 """
-Script to remove duplicate students from students.json based on identical names.
-Keeps the first occurrence of each name and removes subsequent duplicates.
-Also removes any marks associated with the duplicate students.
+Script to find and merge duplicate students in students.json.
+
+Catches near-duplicates as well as identical names: the same person
+entered twice with a spelling variant, or re-entered in another group.
+Candidates are only compared within blocks that share a normalized name
+key (first + last name, first + second name, name prefix) or a group +
+student number, so the work grows with the data rather than with every
+possible pair. Each candidate pair is scored on name similarity, student
+number, group and enrollment date, and the best proposals are listed
+first.
+
+Merging keeps one record per duplicate cluster (the one with the most
+marks, then the earliest enrolled) and re-points the other records'
+marks to it instead of deleting them. When both records have a mark for
+the same exam the most recent one is kept.
+
+Usage:
+    python remove_duplicate_students.py                  # list proposals
+    python remove_duplicate_students.py --min-score 0.8  # stricter threshold
+    python remove_duplicate_students.py --json out.json  # save proposals
+    python remove_duplicate_students.py --merge          # merge after confirmation
 """
 
 import json
 import os
-from datetime import datetime
 import sys
+from difflib import SequenceMatcher
+
+import mark_journal
+from backup_store import backup_file
+from data_store import get_store
+from student_search import tokenize, trigrams
+
+# Name parts that don't help tell people apart
+FILLER_WORDS = {'بن', 'ابن', 'بنت', 'ال', 'bin', 'ibn', 'bint', 'al', 'el'}
+
+# Blocks larger than this are too generic to be useful and are skipped
+MAX_BLOCK_SIZE = 200
+
+# Length of the name-prefix blocking key
+PREFIX_LENGTH = 6
+
+# Pair score weights (they add up to 1). Most students share an enrollment
+# date, so it counts for little
+NAME_WEIGHT = 0.7
+STUDENT_ID_WEIGHT = 0.15
+GROUP_WEIGHT = 0.1
+ENROLLED_WEIGHT = 0.05
+
+# Names less similar than this are never proposed, whatever else matches
+MIN_NAME_SIMILARITY = 0.9
+
+# Share of trigrams two names must have in common (Dice) to be scored at all
+MIN_TRIGRAM_OVERLAP = 0.5
+
+# Default score a pair needs to be proposed (identical names alone reach it)
+DEFAULT_MIN_SCORE = 0.7
 
-def load_json_file(filepath):
-    """Load JSON file safely."""
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"❌ Error: File {filepath} not found")
-        sys.exit(1)
-    except json.JSONDecodeError as e:
-        print(f"❌ Error: Invalid JSON in {filepath}: {e}")
-        sys.exit(1)
 
-def save_json_file(filepath, data):
-    """Save JSON file safely with backup."""
+def save_json_file(store, name, data):
+    """Save a data collection safely with backup."""
     # Create backup first
-    backup_name = f"{filepath}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-    if os.path.exists(filepath):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            backup_data = f.read()
-        with open(backup_name, 'w', encoding='utf-8') as f:
-            f.write(backup_data)
-        print(f"📋 Backup created: {backup_name}")
-    
-    # Save new data
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-def find_duplicates(students):
-    """Find duplicate students based on identical names."""
-    name_to_students = {}
-    duplicates = []
-    
-    for student in students:
-        name = student['name'].strip()
-        if name not in name_to_students:
-            name_to_students[name] = []
-        name_to_students[name].append(student)
-    
-    # Find names with multiple students
-    for name, student_list in name_to_students.items():
-        if len(student_list) > 1:
-            # Keep the first one, mark others as duplicates
-            duplicates.extend(student_list[1:])
-            print(f"🔍 Found {len(student_list)} students with name: '{name}'")
-            for i, student in enumerate(student_list):
-                status = "KEEP" if i == 0 else "REMOVE"
-                print(f"   {status}: ID {student['id']} - Group: {student.get('groupId', 'N/A')} - Enrolled: {student.get('dateEnrolled', 'N/A')}")
-    
-    return duplicates
-
-def remove_duplicate_marks(marks, duplicate_student_ids):
-    """Remove marks associated with duplicate students."""
-    original_count = len(marks)
-    cleaned_marks = [mark for mark in marks if mark['studentId'] not in duplicate_student_ids]
-    removed_count = original_count - len(cleaned_marks)
-    
-    if removed_count > 0:
-        print(f"🗑️  Removed {removed_count} marks associated with duplicate students")
-    
-    return cleaned_marks
+    backup_file(name, store.data_dir)
+
+    # Save new data (a full snapshot, which also folds in the mark journal)
+    store.replace(name, data)
+    store.write_snapshot(name)
+
+def core_name(name):
+    """Normalized name words without fillers or the 'ال' article
+
+    A final ى is written both as a letter of its own and not at all
+    ('يحيى' / 'يحي'); normalize() turns it into ي, so a doubled final ي
+    is folded into one.
+    """
+    words = []
+    for word in tokenize(name):
+        if word in FILLER_WORDS:
+            continue
+        if word.startswith('ال') and len(word) > 4:
+            word = word[2:]
+        if word.endswith('يي') and len(word) > 3:
+            word = word[:-1]
+        words.append(word)
+    return words
+
+def blocking_keys(student, words):
+    """Keys that put likely duplicates into the same block"""
+    keys = set()
+    if words:
+        joined = ''.join(words)
+        keys.add(('prefix', joined[:PREFIX_LENGTH]))
+        if len(words) > 1:
+            keys.add(('first_last', words[0], words[-1]))
+            keys.add(('first_second', words[0], words[1]))
+    if student.get('studentId') not in (None, ''):
+        keys.add(('number', student.get('groupId'), str(student['studentId']).strip()))
+    return keys
+
+def candidate_pairs(students, words_by_index):
+    """Index pairs (i, j) that share at least one block"""
+    blocks = {}
+    for i, student in enumerate(students):
+        for key in blocking_keys(student, words_by_index[i]):
+            blocks.setdefault(key, []).append(i)
+
+    pairs = set()
+    skipped = 0
+    for members in blocks.values():
+        if len(members) > MAX_BLOCK_SIZE:
+            skipped += 1
+            continue
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                pairs.add((members[a], members[b]))
+    if skipped:
+        print(f"⚠️ Skipped {skipped} blocks with more than {MAX_BLOCK_SIZE} students")
+    return pairs
+
+def name_similarity(words_a, words_b):
+    """Similarity of two names, weighting the first and family names
+
+    Relatives share father and grandfather names, so the whole-name
+    similarity alone would pair up brothers and cousins.
+    """
+    if not words_a or not words_b:
+        return 0.0
+    parts = ((0.5, SequenceMatcher(None, ''.join(words_a), ''.join(words_b))),
+             (0.25, SequenceMatcher(None, words_a[0], words_b[0])),
+             (0.25, SequenceMatcher(None, words_a[-1], words_b[-1])))
+    # Cheap upper bounds first - most candidate pairs fail here
+    if sum(weight * m.quick_ratio() for weight, m in parts) < MIN_NAME_SIMILARITY:
+        return 0.0
+    return sum(weight * m.ratio() for weight, m in parts)
+
+def score_pair(a, b, words_a, words_b):
+    """Duplicate likelihood of two students (0-1) and the reasons for it
+
+    Returns (None, None) when the names are too different.
+    """
+    name_score = name_similarity(words_a, words_b)
+    if name_score < MIN_NAME_SIMILARITY:
+        return None, None
+    score = NAME_WEIGHT * name_score
+    reasons = [f"name {name_score:.0%}"]
+
+    if a.get('studentId') not in (None, '') and str(a.get('studentId')) == str(b.get('studentId')):
+        score += STUDENT_ID_WEIGHT
+        reasons.append("same student number")
+    if a.get('groupId') == b.get('groupId'):
+        score += GROUP_WEIGHT
+        reasons.append("same group")
+    if a.get('dateEnrolled') and a.get('dateEnrolled') == b.get('dateEnrolled'):
+        score += ENROLLED_WEIGHT
+        reasons.append("same enrollment date")
+    return round(score, 3), reasons
+
+def find_duplicates(students, min_score=DEFAULT_MIN_SCORE):
+    """Ranked duplicate proposals: list of (score, reasons, student_a, student_b)"""
+    words_by_index = [core_name(s.get('name', '')) for s in students]
+    grams_by_index = [trigrams(''.join(words)) for words in words_by_index]
+    proposals = []
+    for i, j in candidate_pairs(students, words_by_index):
+        if students[i].get('id') == students[j].get('id'):
+            # Same record listed twice - remove_duplicate_ids.py handles these
+            continue
+        grams_i, grams_j = grams_by_index[i], grams_by_index[j]
+        if 2 * len(grams_i & grams_j) < MIN_TRIGRAM_OVERLAP * (len(grams_i) + len(grams_j)):
+            continue
+        score, reasons = score_pair(students[i], students[j], words_by_index[i], words_by_index[j])
+        if score is not None and score >= min_score:
+            proposals.append((score, reasons, students[i], students[j]))
+    proposals.sort(key=lambda p: (-p[0], p[2].get('name', '')))
+    return proposals
+
+def cluster_proposals(proposals, store):
+    """Group proposals into clusters and pick the record to keep in each
+
+    Only records proposed directly against the kept one are merged into it:
+    clusters are transitive, so A~B and B~C would otherwise merge A and C
+    without ever comparing them (e.g. brothers one spelling apart).
+
+    Returns (merges, review): merges is a list of (keep, [duplicates]);
+    review lists (keep, [members]) of clusters whose other members need a
+    manual look and are left alone.
+    """
+    parent = {}
+    proposed = set()
+
+    def find(student_id):
+        while parent.setdefault(student_id, student_id) != student_id:
+            parent[student_id] = parent[parent[student_id]]
+            student_id = parent[student_id]
+        return student_id
+
+    students = {}
+    for _, _, a, b in proposals:
+        students[a['id']] = a
+        students[b['id']] = b
+        proposed.add(frozenset((a['id'], b['id'])))
+        parent[find(a['id'])] = find(b['id'])
+
+    clusters = {}
+    for student_id, student in students.items():
+        clusters.setdefault(find(student_id), []).append(student)
+
+    merges = []
+    review = []
+    for members in clusters.values():
+        members.sort(key=lambda s: (-len(store.student_marks(s['id'])), s.get('dateEnrolled') or '9999'))
+        keep = members[0]
+        direct = [s for s in members[1:] if frozenset((keep['id'], s['id'])) in proposed]
+        indirect = [s for s in members[1:] if frozenset((keep['id'], s['id'])) not in proposed]
+        if direct:
+            merges.append((keep, direct))
+        if indirect:
+            review.append((keep, indirect))
+    return merges, review
+
+def merge_students(store, merges):
+    """Re-point duplicates' marks to the kept record and drop the duplicates
+
+    Returns (students_removed, marks_moved, marks_replaced).
+    """
+    moved = replaced = 0
+    duplicate_ids = set()
+    for keep, duplicates in merges:
+        for duplicate in duplicates:
+            duplicate_ids.add(duplicate['id'])
+            for mark in list(store.student_marks(duplicate['id'])):
+                existing = store.mark_for(keep['id'], mark['examId'])
+                if existing is not None:
+                    # Both have a mark for this exam - keep the most recent
+                    replaced += 1
+                    if (mark.get('createdAt') or '') <= (existing.get('createdAt') or ''):
+                        store.delete_mark(mark['id'])
+                        continue
+                    store.delete_mark(existing['id'])
+                store.upsert_mark({**mark, 'studentId': keep['id']})
+                moved += 1
+
+    cleaned_students = [s for s in store.students if s['id'] not in duplicate_ids]
+    save_json_file(store, 'students', cleaned_students)
+    store.save('marks')
+    mark_journal.compact_pending(store)
+    return len(duplicate_ids), moved, replaced
+
+def print_proposals(proposals, store):
+    """Print ranked proposals"""
+    print(f"\n{'Score':<7} {'Student A':<45} {'Student B':<45}")
+    print("-" * 100)
+    for score, reasons, a, b in proposals:
+        print(f"{score:<7.2f} {a['name'][:44]:<45} {b['name'][:44]:<45}")
+        for student in (a, b):
+            print(f"{'':<7} ID {student['id']} - Group: {student.get('groupId', 'N/A')} - "
+                  f"No. {student.get('studentId', 'N/A')} - Enrolled: {student.get('dateEnrolled', 'N/A')} - "
+                  f"Marks: {len(store.student_marks(student['id']))}")
+        print(f"{'':<7} ({', '.join(reasons)})")
 
 def main():
-    """Main function to remove duplicate students."""
-    print("🔍 Starting duplicate student removal process...")
+    """Main function to find and merge duplicate students."""
+    args = sys.argv[1:]
+    min_score = DEFAULT_MIN_SCORE
+    json_file = None
+    merge = '--merge' in args
+    if '--min-score' in args:
+        min_score = float(args[args.index('--min-score') + 1])
+    if '--json' in args:
+        json_file = args[args.index('--json') + 1]
+
+    print("🔍 Starting duplicate student detection...")
     print("=" * 60)
-    
-    # Define file paths
-    students_file = "public/data/students.json"
-    marks_file = "public/data/marks.json"
-    
-    # Check if files exist
-    if not os.path.exists(students_file):
-        print(f"❌ Error: {students_file} not found")
-        sys.exit(1)
-    
-    if not os.path.exists(marks_file):
-        print(f"❌ Error: {marks_file} not found")
+
+    store = get_store()
+    if not os.path.exists(store.path('students')):
+        print(f"❌ Error: {store.path('students')} not found")
         sys.exit(1)
-    
-    # Load data
-    print("📂 Loading student data...")
-    students = load_json_file(students_file)
+
+    students = store.students
     print(f"📊 Total students loaded: {len(students)}")
-    
-    print("📂 Loading marks data...")
-    marks = load_json_file(marks_file)
-    print(f"📊 Total marks loaded: {len(marks)}")
-    
-    # Find duplicates
-    print("\n🔍 Analyzing for duplicates...")
-    duplicates = find_duplicates(students)
-    
-    if not duplicates:
-        print("✅ No duplicate students found! Database is clean.")
+    print(f"📊 Total marks loaded: {len(store.marks)}")
+
+    proposals = find_duplicates(students, min_score)
+    if not proposals:
+        print(f"✅ No likely duplicates found (score ≥ {min_score}). Database is clean.")
+        return
+
+    print(f"\n⚠️  Found {len(proposals)} likely duplicate pair(s) (score ≥ {min_score}):")
+    print_proposals(proposals, store)
+
+    merges, review = cluster_proposals(proposals, store)
+    if json_file:
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'proposals': [
+                    {'score': score, 'reasons': reasons, 'a': a['id'], 'b': b['id']}
+                    for score, reasons, a, b in proposals
+                ],
+                'merges': [
+                    {'keep': keep['id'], 'remove': [d['id'] for d in duplicates]}
+                    for keep, duplicates in merges
+                ],
+                'review': [
+                    {'keep': keep['id'], 'notMerged': [m['id'] for m in members]}
+                    for keep, members in review
+                ]
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\n📁 Proposals saved to {json_file}")
+
+    if review:
+        print("\n🔎 Needs manual review (only linked through other records, not merged):")
+        for keep, members in review:
+            print(f"   {keep['id']} ({keep['name']}, {keep.get('groupId')}) ~ "
+                  + ', '.join(f"{m['id']} ({m['name']}, {m.get('groupId')})" for m in members))
+
+    if not merge:
+        print("\n💡 Review the proposals, then run with --merge to apply them")
+        return
+    if not merges:
+        print("\n❌ Nothing to merge automatically")
         return
-    
-    print(f"\n⚠️  Found {len(duplicates)} duplicate students to remove")
-    
-    # Ask for confirmation
+
+    print("\n📋 Planned merges:")
+    for keep, duplicates in merges:
+        print(f"   KEEP {keep['id']} ({keep['name']}, {keep.get('groupId')}) ← "
+              + ', '.join(f"{d['id']} ({d.get('groupId')})" for d in duplicates))
+
     print("\n" + "=" * 60)
-    response = input("❓ Do you want to proceed with removing duplicates? (y/N): ").strip().lower()
-    
-    if response != 'y' and response != 'yes':
+    response = input("❓ Do you want to merge these students? (y/N): ").strip().lower()
+    if response not in ['y', 'yes']:
         print("❌ Operation cancelled by user")
         return
-    
-    # Get IDs of duplicate students
-    duplicate_ids = [student['id'] for student in duplicates]
-    print(f"\n🗑️  Removing {len(duplicate_ids)} duplicate students...")
-    
-    # Remove duplicates from students list
-    cleaned_students = [student for student in students if student['id'] not in duplicate_ids]
-    
-    # Remove associated marks
-    print("🗑️  Cleaning up associated marks...")
-    cleaned_marks = remove_duplicate_marks(marks, duplicate_ids)
-    
-    # Save cleaned data
-    print("\n💾 Saving cleaned data...")
-    save_json_file(students_file, cleaned_students)
-    save_json_file(marks_file, cleaned_marks)
-    
-    # Summary
+
+    before = len(students)
+    removed, moved, replaced = merge_students(store, merges)
+
     print("\n" + "=" * 60)
-    print("✅ CLEANUP COMPLETE!")
-    print(f"📊 Students: {len(students)} → {len(cleaned_students)} (removed {len(duplicates)})")
-    print(f"📊 Marks: {len(marks)} → {len(cleaned_marks)} (removed {len(marks) - len(cleaned_marks)})")
-    
-    print("\n📋 Removed duplicate students:")
-    for student in duplicates:
-        print(f"   • {student['name']} (ID: {student['id']}, Group: {student.get('groupId', 'N/A')})")
-    
-    print("\n💡 Tip: Check the backup files if you need to restore any data")
+    print("✅ MERGE COMPLETE!")
+    print(f"📊 Students: {before} → {len(store.students)} (merged {removed})")
+    print(f"📊 Marks re-pointed: {moved} ({replaced} conflicting marks resolved, newest kept)")
+    print("\n💡 Tip: Use 'python backup_store.py list' to find a snapshot if you need to restore any data")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Schedule Solver
+Builds weekly_schedule_template.json from the active groups instead of
+placing them by hand.
+
+Every active group (teaching_config.json activeGroups) needs a number of
+sessions a week. By default that number and the session length are read
+from the current template, e.g. NESMA's three 2-hour afternoons. A group
+description like "3 sessions per week" overrides the number, and a group
+that isn't in the template yet gets one 1-hour session a day.
+
+The timetable respects these rules:
+    • a room, an instructor and a group are in one place per hour
+    • a group has at most maxSessionsPerDay sessions a day (default 1)
+    • nothing is placed where a room, instructor or group is unavailable
+
+Rooms, instructors and per-group overrides come from an optional
+public/data/schedule_constraints.json, for example:
+
+    {
+      "rooms": {"Room 8": {}, "Room 7": {"unavailable": ["thursday"]}},
+      "instructors": {"Mohamed Amin": {"rooms": ["Room 8"], "unavailable": ["sunday 08:00"]}},
+      "groups": {
+        "nesma": {"sessionsPerWeek": 3, "sessionLength": 2, "times": ["13:00"]},
+        "sam2": {"instructor": "Mohamed Amin", "unavailable": ["monday", "15:00"]}
+      },
+      "maxSessionsPerDay": 1
+    }
+
+"unavailable" entries are a day, an hour or "day HH:MM". Without the file
+everything is taught by one instructor in the template's room.
+
+The search is a backtracking search that picks the session with the fewest
+remaining placements first and removes clashing placements from every other
+session after each choice (forward checking). Sessions of one group are
+placed in day order so equivalent orderings aren't searched twice. Each
+group keeps its current hour where it can, so a re-solve moves as little as
+possible. If the search gets stuck it restarts with shuffled tie-breaks and
+a larger step budget until --timeout runs out.
+
+--write only replaces the template's weekly_schedule. teaching_config.json is
+left alone, so active groups missing from groups.json stay active (they are
+listed as skipped). If the template or the active groups changed while the
+solver ran, nothing is written.
+
+Usage:
+    python schedule_solver.py                    # solve and show the timetable
+    python schedule_solver.py --write            # save it
+    python schedule_solver.py --constraints other.json --timeout 20
+"""
+
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+from backup_store import backup_file
+from data_store import file_lock, get_store, load_json, save_json
+
+TEMPLATE_FILE = "weekly_schedule_template.json"
+CONFIG_FILE = "teaching_config.json"
+CONSTRAINTS_FILE = "schedule_constraints.json"
+
+# Hours shown on the Schedule page
+TIME_SLOTS = ['08:00', '09:00', '10:00', '11:00', '12:00', '13:00', '14:00', '15:00']
+DEFAULT_DAYS = ['sunday', 'monday', 'tuesday', 'wednesday', 'thursday']
+DEFAULT_TIMEOUT = 10
+
+SESSIONS_PER_WEEK = re.compile(r'(\d+)\s*sessions?\s*(?:per|a|/)\s*week', re.IGNORECASE)
+
+
+class NoSchedule(Exception):
+    """No timetable satisfies the constraints"""
+
+
+def compact(text):
+    """'Dabal +Fahss' -> 'DABALFAHSS', for matching template labels to groups"""
+    return re.sub(r'[^0-9A-Z]', '', str(text or '').upper())
+
+
+def group_for_label(label, groups):
+    """Group id a template label refers to ('SAM1' -> sam1, 'DABAL' -> dabal_fahss)"""
+    key = compact(label)
+    for group in groups:
+        if key in (compact(group.get('id')), compact(group.get('name'))):
+            return group.get('id')
+    for group in groups:
+        if key and compact(group.get('id')).startswith(key):
+            return group.get('id')
+    return None
+
+
+def template_usage(template, groups):
+    """{group_id: (label, sessions per week, session length)} as the template has them"""
+    usage = {}
+    for day, slots in template.get('weekly_schedule', {}).items():
+        hours = {}
+        for slot in slots:
+            group_id = group_for_label(slot.get('group'), groups)
+            if group_id:
+                hours.setdefault(group_id, (slot.get('group'), []))[1].append(slot.get('time'))
+        for group_id, (label, times) in hours.items():
+            runs = count_runs(times)
+            entry = usage.setdefault(group_id, [label, 0, []])
+            entry[1] += len(runs)
+            entry[2].extend(runs)
+    return {group_id: (label, sessions, max(set(lengths), key=lengths.count))
+            for group_id, (label, sessions, lengths) in usage.items()}
+
+
+def count_runs(times):
+    """Lengths of the runs of consecutive hours in a list of 'HH:MM'"""
+    hours = sorted(int(t[:2]) for t in times if t)
+    runs = []
+    for hour in hours:
+        if runs and hour == runs[-1][1] + 1:
+            runs[-1][1] = hour
+        else:
+            runs.append([hour, hour])
+    return [end - start + 1 for start, end in runs]
+
+
+def blocked(entries, days, times):
+    """Set of (day index, slot index) an 'unavailable' list rules out"""
+    cells = set()
+    for entry in entries or []:
+        parts = str(entry).lower().split()
+        day_part = [p for p in parts if p in days]
+        time_part = [p for p in parts if p in times]
+        for d in ([days.index(day_part[0])] if day_part else range(len(days))):
+            for t in ([times.index(time_part[0])] if time_part else range(len(times))):
+                cells.add((d, t))
+    return cells
+
+
+class Session:
+    """One weekly session of a group to be placed"""
+
+    def __init__(self, index, group_id, number, length, instructor):
+        self.index = index
+        self.group_id = group_id
+        self.number = number
+        self.length = length
+        self.instructor = instructor
+
+
+class Restart(Exception):
+    """The current search attempt ran out of steps"""
+
+
+class ScheduleProblem:
+    """Sessions, their possible placements and the search"""
+
+    def __init__(self, requests, rooms, instructors, days=DEFAULT_DAYS, times=TIME_SLOTS,
+                 max_per_day=1, preferred=None):
+        """requests: {group_id: {sessionsPerWeek, sessionLength, instructor,
+        unavailable, times}}; rooms/instructors: {name: {unavailable, rooms}}"""
+        self.days = list(days)
+        self.times = list(times)
+        self.rooms = list(rooms)
+        self.max_per_day = max_per_day
+        self.preferred = preferred or {}
+
+        # A placement is (session, day, start slot, room, cells it occupies); a cell
+        # is a room, instructor or group at one hour (or a group on one day, when
+        # it may only have one session a day). users lists the placements per cell,
+        # so placing a session only looks at the placements it clashes with.
+        self.sessions = []
+        self.values = []
+        self.domains = []
+        self.users = {}
+        room_blocked = {room: blocked((rooms[room] or {}).get('unavailable'), self.days, self.times)
+                        for room in self.rooms}
+        for group_id, request in requests.items():
+            instructor = request.get('instructor')
+            teacher = instructors.get(instructor) or {}
+            allowed_rooms = [r for r in (teacher.get('rooms') or request.get('rooms') or self.rooms) if r in rooms]
+            off = blocked(request.get('unavailable'), self.days, self.times) \
+                | blocked(teacher.get('unavailable'), self.days, self.times)
+            start_times = set(request.get('times') or self.times)
+            length = int(request.get('sessionLength', 1))
+
+            placements = []
+            for d in range(len(self.days)):
+                for t in range(len(self.times) - length + 1):
+                    hours = range(t, t + length)
+                    if self.times[t] not in start_times or any((d, h) in off for h in hours):
+                        continue
+                    for room in allowed_rooms:
+                        if any((d, h) in room_blocked[room] for h in hours):
+                            continue
+                        cells = [('room', room, d, h) for h in hours] + [('group', group_id, d, h) for h in hours]
+                        if instructor:
+                            cells += [('instructor', instructor, d, h) for h in hours]
+                        if max_per_day == 1:
+                            cells.append(('day', group_id, d))
+                        placements.append((d, t, room, tuple(cells)))
+
+            for number in range(int(request.get('sessionsPerWeek', len(self.days)))):
+                session = Session(len(self.sessions), group_id, number, length, instructor)
+                self.sessions.append(session)
+                domain = []
+                for d, t, room, cells in placements:
+                    v = len(self.values)
+                    self.values.append((session.index, d, t, room, cells))
+                    for cell in cells:
+                        self.users.setdefault(cell, []).append(v)
+                    domain.append(v)
+                self.domains.append(domain)
+
+        self.group_sessions = {}
+        for session in self.sessions:
+            self.group_sessions.setdefault(session.group_id, []).append(session)
+        self.nodes = 0
+
+    # ------------------------------------------------------------------
+    # Search state: alive[v] is 0 once placement v is ruled out, size[s] is
+    # the number of placements session s has left
+    # ------------------------------------------------------------------
+
+    def _kill(self, v, killed, touched):
+        self.alive[v] = 0
+        owner = self.values[v][0]
+        self.size[owner] -= 1
+        killed.append(v)
+        touched.add(owner)
+
+    def _undo(self, killed):
+        for v in killed:
+            self.alive[v] = 1
+            self.size[self.values[v][0]] += 1
+
+    def _place(self, session, v):
+        """Rule out everything placement v clashes with (forward checking);
+        returns the ruled-out placements, or None (and no change) on a dead end"""
+        alive = self.alive
+        _, d, _, _, cells = self.values[v]
+        killed = []
+        touched = set()
+        for cell in cells:
+            for u in self.users[cell]:
+                if alive[u] and self.values[u][0] != session.index:
+                    self._kill(u, killed, touched)
+        # A group's sessions go in day order, so equivalent orders aren't searched twice
+        for other in self.group_sessions[session.group_id]:
+            if other is session or self.assigned[other.index] is not None:
+                continue
+            later = other.number > session.number
+            for u in self.domains[other.index]:
+                if alive[u] and (self.values[u][1] < d if later else self.values[u][1] > d):
+                    self._kill(u, killed, touched)
+
+        for owner in touched:
+            if self.assigned[owner] is None and self.size[owner] == 0:
+                self._undo(killed)
+                return None
+        # Each group still needs enough distinct days for its remaining sessions
+        for group_id in {self.sessions[owner].group_id for owner in touched}:
+            remaining = [s for s in self.group_sessions[group_id] if self.assigned[s.index] is None and s is not session]
+            days = {self.values[u][1] for s in remaining for u in self.domains[s.index] if alive[u]}
+            if len(days) * self.max_per_day < len(remaining):
+                self._undo(killed)
+                return None
+        return killed
+
+    def order_values(self, session, rng):
+        """Placements to try first: where the group is now, then its hour on
+        its other days, then the earliest (shuffled after a restart)"""
+        chosen = {self.values[self.assigned[s.index]][2] for s in self.group_sessions[session.group_id]
+                  if self.assigned[s.index] is not None}
+        current = self.preferred.get(session.group_id, ())
+
+        def rank(v):
+            _, d, t, room, _ = self.values[v]
+            tie = rng.random() if rng else (d, t, self.rooms.index(room))
+            return ((self.days[d], self.times[t]) not in current, t not in chosen, tie)
+        return sorted((v for v in self.domains[session.index] if self.alive[v]), key=rank)
+
+    def shortfall(self):
+        """Why the sessions can't all fit, or None if they might
+
+        Counts free places against what is needed: distinct days per group,
+        free hours per instructor and free room-hours overall.
+        """
+        group_days = {}
+        teacher_hours = {}
+        teacher_need = {}
+        room_hours = set()
+        for session in self.sessions:
+            days = group_days.setdefault(session.group_id, set())
+            cells = teacher_hours.setdefault(session.instructor, set())
+            teacher_need[session.instructor] = teacher_need.get(session.instructor, 0) + session.length
+            for v in self.domains[session.index]:
+                _, d, t, room, _ = self.values[v]
+                days.add(d)
+                for h in range(t, t + session.length):
+                    room_hours.add((room, d, h))
+                    cells.add((d, h))
+        for group_id, days in group_days.items():
+            count = len(self.group_sessions[group_id])
+            if len(days) * self.max_per_day < count:
+                return f"{group_id} needs {count} session(s) but has {len(days)} free day(s)"
+        for instructor, hours in teacher_need.items():
+            if instructor and len(teacher_hours[instructor]) < hours:
+                return f"{instructor} needs {hours} hour(s) but has {len(teacher_hours[instructor])} free"
+        need = sum(session.length for session in self.sessions)
+        if len(room_hours) < need:
+            return f"{need} hour(s) to place but only {len(room_hours)} free room-hours"
+        return None
+
+    def solve(self, timeout=DEFAULT_TIMEOUT):
+        """{session: (day, slot, room)}; raises NoSchedule
+
+        The first attempt is deterministic; if it gets stuck it is restarted
+        with shuffled tie-breaks and twice the step budget, until timeout.
+        """
+        reason = self.shortfall()
+        if reason:
+            raise NoSchedule(f"No timetable fits the constraints: {reason}")
+        deadline = time.perf_counter() + timeout
+        budget = 2000
+        rng = None
+        while True:
+            self.alive = bytearray([1]) * len(self.values)
+            self.size = [len(domain) for domain in self.domains]
+            self.assigned = [None] * len(self.sessions)
+            self.per_day = {}
+            try:
+                if self._search(0, self.nodes + budget, deadline, rng):
+                    return {s: self.values[self.assigned[s.index]][1:4] for s in self.sessions}
+                raise NoSchedule("No timetable fits the constraints - free up rooms or hours, "
+                                 "or lower sessionsPerWeek")
+            except Restart:
+                budget *= 2
+                rng = random.Random(budget)
+
+    def _search(self, placed, limit, deadline, rng):
+        if placed == len(self.sessions):
+            return True
+        self.nodes += 1
+        if self.nodes > limit:
+            if time.perf_counter() > deadline:
+                raise NoSchedule("Search timed out - try a longer --timeout or fewer constraints")
+            raise Restart()
+
+        # Most constrained session first (longer sessions break ties)
+        session = min((s for s in self.sessions if self.assigned[s.index] is None),
+                      key=lambda s: (self.size[s.index], -s.length, rng.random() if rng else 0))
+
+        for v in self.order_values(session, rng):
+            d = self.values[v][1]
+            key = (session.group_id, d)
+            if self.per_day.get(key, 0) >= self.max_per_day:
+                continue
+            killed = self._place(session, v)
+            if killed is None:
+                continue
+            self.assigned[session.index] = v
+            self.per_day[key] = self.per_day.get(key, 0) + 1
+            if self._search(placed + 1, limit, deadline, rng):
+                return True
+            self.assigned[session.index] = None
+            self.per_day[key] -= 1
+            self._undo(killed)
+        return False
+
+
+def build_requests(store, template, config, constraints):
+    """Sessions wanted per active group, from template, descriptions and constraints
+
+    Returns (requests, template labels, {group_id: {(day, time)} it has now}).
+    """
+    groups = store.groups
+    usage = template_usage(template, groups)
+    overrides = constraints.get('groups', {})
+    instructors = constraints.get('instructors', {})
+    default_instructor = next(iter(instructors), None) if len(instructors) == 1 else None
+
+    requests = {}
+    labels = {}
+    preferred = {}
+    for group_id in config.get('activeGroups', []):
+        group = store.group(group_id)
+        if group is None:
+            print(f"⚠️ Active group '{group_id}' is not in groups.json - skipped")
+            continue
+        label, sessions, length = usage.get(group_id, (None, None, 1))
+        described = SESSIONS_PER_WEEK.search(group.get('description', ''))
+        request = {
+            'sessionsPerWeek': int(described.group(1)) if described else sessions or len(DEFAULT_DAYS),
+            'sessionLength': length,
+            'instructor': default_instructor,
+        }
+        request.update(overrides.get(group_id, {}))
+        requests[group_id] = request
+        labels[group_id] = label or compact(group.get('name') or group_id)
+        preferred[group_id] = {(day, slot.get('time')) for day, slots in template.get('weekly_schedule', {}).items()
+                               for slot in slots if group_for_label(slot.get('group'), groups) == group_id}
+    return requests, labels, preferred
+
+
+def to_template(problem, solution, labels, subject='English'):
+    """weekly_schedule in the template's format"""
+    weekly = {day: [] for day in problem.days}
+    multi_room = len({room for _, _, room in solution.values()}) > 1
+    for session, (d, t, room) in solution.items():
+        for h in range(t, t + session.length):
+            slot = {'time': problem.times[h], 'group': labels[session.group_id],
+                    'subject': subject, 'type': 'Lecture'}
+            if multi_room:
+                slot['room'] = room
+            weekly[problem.days[d]].append(slot)
+    for slots in weekly.values():
+        slots.sort(key=lambda s: (s['time'], s.get('room', '')))
+    return weekly
+
+
+def print_timetable(weekly, days):
+    times = sorted({slot['time'] for slots in weekly.values() for slot in slots})
+    print(f"\n{'':<7}" + ''.join(f"{day[:3].capitalize():<16}" for day in days))
+    for slot_time in times:
+        cells = []
+        for day in days:
+            here = [s['group'] + (f"@{s['room']}" if 'room' in s else '') for s in weekly[day] if s['time'] == slot_time]
+            cells.append(', '.join(here) or '·')
+        print(f"{slot_time:<7}" + ''.join(f"{cell[:15]:<16}" for cell in cells))
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    write = '--write' in args
+    timeout = float(args[args.index('--timeout') + 1]) if '--timeout' in args else DEFAULT_TIMEOUT
+    store = get_store()
+    constraints_path = args[args.index('--constraints') + 1] if '--constraints' in args \
+        else os.path.join(store.data_dir, CONSTRAINTS_FILE)
+
+    print("🧩 SCHEDULE SOLVER")
+    print("=" * 50)
+    template_path = os.path.join(store.data_dir, TEMPLATE_FILE)
+    config_path = os.path.join(store.data_dir, CONFIG_FILE)
+    template = load_json(template_path, default={})
+    config = load_json(config_path, default={})
+    constraints = load_json(constraints_path, default={}) or {}
+    info = template.get('schedule_info', {})
+    days = info.get('working_days') or DEFAULT_DAYS
+    rooms = constraints.get('rooms') or {info.get('room', 'Room 8'): {}}
+
+    requests, labels, preferred = build_requests(store, template, config, constraints)
+    problem = ScheduleProblem(requests, rooms, constraints.get('instructors', {}), days, TIME_SLOTS,
+                              constraints.get('maxSessionsPerDay', 1), preferred)
+    print(f"📋 {len(requests)} groups, {len(problem.sessions)} sessions, {len(rooms)} room(s), "
+          f"{len(days)} days × {len(TIME_SLOTS)} hours")
+
+    start = time.perf_counter()
+    try:
+        solution = problem.solve(timeout)
+    except NoSchedule as e:
+        print(f"❌ {e} ({problem.nodes} search steps)")
+        sys.exit(1)
+    print(f"✅ Solved in {(time.perf_counter() - start) * 1000:.0f} ms ({problem.nodes} search steps)")
+
+    weekly = to_template(problem, solution, labels)
+    print_timetable(weekly, days)
+
+    if not write:
+        print("\n🔍 Run again with --write to save this timetable.")
+        return
+
+    with file_lock(template_path), file_lock(config_path):
+        # Re-read under the locks: another script may have saved meanwhile
+        current = load_json(template_path, default={})
+        active = load_json(config_path, default={}).get('activeGroups', [])
+        if current.get('weekly_schedule') != template.get('weekly_schedule') \
+                or active != config.get('activeGroups', []):
+            print(f"\n❌ {TEMPLATE_FILE} or the active groups changed while solving - run again")
+            sys.exit(1)
+        backup_file('weekly_schedule_template')
+        current['weekly_schedule'] = weekly
+        current.setdefault('_instructions', {})['last_updated'] = datetime.now().strftime("%Y-%m-%d")
+        save_json(template_path, current)
+    print(f"\n📁 Saved to: {template_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ This script converts Excel files containing student data into JSON format
 for use with the Student Management System website.
 
 Usage:
-    python excel_to_json.py <excel_file.xlsx>
+    python excel_to_json.py <excel_file.xlsx> [--parallel] [--workers N] [--merge]
 
 Requirements:
     pip install pandas openpyxl
@@ -25,6 +25,8 @@ import pandas as pd
 import json
 import sys
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 import uuid
 
@@ -33,182 +35,398 @@ def generate_id():
     return str(uuid.uuid4())[:8]
 
 def clean_data(df):
-    """Clean DataFrame by removing empty rows and handling NaN values"""
+    """Clean DataFrame by removing empty rows and normalizing column names"""
     # Remove completely empty rows
     df = df.dropna(how='all')
     
-    # Fill NaN values with appropriate defaults
-    df = df.fillna('')
-    
     # Convert all column names to lowercase and replace spaces with underscores
-    df.columns = df.columns.str.lower().str.replace(' ', '_')
+    df.columns = df.columns.astype(str).str.lower().str.replace(' ', '_')
     
     return df
 
+def column(df, *names, default=''):
+    """First of the named columns that exists, or a column filled with default"""
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    return pd.Series(default, index=df.index, dtype=object)
+
+def as_text(series, default=''):
+    """Column as strings: blanks become default, dates become YYYY-MM-DD"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        series = series.dt.strftime('%Y-%m-%d')
+    elif series.dtype == object:
+        # Mixed columns can still hold individual date cells
+        series = series.map(lambda v: v.strftime('%Y-%m-%d') if isinstance(v, datetime) else v)
+    text = series.astype(object).where(series.notna(), '').astype(str)
+    # Whole numbers read as floats (e.g. "12.0") go back to "12"
+    text = text.str.replace(r'^(-?\d+)\.0$', r'\1', regex=True)
+    if default != '':
+        text = text.where(text != '', default)
+    return text
+
+def as_number(series, default, kind=float):
+    """Column as numbers, with blanks and non-numbers set to default"""
+    numbers = pd.to_numeric(series, errors='coerce').fillna(default)
+    return numbers.astype(kind)
+
+def as_ids(df):
+    """The id column as text, generating IDs for rows that have none"""
+    ids = as_text(column(df, 'id'))
+    missing = ids == ''
+    if missing.any():
+        generated = pd.Series([generate_id() for _ in range(int(missing.sum()))],
+                              index=ids.index[missing])
+        ids = ids.where(~missing, generated)
+    return ids
+
+def as_list(series):
+    """Comma-separated text column as lists of stripped items"""
+    text = as_text(series).str.strip()
+    items = text.str.split(r'\s*,\s*', regex=True)
+    return items.where(text != '', pd.Series([[] for _ in range(len(text))], index=text.index))
+
+def to_records(columns, index):
+    """Build JSON-ready records from a mapping of output field -> column"""
+    return pd.DataFrame(columns, index=index).to_dict(orient='records')
+
 def convert_students(df):
     """Convert students data to JSON format"""
     df = clean_data(df)
     
-    students = []
-    for _, row in df.iterrows():
-        student = {
-            "id": row.get('id', generate_id()),
-            "name": str(row.get('name', '')),
-            "email": str(row.get('email', '')),
-            "groupId": str(row.get('group_id', row.get('group', ''))),
-            "studentId": str(row.get('student_id', row.get('student_number', ''))),
-            "dateEnrolled": str(row.get('date_enrolled', row.get('enrollment_date', '')))
-        }
-        students.append(student)
-    
-    return students
+    return to_records({
+        "id": as_ids(df),
+        "name": as_text(column(df, 'name')),
+        "email": as_text(column(df, 'email')),
+        "groupId": as_text(column(df, 'group_id', 'group')),
+        "studentId": as_text(column(df, 'student_id', 'student_number')),
+        "dateEnrolled": as_text(column(df, 'date_enrolled', 'enrollment_date'))
+    }, df.index)
 
 def convert_groups(df):
     """Convert groups data to JSON format"""
     df = clean_data(df)
     
-    groups = []
-    for _, row in df.iterrows():
-        group = {
-            "id": str(row.get('id', generate_id())),
-            "name": str(row.get('name', '')),
-            "description": str(row.get('description', '')),
-            "year": str(row.get('year', datetime.now().year)),
-            "semester": str(row.get('semester', ''))
-        }
-        groups.append(group)
-    
-    return groups
+    return to_records({
+        "id": as_ids(df),
+        "name": as_text(column(df, 'name')),
+        "description": as_text(column(df, 'description')),
+        "year": as_text(column(df, 'year', default=str(datetime.now().year))),
+        "semester": as_text(column(df, 'semester'))
+    }, df.index)
 
 def convert_exams(df):
     """Convert exams data to JSON format"""
     df = clean_data(df)
     
-    exams = []
-    for _, row in df.iterrows():
-        exam = {
-            "id": str(row.get('id', generate_id())),
-            "name": str(row.get('name', '')),
-            "subject": str(row.get('subject', '')),
-            "date": str(row.get('date', '')),
-            "maxScore": int(row.get('max_score', row.get('total_marks', 100))),
-            "type": str(row.get('type', 'exam'))
-        }
-        exams.append(exam)
-    
-    return exams
+    return to_records({
+        "id": as_ids(df),
+        "name": as_text(column(df, 'name')),
+        "subject": as_text(column(df, 'subject')),
+        "date": as_text(column(df, 'date')),
+        "maxScore": as_number(column(df, 'max_score', 'total_marks', default=100), 100, int),
+        "type": as_text(column(df, 'type'), default='exam')
+    }, df.index)
 
 def convert_marks(df):
     """Convert marks data to JSON format"""
     df = clean_data(df)
     
-    marks = []
-    for _, row in df.iterrows():
-        mark = {
-            "id": str(row.get('id', generate_id())),
-            "studentId": str(row.get('student_id', '')),
-            "examId": str(row.get('exam_id', '')),
-            "score": float(row.get('score', row.get('mark', 0))),
-            "date": str(row.get('date', ''))
-        }
-        marks.append(mark)
-    
-    return marks
+    return to_records({
+        "id": as_ids(df),
+        "studentId": as_text(column(df, 'student_id')),
+        "examId": as_text(column(df, 'exam_id')),
+        "score": as_number(column(df, 'score', 'mark', default=0), 0),
+        "date": as_text(column(df, 'date'))
+    }, df.index)
 
 def convert_schedule(df):
     """Convert schedule data to JSON format"""
     df = clean_data(df)
     
-    schedule = []
-    for _, row in df.iterrows():
-        item = {
-            "id": str(row.get('id', generate_id())),
-            "date": str(row.get('date', '')),
-            "time": str(row.get('time', '')),
-            "subject": str(row.get('subject', '')),
-            "group": str(row.get('group', '')),
-            "room": str(row.get('room', '')),
-            "type": str(row.get('type', 'Lecture')),
-            "duration": str(row.get('duration', ''))
-        }
-        schedule.append(item)
-    
-    return schedule
+    return to_records({
+        "id": as_ids(df),
+        "date": as_text(column(df, 'date')),
+        "time": as_text(column(df, 'time')),
+        "subject": as_text(column(df, 'subject')),
+        "group": as_text(column(df, 'group')),
+        "room": as_text(column(df, 'room')),
+        "type": as_text(column(df, 'type'), default='Lecture'),
+        "duration": as_text(column(df, 'duration'))
+    }, df.index)
 
 def convert_syllabus(df):
     """Convert syllabus data to JSON format"""
     df = clean_data(df)
     
-    syllabus = []
-    for _, row in df.iterrows():
-        # Parse subtopics if they exist (comma-separated)
-        subtopics = []
-        if row.get('subtopics', ''):
-            subtopic_names = str(row.get('subtopics')).split(',')
-            for name in subtopic_names:
-                subtopics.append({
-                    "name": name.strip(),
-                    "completed": False
-                })
-        
-        # Parse objectives if they exist (comma-separated)
-        objectives = []
-        if row.get('objectives', ''):
-            objectives = [obj.strip() for obj in str(row.get('objectives')).split(',')]
-        
-        # Parse resources if they exist (comma-separated)
-        resources = []
-        if row.get('resources', ''):
-            resources = [res.strip() for res in str(row.get('resources')).split(',')]
-        
-        item = {
-            "id": str(row.get('id', generate_id())),
-            "subject": str(row.get('subject', '')),
-            "unit": str(row.get('unit', '')),
-            "topic": str(row.get('topic', '')),
-            "description": str(row.get('description', '')),
-            "duration": str(row.get('duration', '')),
-            "status": str(row.get('status', 'not-started')),
-            "startDate": str(row.get('start_date', '')),
-            "endDate": str(row.get('end_date', '')),
-            "resources": resources,
-            "objectives": objectives,
-            "subtopics": subtopics
-        }
-        syllabus.append(item)
+    # Subtopics, objectives and resources are comma-separated lists
+    subtopics = as_list(column(df, 'subtopics')).map(
+        lambda names: [{"name": name, "completed": False} for name in names]
+    )
     
-    return syllabus
+    return to_records({
+        "id": as_ids(df),
+        "subject": as_text(column(df, 'subject')),
+        "unit": as_text(column(df, 'unit')),
+        "topic": as_text(column(df, 'topic')),
+        "description": as_text(column(df, 'description')),
+        "duration": as_text(column(df, 'duration')),
+        "status": as_text(column(df, 'status'), default='not-started'),
+        "startDate": as_text(column(df, 'start_date')),
+        "endDate": as_text(column(df, 'end_date')),
+        "resources": as_list(column(df, 'resources')),
+        "objectives": as_list(column(df, 'objectives')),
+        "subtopics": subtopics
+    }, df.index)
 
 def convert_resources(df):
     """Convert resources data to JSON format"""
     df = clean_data(df)
     
-    resources = []
-    for _, row in df.iterrows():
-        # Parse tags if they exist (comma-separated)
-        tags = []
-        if row.get('tags', ''):
-            tags = [tag.strip() for tag in str(row.get('tags')).split(',')]
-        
-        resource = {
-            "id": str(row.get('id', generate_id())),
-            "title": str(row.get('title', '')),
-            "description": str(row.get('description', '')),
-            "category": str(row.get('category', '')),
-            "type": str(row.get('type', '')),
-            "url": str(row.get('url', '')),
-            "tags": tags,
-            "dateAdded": str(row.get('date_added', datetime.now().strftime('%Y-%m-%d'))),
-            "size": str(row.get('size', ''))
-        }
-        resources.append(resource)
+    return to_records({
+        "id": as_ids(df),
+        "title": as_text(column(df, 'title')),
+        "description": as_text(column(df, 'description')),
+        "category": as_text(column(df, 'category')),
+        "type": as_text(column(df, 'type')),
+        "url": as_text(column(df, 'url')),
+        "tags": as_list(column(df, 'tags')),
+        "dateAdded": as_text(column(df, 'date_added'), default=datetime.now().strftime('%Y-%m-%d')),
+        "size": as_text(column(df, 'size'))
+    }, df.index)
+
+CONVERTERS = {
+    'students': convert_students,
+    'groups': convert_groups,
+    'exams': convert_exams,
+    'marks': convert_marks,
+    'schedule': convert_schedule,
+    'syllabus': convert_syllabus,
+    'resources': convert_resources
+}
+
+def match_converter(sheet_name):
+    """Output key ('students', 'marks', ...) for a sheet name, or None"""
+    sheet_name_lower = sheet_name.lower()
+    for key in CONVERTERS:
+        if key in sheet_name_lower:
+            return key
+    return None
+
+# Spreadsheet columns each output field is read from (as in the converters above)
+SOURCE_COLUMNS = {
+    'students': {'name': ('name',), 'email': ('email',), 'groupId': ('group_id', 'group'),
+                 'studentId': ('student_id', 'student_number'),
+                 'dateEnrolled': ('date_enrolled', 'enrollment_date')},
+    'groups': {'name': ('name',), 'description': ('description',), 'year': ('year',),
+               'semester': ('semester',)},
+    'exams': {'name': ('name',), 'subject': ('subject',), 'date': ('date',),
+              'maxScore': ('max_score', 'total_marks'), 'type': ('type',)},
+    'marks': {'studentId': ('student_id',), 'examId': ('exam_id',), 'score': ('score', 'mark'),
+              'date': ('date',)},
+    'schedule': {'date': ('date',), 'time': ('time',), 'subject': ('subject',), 'group': ('group',),
+                 'room': ('room',), 'type': ('type',), 'duration': ('duration',)},
+    'syllabus': {'subject': ('subject',), 'unit': ('unit',), 'topic': ('topic',),
+                 'description': ('description',), 'duration': ('duration',), 'status': ('status',),
+                 'startDate': ('start_date',), 'endDate': ('end_date',), 'resources': ('resources',),
+                 'objectives': ('objectives',), 'subtopics': ('subtopics',)},
+    'resources': {'title': ('title',), 'description': ('description',), 'category': ('category',),
+                  'type': ('type',), 'url': ('url',), 'tags': ('tags',), 'dateAdded': ('date_added',),
+                  'size': ('size',)}
+}
+
+def sheet_fields(key, df):
+    """Output fields a sheet actually has a column for"""
+    columns = set(clean_data(df).columns)
+    return {field for field, names in SOURCE_COLUMNS[key].items() if columns.intersection(names)}
+
+def convert_sheet(key, sheet_name, df):
+    """Run one sheet's converter and time it (runs in worker processes)
+
+    Returns (key, sheet name, records, fields present in the sheet, seconds).
+    """
+    start = time.perf_counter()
+    records = CONVERTERS[key](df)
+    return key, sheet_name, records, sheet_fields(key, df), time.perf_counter() - start
+
+def write_json(output_path, data):
+    """Write one output file (via a temp file, so never half-written) and time it"""
+    start = time.perf_counter()
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, output_path)
+    return time.perf_counter() - start
+
+# Stable keys used to match incoming rows to existing records in merge mode
+MERGE_KEYS = {
+    'students': ('studentId', 'groupId'),
+    'marks': ('studentId', 'examId'),
+    'groups': ('name',),
+    'exams': ('name', 'date'),
+    'schedule': ('date', 'time', 'group'),
+    'syllabus': ('unit', 'topic'),
+    'resources': ('url', 'title')
+}
+
+# Keys used instead when a row's merge key is blank (no student_id column)
+FALLBACK_KEYS = {
+    'students': ('name', 'groupId')
+}
+
+class MergeError(Exception):
+    """The sheet can't be merged safely (blank or repeated keys)"""
+
+def record_key(record, fields):
+    """Merge key of a record, e.g. ('12', 'saipem6') for a student; None if a field is blank"""
+    key = tuple(str(record.get(field, '')).strip() for field in fields)
+    return None if '' in key else key
+
+def diff_records(existing, incoming, fields, fallback=None, present=None, complete=None):
+    """Match incoming records to existing ones on key fields
+
+    Rows with a blank key are matched on the fallback fields instead; a row
+    with neither, or two rows with the same key, raise MergeError so no row
+    is silently dropped. present[i] is the set of fields row i's sheet has a
+    column for: matched records only take those fields and keep their id
+    and everything else. complete(record, current) fills derived fields
+    (e.g. a mark's percentage) before records are compared.
+
+    Returns (inserts, updates, unchanged) where updates is a list of
+    (existing_record, merged_record).
+    """
+    def fallback_key(record):
+        key = record_key(record, fallback) if fallback else None
+        return key and ('fallback',) + key
+
+    index = {}
+    for record in existing:
+        for key in (record_key(record, fields), fallback_key(record)):
+            if key:
+                index.setdefault(key, record)
+
+    inserts, updates = [], []
+    unchanged = 0
+    seen = {}
+    blank = []
+    for i, record in enumerate(incoming):
+        key = record_key(record, fields) or fallback_key(record)
+        if key is None:
+            blank.append(i + 1)
+            continue
+        if key in seen:
+            shown = key[1:] if len(key) != len(fields) else key
+            raise MergeError(f"rows {seen[key]} and {i + 1} have the same key {shown}")
+        seen[key] = i + 1
+
+        current = index.get(key)
+        if current is None:
+            record = complete(dict(record), None) if complete else record
+            inserts.append(record)
+            continue
+        fields_given = present[i] if present is not None else set(record)
+        merged = {**current, **{k: v for k, v in record.items() if k != 'id' and k in fields_given}}
+        if complete:
+            merged = complete(merged, current)
+        if merged != current:
+            updates.append((current, merged))
+        else:
+            unchanged += 1
+    if blank:
+        needed = ' or '.join('+'.join(f) for f in (fields, fallback) if f)
+        raise MergeError(f"row(s) {', '.join(map(str, blank[:10]))} have no {needed}")
+    return inserts, updates, unchanged
+
+def mark_completer(store):
+    """complete() for marks: maxScore from the exam, percentage recomputed when the score changes"""
+    def complete(mark, current):
+        exam = store.exam(mark.get('examId')) or {}
+        max_score = mark.get('maxScore') or exam.get('maxScore')
+        changed = current is None or 'percentage' not in current or any(
+            mark.get(field) != current.get(field) for field in ('score', 'maxScore'))
+        if max_score and changed:
+            mark['maxScore'] = float(max_score)
+            mark['percentage'] = f"{float(mark.get('score') or 0) / float(max_score) * 100:.1f}"
+        return mark
+    return complete
+
+def merge_outputs(outputs, output_dir, fields=None):
+    """Merge converted records into the existing data files
+
+    Every sheet is diffed before anything is written, so a MergeError in
+    one leaves all files untouched. Only inserts and updates are applied:
+    marks go to the append-only mark journal, and other files are rewritten
+    only if something changed. fields[key] lists the fields present per row
+    (see diff_records). Returns {key: (inserted, updated, unchanged)}.
+    """
+    # The shared data store lives in the repository root
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import mark_journal
+    from backup_store import backup_file
+    from data_store import get_store, load_json, save_json
     
-    return resources
+    store = get_store(output_dir)
+    fields = fields or {}
+    diffs = {}
+    for key, incoming in outputs.items():
+        if key in ('students', 'groups', 'exams', 'marks'):
+            existing = getattr(store, key)
+        else:
+            existing = load_json(os.path.join(output_dir, f"{key}.json"))
+        if not isinstance(existing, list):
+            print(f"⚠ Skipping merge into {key}.json - existing file is not a list of records")
+            continue
+        try:
+            diffs[key] = (existing, diff_records(existing, incoming, MERGE_KEYS[key], FALLBACK_KEYS.get(key),
+                                                 fields.get(key),
+                                                 mark_completer(store) if key == 'marks' else None))
+        except MergeError as e:
+            raise MergeError(f"{key}: {e}") from None
 
-def convert_excel_to_json(excel_file):
-    """Main function to convert Excel file to JSON files"""
+    summary = {}
+    for key, (existing, (inserts, updates, unchanged)) in diffs.items():
+        summary[key] = (len(inserts), len(updates), unchanged)
+        if not inserts and not updates:
+            continue
+        
+        if key == 'marks':
+            for record in inserts:
+                store.upsert_mark(record)
+            for _, merged in updates:
+                store.upsert_mark(merged)
+            store.save('marks')
+            mark_journal.compact_pending(store)
+            continue
+        
+        backup_file(key, output_dir)
+        for current, merged in updates:
+            current.clear()
+            current.update(merged)
+        if key == 'students':
+            for record in inserts:
+                store.add_student(record)
+        else:
+            existing.extend(inserts)
+        
+        if key in ('groups', 'exams', 'students'):
+            store.replace(key, existing)
+            store.save(key)
+        else:
+            save_json(os.path.join(output_dir, f"{key}.json"), existing)
+    return summary
+
+def convert_excel_to_json(excel_file, parallel=False, workers=None, merge=False):
+    """Main function to convert Excel file to JSON files
+
+    The workbook is parsed once. With parallel=True the sheet converters
+    run in a process pool and the output files are written concurrently.
+    Sheets mapping to the same file (e.g. one marks sheet per group) are
+    combined in workbook order. With merge=True rows are matched to the
+    existing records on MERGE_KEYS and only the differences are written.
+    """
     try:
-        # Read all sheets from the Excel file
         xl_file = pd.ExcelFile(excel_file)
         
         print(f"Found sheets: {xl_file.sheet_names}")
@@ -217,50 +435,79 @@ def convert_excel_to_json(excel_file):
         output_dir = "public/data"
         os.makedirs(output_dir, exist_ok=True)
         
-        converters = {
-            'students': convert_students,
-            'groups': convert_groups,
-            'exams': convert_exams,
-            'marks': convert_marks,
-            'schedule': convert_schedule,
-            'syllabus': convert_syllabus,
-            'resources': convert_resources
-        }
-        
-        converted_files = []
-        
+        matched = []
         for sheet_name in xl_file.sheet_names:
-            sheet_name_lower = sheet_name.lower()
-            
-            # Find matching converter
-            converter = None
-            output_filename = None
-            
-            for key, conv_func in converters.items():
-                if key in sheet_name_lower:
-                    converter = conv_func
-                    output_filename = f"{key}.json"
-                    break
-            
-            if converter:
-                print(f"Converting sheet '{sheet_name}' to {output_filename}...")
-                
-                # Read the sheet
-                df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                
-                # Convert to JSON format
-                json_data = converter(df)
-                
-                # Write to JSON file
-                output_path = os.path.join(output_dir, output_filename)
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(json_data, f, indent=2, ensure_ascii=False)
-                
-                converted_files.append(output_filename)
-                print(f"✓ Created {output_path} with {len(json_data)} records")
+            key = match_converter(sheet_name)
+            if key:
+                print(f"Converting sheet '{sheet_name}' to {key}.json...")
+                matched.append((sheet_name, key))
             else:
                 print(f"⚠ Skipping sheet '{sheet_name}' - no matching converter found")
         
+        if not matched:
+            print("\n⚠ No sheets to convert.")
+            return True
+        
+        # Read every matched sheet in a single pass over the workbook
+        start = time.perf_counter()
+        frames = pd.read_excel(xl_file, sheet_name=[name for name, _ in matched])
+        read_time = time.perf_counter() - start
+        
+        # Convert sheets
+        jobs = [(key, name, frames[name]) for name, key in matched]
+        if parallel and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(convert_sheet, *zip(*jobs)))
+        else:
+            results = [convert_sheet(*job) for job in jobs]
+        
+        outputs = {}
+        fields = {}
+        convert_times = {}
+        for key, sheet_name, records, present, seconds in results:
+            outputs.setdefault(key, []).extend(records)
+            fields.setdefault(key, []).extend([present] * len(records))
+            convert_times[sheet_name] = seconds
+        
+        if merge:
+            start = time.perf_counter()
+            summary = merge_outputs(outputs, output_dir, fields)
+            merge_time = time.perf_counter() - start
+            
+            print(f"\n🔀 Merge results:")
+            for key, (inserted, updated, unchanged) in summary.items():
+                print(f"   {key + '.json':<16} {inserted} inserted, {updated} updated, {unchanged} unchanged")
+            print(f"\n⏱  Read {read_time * 1000:.1f} ms, merge {merge_time * 1000:.1f} ms")
+            if summary.get('marks', (0, 0))[:2] != (0, 0):
+                print("💡 Run 'python mark_journal.py compact' before deploying the site")
+            return True
+        
+        # Write JSON files
+        paths = {key: os.path.join(output_dir, f"{key}.json") for key in outputs}
+        if parallel and len(outputs) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {key: pool.submit(write_json, paths[key], data) for key, data in outputs.items()}
+                write_times = {key: future.result() for key, future in futures.items()}
+        else:
+            write_times = {key: write_json(paths[key], data) for key, data in outputs.items()}
+        
+        # A fresh marks.json supersedes any pending mark journal
+        if 'marks' in outputs:
+            journal_file = os.path.join(output_dir, "marks.journal.jsonl")
+            if os.path.exists(journal_file):
+                os.remove(journal_file)
+        
+        for key, data in outputs.items():
+            print(f"✓ Created {paths[key]} with {len(data)} records")
+        
+        print(f"\n⏱  Timings ({'parallel' if parallel else 'sequential'}):")
+        print(f"   Read workbook: {read_time * 1000:8.1f} ms")
+        for sheet_name, key in matched:
+            print(f"   {sheet_name:<24} convert {convert_times[sheet_name] * 1000:8.1f} ms  ({len(frames[sheet_name])} rows)")
+        for key, seconds in write_times.items():
+            print(f"   {key + '.json':<24} write   {seconds * 1000:8.1f} ms")
+        
+        converted_files = [f"{key}.json" for key in outputs]
         print(f"\n✅ Conversion complete! Created {len(converted_files)} JSON files:")
         for filename in converted_files:
             print(f"   - {output_dir}/{filename}")
@@ -282,7 +529,18 @@ def print_usage():
 Excel to JSON Converter for Student Management System
 
 Usage:
-    python excel_to_json.py <excel_file.xlsx>
+    python excel_to_json.py <excel_file.xlsx> [options]
+
+Options:
+    --parallel     Convert sheets in a process pool and write files concurrently
+    --workers N    Number of worker processes (default: one per CPU)
+    --merge        Update existing data instead of overwriting it: rows are
+                   matched on stable keys (studentId + groupId for students,
+                   or name + groupId without a student_id; studentId + examId
+                   for marks) and only inserts and updates are written, so
+                   re-importing is idempotent. Existing records only take
+                   the columns the sheet has; blank or repeated keys stop
+                   the import before anything is written
 
 Supported Excel sheet names (case-insensitive):
     - Students: Student information (name, email, group, etc.)
@@ -304,14 +562,36 @@ Required columns for each sheet:
 
 Example:
     python excel_to_json.py student_data.xlsx
+    python excel_to_json.py institute_workbook.xlsx --parallel
+    python excel_to_json.py weekly_marks.xlsx --merge
     """)
 
+def parse_args(argv):
+    """Parse '<excel_file> [--parallel] [--workers N] [--merge]', or return None"""
+    options = {'excel_file': None, 'parallel': False, 'workers': None, 'merge': False}
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == '--parallel':
+            options['parallel'] = True
+        elif arg == '--merge':
+            options['merge'] = True
+        elif arg == '--workers' and args and args[0].isdigit():
+            options['workers'] = int(args.pop(0))
+            options['parallel'] = True
+        elif not arg.startswith('--') and options['excel_file'] is None:
+            options['excel_file'] = arg
+        else:
+            return None
+    return options if options['excel_file'] else None
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
+    options = parse_args(sys.argv[1:])
+    if options is None:
         print_usage()
         sys.exit(1)
     
-    excel_file = sys.argv[1]
+    excel_file = options['excel_file']
     
     if not os.path.exists(excel_file):
         print(f"❌ Error: File '{excel_file}' not found")
@@ -323,7 +603,8 @@ if __name__ == "__main__":
     
     print(f"🔄 Converting {excel_file} to JSON format...")
     
-    if convert_excel_to_json(excel_file):
+    if convert_excel_to_json(excel_file, parallel=options['parallel'], workers=options['workers'],
+                             merge=options['merge']):
         print("✅ Conversion completed successfully!")
     else:
         print("❌ Conversion failed!")
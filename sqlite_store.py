@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+SQLite Store
+Optional SQLite copy of the data with real tables and indexes, for
+queries that would otherwise scan the JSON lists:
+
+    students     (group, student number and name indexed)
+    groups
+    exams        (date indexed)
+    exam_groups  one row per entry of an exam's assignedGroups
+    marks        (student + exam, exam, student + date, date indexed)
+
+Each row also keeps the record exactly as it appears in the JSON file,
+along with its position, so exporting regenerates public/data/*.json byte
+for byte - the static site keeps working unchanged. Every write runs in a
+transaction.
+
+Usage:
+    python sqlite_store.py import                      # public/data/*.json -> database
+    python sqlite_store.py export                      # database -> public/data/*.json
+    python sqlite_store.py check                       # does an export match the files?
+    python sqlite_store.py marks saipem6 2025-09-01 2025-09-30 [--explain]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+
+import mark_journal
+from backup_store import backup_file
+from data_store import DATA_DIR, StaleDataError, file_lock, file_version, get_store, save_json
+
+DB_FILE = os.path.join("database", "studentlms.sqlite3")
+
+COLLECTIONS = ('students', 'groups', 'exams', 'marks')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    sort_key REAL NOT NULL,
+    id TEXT NOT NULL,
+    group_id TEXT,
+    student_number TEXT,
+    name TEXT,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS students_id ON students (id);
+CREATE INDEX IF NOT EXISTS students_group ON students (group_id, sort_key);
+CREATE INDEX IF NOT EXISTS students_number ON students (group_id, student_number);
+CREATE INDEX IF NOT EXISTS students_name ON students (name);
+CREATE INDEX IF NOT EXISTS students_order ON students (sort_key);
+
+CREATE TABLE IF NOT EXISTS groups (
+    sort_key REAL NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS groups_id ON groups (id);
+CREATE INDEX IF NOT EXISTS groups_order ON groups (sort_key);
+
+CREATE TABLE IF NOT EXISTS exams (
+    sort_key REAL NOT NULL,
+    id TEXT NOT NULL,
+    date TEXT,
+    type TEXT,
+    max_score REAL,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS exams_id ON exams (id);
+CREATE INDEX IF NOT EXISTS exams_date ON exams (date);
+CREATE INDEX IF NOT EXISTS exams_order ON exams (sort_key);
+
+CREATE TABLE IF NOT EXISTS exam_groups (
+    exam_id TEXT NOT NULL,
+    group_id TEXT NOT NULL,
+    PRIMARY KEY (exam_id, group_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS exam_groups_group ON exam_groups (group_id, exam_id);
+
+CREATE TABLE IF NOT EXISTS marks (
+    sort_key REAL NOT NULL,
+    id TEXT NOT NULL,
+    student_id TEXT,
+    exam_id TEXT,
+    date TEXT,
+    score REAL,
+    percentage REAL,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS marks_id ON marks (id);
+CREATE INDEX IF NOT EXISTS marks_key ON marks (student_id, exam_id);
+CREATE INDEX IF NOT EXISTS marks_student_date ON marks (student_id, date);
+CREATE INDEX IF NOT EXISTS marks_exam ON marks (exam_id);
+CREATE INDEX IF NOT EXISTS marks_date ON marks (date);
+CREATE INDEX IF NOT EXISTS marks_order ON marks (sort_key);
+
+-- Version of each JSON file when it was last imported or exported
+CREATE TABLE IF NOT EXISTS json_versions (
+    name TEXT PRIMARY KEY,
+    version TEXT NOT NULL
+);
+"""
+
+
+def to_number(value):
+    """Float for numeric columns (percentages are stored as text), else None"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def text(value):
+    """Text for key columns (student numbers can be ints in old data)"""
+    return None if value is None else str(value)
+
+
+# Indexed columns of each table, derived from the record
+COLUMNS = {
+    'students': lambda r: {'id': text(r.get('id')), 'group_id': r.get('groupId'),
+                           'student_number': text(r.get('studentId')), 'name': r.get('name')},
+    'groups': lambda r: {'id': text(r.get('id')), 'name': r.get('name')},
+    'exams': lambda r: {'id': text(r.get('id')), 'date': r.get('date'), 'type': r.get('type'),
+                        'max_score': to_number(r.get('maxScore'))},
+    'marks': lambda r: {'id': text(r.get('id')), 'student_id': text(r.get('studentId')),
+                        'exam_id': text(r.get('examId')), 'date': r.get('date'),
+                        'score': to_number(r.get('score')), 'percentage': to_number(r.get('percentage'))},
+}
+
+
+def json_version(data_dir, name):
+    """Version stamp of a JSON file (marks include the journal)"""
+    version = [file_version(os.path.join(data_dir, f"{name}.json"))]
+    if name == 'marks':
+        version.append(mark_journal.journal_size(data_dir))
+    return json.dumps(version)
+
+
+def encode(record):
+    return json.dumps(record, ensure_ascii=False)
+
+
+class SqliteStore:
+    """The four main collections in SQLite, with JSON import/export"""
+
+    def __init__(self, db_path=DB_FILE):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Rows
+    # ------------------------------------------------------------------
+
+    def _insert(self, table, record, sort_key):
+        columns = {'sort_key': sort_key, **COLUMNS[table](record), 'doc': encode(record)}
+        self.conn.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            list(columns.values())
+        )
+        if table == 'exams':
+            self._set_exam_groups(record)
+
+    def _update(self, table, rowid, record):
+        columns = {**COLUMNS[table](record), 'doc': encode(record)}
+        self.conn.execute(
+            f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in columns)} WHERE rowid = ?",
+            list(columns.values()) + [rowid]
+        )
+        if table == 'exams':
+            self._set_exam_groups(record)
+
+    def _set_exam_groups(self, exam):
+        self.conn.execute("DELETE FROM exam_groups WHERE exam_id = ?", (text(exam.get('id')),))
+        groups = list(exam.get('assignedGroups') or [])
+        if exam.get('groupId'):
+            # Legacy single-group exams
+            groups.append(exam['groupId'])
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO exam_groups (exam_id, group_id) VALUES (?, ?)",
+            [(text(exam.get('id')), group_id) for group_id in groups]
+        )
+
+    def _docs(self, sql, params=()):
+        return [json.loads(row['doc']) for row in self.conn.execute(sql, params)]
+
+    # ------------------------------------------------------------------
+    # Import / export
+    # ------------------------------------------------------------------
+
+    def import_collections(self, data):
+        """Replace the tables with {collection: records} in one transaction"""
+        with self.conn:
+            for name, records in data.items():
+                self.conn.execute(f"DELETE FROM {name}")
+                if name == 'exams':
+                    self.conn.execute("DELETE FROM exam_groups")
+                for position, record in enumerate(records):
+                    self._insert(name, record, float(position))
+        self.conn.execute("ANALYZE")
+
+    def import_json(self, store=None):
+        """Load every collection from the JSON data (marks include the journal)"""
+        store = store or get_store()
+        data = {name: getattr(store, name) for name in COLLECTIONS}
+        self.import_collections(data)
+        for name in COLLECTIONS:
+            self._remember_version(store.data_dir, name)
+        return {name: len(records) for name, records in data.items()}
+
+    def _remember_version(self, data_dir, name):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO json_versions (name, version) VALUES (?, ?)",
+                              (name, json_version(data_dir, name)))
+
+    def collection(self, name):
+        """Records of a collection in file order"""
+        return self._docs(f"SELECT doc FROM {name} ORDER BY sort_key, rowid")
+
+    def export_payload(self, name):
+        """File content of public/data/<name>.json, in save_json's formatting"""
+        return json.dumps(self.collection(name), indent=2, ensure_ascii=False).encode('utf-8')
+
+    def export_json(self, data_dir=DATA_DIR):
+        """Rewrite the JSON files that differ from the database; returns their names"""
+        # Check every file first so a stale one doesn't leave a partial export
+        for name in COLLECTIONS:
+            known = self.conn.execute("SELECT version FROM json_versions WHERE name = ?", (name,)).fetchone()
+            if known and known['version'] != json_version(data_dir, name):
+                raise StaleDataError(f"{os.path.join(data_dir, name + '.json')} changed after it was imported - "
+                                     f"run 'python sqlite_store.py import' first")
+
+        written = []
+        for name in COLLECTIONS:
+            path = os.path.join(data_dir, f"{name}.json")
+            try:
+                with open(path, 'rb') as f:
+                    if f.read() == self.export_payload(name):
+                        continue
+            except FileNotFoundError:
+                pass
+            backup_file(name, data_dir)
+            with file_lock(path):
+                save_json(path, self.collection(name))
+                if name == 'marks':
+                    # The database already holds the journaled changes
+                    mark_journal.clear(data_dir)
+            self._remember_version(data_dir, name)
+            written.append(name)
+        return written
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def student(self, student_id):
+        docs = self._docs("SELECT doc FROM students WHERE id = ? LIMIT 1", (student_id,))
+        return docs[0] if docs else None
+
+    def group_students(self, group_id):
+        return self._docs("SELECT doc FROM students WHERE group_id = ? ORDER BY sort_key", (group_id,))
+
+    def exams_for_group(self, group_id):
+        """Exams assigned to a group plus exams open to every group"""
+        return self._docs("""
+            SELECT doc FROM exams
+            WHERE id IN (SELECT exam_id FROM exam_groups WHERE group_id = ?)
+               OR id NOT IN (SELECT exam_id FROM exam_groups)
+            ORDER BY sort_key
+        """, (group_id,))
+
+    def student_marks(self, student_id):
+        return self._docs("SELECT doc FROM marks WHERE student_id = ? ORDER BY sort_key", (student_id,))
+
+    def exam_marks(self, exam_id):
+        return self._docs("SELECT doc FROM marks WHERE exam_id = ? ORDER BY sort_key", (exam_id,))
+
+    GROUP_MARKS_SQL = """
+        SELECT m.doc FROM students s
+        JOIN marks m ON m.student_id = s.id AND m.date BETWEEN ? AND ?
+        WHERE s.group_id = ?
+        ORDER BY m.date, m.sort_key
+    """
+
+    def group_marks(self, group_id, start='0000-00-00', end='9999-99-99'):
+        """Marks of a group's students dated between start and end (inclusive)"""
+        return self._docs(self.GROUP_MARKS_SQL, (start, end, group_id))
+
+    def explain(self, sql, params):
+        """SQLite's query plan for a query, one step per line"""
+        return [row['detail'] for row in self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+    # ------------------------------------------------------------------
+    # Writes (each one is a transaction)
+    # ------------------------------------------------------------------
+
+    def upsert_mark(self, mark):
+        """Add a mark, or replace the mark for the same (student, exam) or id"""
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT rowid FROM marks WHERE student_id = ? AND exam_id = ? ORDER BY sort_key LIMIT 1",
+                (text(mark.get('studentId')), text(mark.get('examId')))
+            ).fetchone() or self.conn.execute(
+                "SELECT rowid FROM marks WHERE id = ? LIMIT 1", (text(mark.get('id')),)
+            ).fetchone()
+            if row:
+                self._update('marks', row['rowid'], mark)
+            else:
+                last = self.conn.execute("SELECT MAX(sort_key) FROM marks").fetchone()[0]
+                self._insert('marks', mark, (last if last is not None else -1) + 1)
+
+    def delete_mark(self, mark_id):
+        with self.conn:
+            return self.conn.execute("DELETE FROM marks WHERE id = ?", (mark_id,)).rowcount
+
+    def add_student(self, student):
+        """Insert a student after the last student of the same group"""
+        with self.conn:
+            last = self.conn.execute(
+                "SELECT MAX(sort_key) FROM students WHERE group_id = ?", (student.get('groupId'),)
+            ).fetchone()[0]
+            if last is None:
+                last = self.conn.execute("SELECT MAX(sort_key) FROM students").fetchone()[0]
+                sort_key = (last if last is not None else -1) + 1
+            else:
+                following = self.conn.execute(
+                    "SELECT MIN(sort_key) FROM students WHERE sort_key > ?", (last,)
+                ).fetchone()[0]
+                sort_key = last + 1 if following is None else (last + following) / 2
+            self._insert('students', student, sort_key)
+
+
+def require_database(db_path=DB_FILE):
+    """Stop with one clear message when the database hasn't been built yet"""
+    if not os.path.exists(db_path):
+        print(f"❌ Database not built yet ({db_path}) - run 'python sqlite_store.py import' first")
+        sys.exit(1)
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    command = args[0] if args else ''
+
+    if command == 'import':
+        db = SqliteStore()
+        counts = db.import_json()
+        print(f"✅ Imported into {db.db_path}:")
+        for name, count in counts.items():
+            print(f"   • {name}: {count}")
+    elif command == 'export':
+        require_database()
+        db = SqliteStore()
+        try:
+            written = db.export_json()
+        except StaleDataError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"✅ Updated {', '.join(written)}" if written else "✅ JSON files already match the database")
+    elif command == 'check':
+        require_database()
+        db = SqliteStore()
+        mismatched = []
+        for name in COLLECTIONS:
+            with open(os.path.join(DATA_DIR, f"{name}.json"), 'rb') as f:
+                matches = f.read() == db.export_payload(name)
+            print(f"{'✅' if matches else '❌'} {name}.json")
+            if not matches:
+                mismatched.append(name)
+        if mismatched:
+            print("💡 Run 'python sqlite_store.py import' (JSON is newer) or 'export' (database is newer)")
+            sys.exit(1)
+    elif command == 'marks' and len(args) >= 2:
+        require_database()
+        db = SqliteStore()
+        group_id = args[1]
+        start = args[2] if len(args) > 2 and not args[2].startswith('--') else '0000-00-00'
+        end = args[3] if len(args) > 3 and not args[3].startswith('--') else '9999-99-99'
+        if '--explain' in args:
+            for step in db.explain(SqliteStore.GROUP_MARKS_SQL, (start, end, group_id)):
+                print(f"🔎 {step}")
+        marks = db.group_marks(group_id, start, end)
+        names = {s['id']: s.get('name', '') for s in db.group_students(group_id)}
+        print(f"\n📝 {len(marks)} mark(s) for {group_id} from {start} to {end}")
+        for mark in marks:
+            print(f"   {mark.get('date')}  {names.get(mark.get('studentId'), mark.get('studentId')):<40} "
+                  f"{mark.get('score')}/{mark.get('maxScore')} ({mark.get('percentage')}%)")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,105 +1,5 @@
 import React, { useState, useEffect } from 'react'
-
-// Marks Protection System - prevents data loss
-class MarksProtectionSystem {
-  constructor() {
-    this.backupPrefix = 'marks_backup_';
-    this.maxBackups = 50;
-    this.isUpdating = false;
-  }
-
-  createBackup(data, action = 'save') {
-    try {
-      const timestamp = new Date().toISOString()
-        .replace(/[:.]/g, '-')
-        .replace('T', '_')
-        .substring(0, 19);
-      const backupName = `${this.backupPrefix}${action}_${timestamp}`;
-      
-      localStorage.setItem(backupName, JSON.stringify(data, null, 2));
-      console.log(`📦 Created backup: ${backupName}`);
-      return backupName;
-    } catch (error) {
-      console.error('Failed to create backup:', error);
-      return null;
-    }
-  }
-
-  async safeUpdateMarks(newMark) {
-    if (this.isUpdating) {
-      console.warn('⚠️ Another update is in progress, waiting...');
-      while (this.isUpdating) {
-        await new Promise(resolve => setTimeout(resolve, 50));
-      }
-    }
-
-    this.isUpdating = true;
-    
-    try {
-      console.log('🛡️ Starting safe mark update for student:', newMark.studentId);
-      
-      // Load current marks
-      const currentMarks = JSON.parse(localStorage.getItem('marks') || '[]');
-      console.log(`📊 Current marks count: ${currentMarks.length}`);
-      
-      // Create backup before changes
-      const backupName = this.createBackup(currentMarks, 'before_update');
-      if (!backupName) {
-        throw new Error('Failed to create backup');
-      }
-      
-      // Check for existing mark
-      const existingMarkIndex = currentMarks.findIndex(mark => 
-        mark.studentId === newMark.studentId && mark.examId === newMark.examId
-      );
-      
-      let updatedMarks;
-      if (existingMarkIndex >= 0) {
-        updatedMarks = [...currentMarks];
-        updatedMarks[existingMarkIndex] = { ...updatedMarks[existingMarkIndex], ...newMark };
-        console.log(`🔄 Updated existing mark for student ${newMark.studentId}`);
-      } else {
-        updatedMarks = [...currentMarks, newMark];
-        console.log(`➕ Added new mark for student ${newMark.studentId}`);
-      }
-      
-      // Atomic write with verification
-      const serializedData = JSON.stringify(updatedMarks, null, 2);
-      localStorage.setItem('marks_temp', serializedData);
-      
-      // Verify temp write
-      if (localStorage.getItem('marks_temp') !== serializedData) {
-        throw new Error('Temp write verification failed');
-      }
-      
-      // Move to main location
-      localStorage.setItem('marks', serializedData);
-      
-      // Verify main write
-      if (localStorage.getItem('marks') !== serializedData) {
-        throw new Error('Main write verification failed');
-      }
-      
-      localStorage.removeItem('marks_temp');
-      
-      // Create success backup
-      this.createBackup(updatedMarks, 'after_update');
-      
-      console.log(`✅ Successfully saved ${updatedMarks.length} marks with protection`);
-      
-      return { success: true, count: updatedMarks.length, action: existingMarkIndex >= 0 ? 'updated' : 'added' };
-      
-    } catch (error) {
-      console.error('❌ Protected update failed:', error);
-      return { success: false, error: error.message };
-    } finally {
-      this.isUpdating = false;
-    }
-  }
-}
-
-// Global protection instance
-const marksProtection = new MarksProtectionSystem();
+import { fetchData } from '../utils/dataFiles'
 
 // Reports Content Component
 const ReportsContent = ({ reportData, selectedExamFilter, hideNonEvaluated, allExams, groups }) => {
@@ -408,8 +308,6 @@ const Exams = () => {
   const [hideNonEvaluated, setHideNonEvaluated] = useState(false)
   const [searchStudentName, setSearchStudentName] = useState('')
 
-  const basePath = import.meta.env.PROD ? '/studentLMS' : ''
-
   useEffect(() => {
     loadData()
   }, [])
@@ -420,10 +318,10 @@ const Exams = () => {
       
       // Load data from JSON files
       const [examsRes, studentsRes, marksRes, groupsRes] = await Promise.all([
-        fetch(`${basePath}/data/exams.json`),
-        fetch(`${basePath}/data/students.json`),
-        fetch(`${basePath}/data/marks.json`),
-        fetch(`${basePath}/data/groups.json`)
+        fetchData('exams.json'),
+        fetchData('students.json'),
+        fetchData('marks.json'),
+        fetchData('groups.json')
       ])
       
       const [examsData, studentsData, marksData, groupsData] = await Promise.all([
@@ -445,6 +343,17 @@ const Exams = () => {
     }
   }
 
+  // Marks grouped by student, so building a report doesn't rescan every mark per student
+  const marksByStudent = React.useMemo(() => {
+    const index = new Map()
+    marks.forEach(mark => {
+      const studentId = mark.studentId.toString()
+      if (!index.has(studentId)) index.set(studentId, [])
+      index.get(studentId).push(mark)
+    })
+    return index
+  }, [marks])
+
   // Group reporting functions
   const getGroupReportData = (groupId) => {
     // Get students in the selected group
@@ -473,7 +382,7 @@ const Exams = () => {
 
     // Create report data for each student
     let reportData = groupStudents.map(student => {
-      const studentMarks = marks.filter(mark => mark.studentId.toString() === student.id)
+      const studentMarks = marksByStudent.get(student.id) || []
 
       const examScores = {}
       let evaluatedExamsCount = 0
@@ -1,6 +1,8 @@
 import { useState, useEffect } from 'react'
 import { useTheme } from '../components/ThemeContext';
 import { Link } from 'react-router-dom'
+import { fetchData } from '../utils/dataFiles'
+import { loadAnalytics } from '../utils/analytics'
 
 const Home = () => {
   const [stats, setStats] = useState({
@@ -19,28 +21,19 @@ const Home = () => {
 
   const loadStats = async () => {
     try {
-      const basePath = import.meta.env.PROD ? '/studentLMS' : ''
-      const [studentsRes, examsRes, weeklyScheduleRes, resourcesRes, marksRes, syllabusRes, teachingConfigRes] = await Promise.all([
-        fetch(`${basePath}/data/students.json`).catch(() => ({ json: () => [] })),
-        fetch(`${basePath}/data/exams.json`).catch(() => ({ json: () => [] })),
-        fetch(`${basePath}/data/weekly_schedule_template.json`).catch(() => ({ json: () => null })),
-        fetch(`${basePath}/data/resources.json`).catch(() => ({ json: () => [] })),
-        fetch(`${basePath}/data/marks.json`).catch(() => ({ json: () => [] })),
-        fetch(`${basePath}/data/syllabus.json`).catch(() => ({ json: () => ({}) })),
-        fetch(`${basePath}/data/teaching_config.json`).catch(() => ({ json: () => ({ activeGroups: [] }) })),
+      const [analytics, weeklyScheduleRes, resourcesRes, syllabusRes] = await Promise.all([
+        loadAnalytics().catch(() => ({ totals: {} })),
+        fetchData('weekly_schedule_template.json').catch(() => ({ json: () => null })),
+        fetchData('resources.json').catch(() => ({ json: () => [] })),
+        fetchData('syllabus.json').catch(() => ({ json: () => ({}) })),
       ])
 
-      const students = await studentsRes.json()
-      const exams = await examsRes.json()
       const weeklySchedule = await weeklyScheduleRes.json()
       const resources = await resourcesRes.json()
-      const marks = await marksRes.json()
       const syllabusData = await syllabusRes.json()
-      const teachingConfig = await teachingConfigRes.json()
 
-      // Calculate average grade
-      const totalMarks = marks.reduce((sum, mark) => sum + mark.score, 0)
-      const avgGrade = marks.length > 0 ? (totalMarks / marks.length).toFixed(1) : 0
+      // Student counts and averages, see utils/analytics.js
+      const totals = analytics.totals || {}
 
       // Count completed syllabus topics from the new structure
       let completed = 0
@@ -54,14 +47,6 @@ const Home = () => {
         })
       }
 
-      // Get active groups from teaching config
-      const activeGroups = teachingConfig.activeGroups || []
-      
-      // Filter students to only include those in currently taught groups
-      const activeStudents = students.filter(student => 
-        activeGroups.includes(student.groupId.toLowerCase())
-      )
-
       // Calculate weekly classes total from weekly template
       let weeklyClassesCount = 0
       if (weeklySchedule?.weekly_schedule) {
@@ -74,11 +59,11 @@ const Home = () => {
       }
 
       setStats({
-        totalStudents: activeStudents.length,
-        totalExams: exams.length,
+        totalStudents: totals.activeStudents || 0,
+        totalExams: totals.exams || 0,
         scheduledClasses: weeklyClassesCount,
         totalResources: resources.length,
-        averageGrade: avgGrade,
+        averageGrade: totals.averageScore || 0,
         completedTopics: completed
       })
     } catch (error) {
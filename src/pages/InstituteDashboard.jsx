@@ -1,17 +1,13 @@
 import React, { useState, useEffect } from 'react'
 import { useTheme } from '../components/ThemeContext'
+import { loadAnalytics } from '../utils/analytics'
 
 const InstituteDashboard = () => {
-  const [exams, setExams] = useState([])
-  const [students, setStudents] = useState([])
-  const [marks, setMarks] = useState([])
-  const [groups, setGroups] = useState([])
+  const [analyticsData, setAnalyticsData] = useState(null)
   const [loading, setLoading] = useState(true)
 
   const { theme } = useTheme()
 
-  const basePath = import.meta.env.PROD ? '/studentLMS' : ''
-
   useEffect(() => {
     loadData()
   }, [])
@@ -20,24 +16,8 @@ const InstituteDashboard = () => {
     try {
       setLoading(true)
       
-      const [examsRes, studentsRes, marksRes, groupsRes] = await Promise.all([
-        fetch(`${basePath}/data/exams.json`),
-        fetch(`${basePath}/data/students.json`),
-        fetch(`${basePath}/data/marks.json`),
-        fetch(`${basePath}/data/groups.json`)
-      ])
-      
-      const [examsData, studentsData, marksData, groupsData] = await Promise.all([
-        examsRes.json(),
-        studentsRes.json(),
-        marksRes.json(),
-        groupsRes.json()
-      ])
-      
-      setExams(examsData)
-      setStudents(studentsData)
-      setMarks(marksData)
-      setGroups(groupsData)
+      // analytics.json when published, computed from the data files in dev
+      setAnalyticsData(await loadAnalytics())
       
     } catch (error) {
       console.error('Failed to load data:', error)
@@ -48,74 +28,17 @@ const InstituteDashboard = () => {
 
   // Institute-wide analytics
   const getInstituteAnalytics = () => {
-    // Overall performance metrics
-    const totalStudents = students.length
-    const totalGroups = groups.length
-    const totalExams = exams.length
-    const totalEvaluations = marks.length
-
-    // Average performance across all students
-    const overallAverage = marks.length > 0 
-      ? (marks.reduce((sum, mark) => sum + (parseFloat(mark.percentage) || 0), 0) / marks.length).toFixed(1)
-      : 0
-
-    // Group performance comparison
-    const groupPerformance = groups.map(group => {
-      const groupStudents = students.filter(s => s.groupId === group.id)
-      const groupMarks = marks.filter(mark => 
-        groupStudents.some(s => s.id === mark.studentId)
-      )
-      
-      const avgScore = groupMarks.length > 0
-        ? (groupMarks.reduce((sum, mark) => sum + (parseFloat(mark.percentage) || 0), 0) / groupMarks.length).toFixed(1)
-        : 0
-
-      const evaluationRate = groupStudents.length > 0
-        ? ((groupMarks.length / (groupStudents.length * exams.length)) * 100).toFixed(1)
-        : 0
-
-      return {
-        id: group.id,
-        name: group.name,
-        studentCount: groupStudents.length,
-        avgScore: parseFloat(avgScore),
-        evaluations: groupMarks.length,
-        evaluationRate: parseFloat(evaluationRate)
-      }
-    }).sort((a, b) => b.avgScore - a.avgScore)
-
-    // Performance distribution
-    const performanceLevels = {
-      excellent: marks.filter(m => parseFloat(m.percentage) >= 90).length,
-      good: marks.filter(m => parseFloat(m.percentage) >= 70 && parseFloat(m.percentage) < 90).length,
-      average: marks.filter(m => parseFloat(m.percentage) >= 50 && parseFloat(m.percentage) < 70).length,
-      needsImprovement: marks.filter(m => parseFloat(m.percentage) < 50).length
-    }
-
-    // Exam-wise performance
-    const examPerformance = exams.map(exam => {
-      const examMarks = marks.filter(m => m.examId === exam.id)
-      const avgScore = examMarks.length > 0
-        ? (examMarks.reduce((sum, mark) => sum + (parseFloat(mark.percentage) || 0), 0) / examMarks.length).toFixed(1)
-        : 0
-
-      return {
-        ...exam,
-        avgScore: parseFloat(avgScore),
-        participantCount: examMarks.length,
-        assignedToGroups: exam.assignedGroups ? exam.assignedGroups.length : groups.length
-      }
-    }).sort((a, b) => b.avgScore - a.avgScore)
+    const totals = analyticsData?.totals || {}
 
     return {
-      totalStudents,
-      totalGroups,
-      totalExams,
-      totalEvaluations,
-      overallAverage: parseFloat(overallAverage),
-      groupPerformance,
-      performanceLevels,
-      examPerformance
+      totalStudents: totals.students || 0,
+      totalGroups: totals.groups || 0,
+      totalExams: totals.exams || 0,
+      totalEvaluations: totals.evaluations || 0,
+      overallAverage: totals.overallAverage || 0,
+      groupPerformance: analyticsData?.groups || [],
+      performanceLevels: analyticsData?.levels || { excellent: 0, good: 0, average: 0, needsImprovement: 0 },
+      examPerformance: analyticsData?.exams || []
     }
   }
 
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react'
 import { useSearchParams, Link } from 'react-router-dom'
 import { useTheme } from '../components/ThemeContext'
+import { fetchData } from '../utils/dataFiles'
 
 const Resources = () => {
   const { theme } = useTheme()
@@ -140,8 +141,7 @@ const Resources = () => {
   useEffect(() => {
     const loadResources = async () => {
       try {
-        const basePath = import.meta.env.PROD ? '/studentLMS' : ''
-        const response = await fetch(`${basePath}/data/resources.json`)
+        const response = await fetchData('resources.json')
         const data = await response.json()
         setResources(data)
       } catch (error) {
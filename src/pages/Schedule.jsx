@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react'
 import { useTheme } from '../components/ThemeContext'
+import { fetchData } from '../utils/dataFiles'
 
 const Schedule = () => {
   const { theme } = useTheme()
@@ -37,8 +38,7 @@ const Schedule = () => {
 
   const loadSchedule = async () => {
     try {
-      const basePath = import.meta.env.PROD ? '/studentLMS' : ''
-      const response = await fetch(`${basePath}/data/weekly_schedule_template.json`)
+      const response = await fetchData('weekly_schedule_template.json')
       if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`)
       const data = await response.json()
       setWeeklySchedule(data)
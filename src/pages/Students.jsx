@@ -1,6 +1,33 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useMemo, useRef } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { useTheme } from '../components/ThemeContext'
+import { fetchData } from '../utils/dataFiles'
+import { apiAvailable, getAll, saveMark } from '../utils/api'
+import { average, markPercentage } from '../utils/analytics'
+
+// Group shards are built by publish_data.py, so only published builds have
+// current ones; the dev server (or a build without shards) reads the whole
+// students.json and marks.json instead
+const loadWholeData = async () => {
+  const [studentsRes, marksRes] = await Promise.all([fetchData('students.json'), fetchData('marks.json')])
+  return { students: await studentsRes.json(), marks: await marksRes.json() }
+}
+
+// Same shape as groups/manifest.json
+const manifestOf = ({ students, marks }) => {
+  const groups = {}
+  students.forEach(student => {
+    const entry = groups[student.groupId] || (groups[student.groupId] = { students: 0 })
+    entry.students += 1
+  })
+  return { totals: { students: students.length, marks: marks.length }, groups }
+}
+
+const groupSlice = ({ students, marks }, groupId) => {
+  const groupStudents = students.filter(student => student.groupId === groupId)
+  const ids = new Set(groupStudents.map(student => student.id))
+  return { students: groupStudents, marks: marks.filter(mark => ids.has(mark.studentId)) }
+}
 
 const Students = () => {
   const { theme } = useTheme()
@@ -10,25 +37,30 @@ const Students = () => {
   const [allGroups, setAllGroups] = useState([]) // Store all groups for future use
   const [marks, setMarks] = useState([])
   const [exams, setExams] = useState([])
+  const [manifest, setManifest] = useState({ totals: {}, groups: {} })
   const [selectedGroup, setSelectedGroup] = useState('')
   const [loading, setLoading] = useState(true)
+  // Whole students/marks when the shards aren't used (see loadWholeData)
+  const wholeData = useRef(null)
+  const getWholeData = () => {
+    if (!wholeData.current) wholeData.current = loadWholeData()
+    return wholeData.current
+  }
 
   useEffect(() => {
     // Load data from JSON files
     const loadData = async () => {
       try {
-        const basePath = import.meta.env.PROD ? '/studentLMS' : ''
-        const [studentsRes, groupsRes, marksRes, examsRes, configRes] = await Promise.all([
-          fetch(`${basePath}/data/students.json`).catch(() => ({ json: () => [] })),
-          fetch(`${basePath}/data/groups.json`).catch(() => ({ json: () => [] })),
-          fetch(`${basePath}/data/marks.json`).catch(() => ({ json: () => [] })),
-          fetch(`${basePath}/data/exams.json`).catch(() => ({ json: () => [] })),
-          fetch(`${basePath}/data/teaching_config.json`).catch(() => ({ json: () => ({ activeGroups: [] }) })),
+        // Students and marks are loaded per group (see build_group_shards.py)
+        const [manifestRes, groupsRes, examsRes, configRes] = await Promise.all([
+          import.meta.env.PROD ? fetchData('groups/manifest.json').catch(() => null) : null,
+          fetchData('groups.json').catch(() => ({ json: () => [] })),
+          fetchData('exams.json').catch(() => ({ json: () => [] })),
+          fetchData('teaching_config.json').catch(() => ({ json: () => ({ activeGroups: [] }) })),
         ])
 
-        const studentsData = await studentsRes.json()
+        const manifestData = manifestRes?.ok ? await manifestRes.json() : manifestOf(await getWholeData())
         const groupsData = await groupsRes.json()
-        const marksData = await marksRes.json()
         const examsData = await examsRes.json()
         const configData = await configRes.json()
 
@@ -36,10 +68,9 @@ const Students = () => {
         const activeGroupIds = configData.activeGroups || []
         const activeGroups = groupsData.filter(group => activeGroupIds.includes(group.id))
 
-        setStudents(studentsData)
+        setManifest(manifestData)
         setAllGroups(groupsData) // Store all groups for future use
         setGroups(activeGroups) // Show only active groups
-        setMarks(marksData)
         setExams(examsData)
       } catch (error) {
         console.error('Error loading data:', error)
@@ -51,48 +82,106 @@ const Students = () => {
     loadData()
   }, [])
 
-  const filteredStudents = selectedGroup
-    ? students.filter(student => student.groupId === selectedGroup)
-    : students.filter(student => {
-        // Only show students from active groups
-        const activeGroupIds = groups.map(g => g.id)
-        return activeGroupIds.includes(student.groupId)
-      })
+  useEffect(() => {
+    // Fetch only the selected group's shard
+    if (!selectedGroup) {
+      setStudents([])
+      setMarks([])
+      return
+    }
+
+    let cancelled = false
+    const loadGroup = async () => {
+      try {
+        if (apiAvailable()) {
+          // Live data from api_server.py, so saved marks show up straight away
+          const [studentsData, marksData] = await Promise.all([
+            getAll(`/groups/${selectedGroup}/students`),
+            getAll(`/groups/${selectedGroup}/marks`),
+          ])
+          if (!cancelled) {
+            setStudents(studentsData)
+            setMarks(marksData)
+          }
+          return
+        }
+        let group = null
+        if (import.meta.env.PROD && !wholeData.current) {
+          const [studentsRes, marksRes] = await Promise.all([
+            fetchData(`groups/${selectedGroup}/students.json`),
+            fetchData(`groups/${selectedGroup}/marks.json`),
+          ]).catch(() => [])
+          if (studentsRes?.ok && marksRes?.ok) {
+            group = { students: await studentsRes.json(), marks: await marksRes.json() }
+          }
+        }
+        if (!group) group = groupSlice(await getWholeData(), selectedGroup)
+        if (!cancelled) {
+          setStudents(group.students)
+          setMarks(group.marks)
+        }
+      } catch (error) {
+        console.error('Error loading group data:', error)
+      }
+    }
+
+    loadGroup()
+    return () => { cancelled = true }
+  }, [selectedGroup])
+
+  const filteredStudents = students
+
+  // Only offered when the API is configured; static files are read-only
+  const handleGradeClick = async (student, exam, mark) => {
+    const input = window.prompt(`${exam.name} - ${student.name} (0-${exam.maxScore}):`, mark ? mark.score : '')
+    if (input === null || input.trim() === '') return
+    try {
+      const saved = await saveMark(student.id, exam.id, Number(input))
+      setMarks(previous => [
+        ...previous.filter(m => !(m.studentId === saved.studentId && m.examId === saved.examId)),
+        saved,
+      ])
+    } catch (error) {
+      alert(`Could not save the mark: ${error.message}`)
+    }
+  }
 
   const handlePlacementTestClick = (student) => {
     // Navigate to Resources page with NESMA group filter
     navigate('/resources?group=nesma')
   }
 
-  const getStudentMarks = (studentId) => {
-    return marks.filter(mark => mark.studentId === studentId)
-  }
+  // Marks keyed by student and exam so each table cell is a single lookup
+  const marksByKey = useMemo(() => {
+    const index = new Map()
+    marks.forEach(mark => {
+      const key = `${mark.studentId}|${mark.examId}`
+      if (!index.has(key)) index.set(key, mark)
+    })
+    return index
+  }, [marks])
 
-  const getStudentAverage = (studentId) => {
-    const studentMarks = getStudentMarks(studentId)
-    if (studentMarks.length === 0) return 0
-    
-    // Calculate percentage-based average
-    const percentages = studentMarks.map(mark => {
-      const exam = exams.find(e => e.id === mark.examId)
-      return exam ? (mark.score / exam.maxScore) * 100 : 0
+  // Averages of the loaded group's marks, so marks saved through the API count at once
+  const averages = useMemo(() => {
+    const byStudent = {}
+    const byExam = {}
+    marks.forEach(mark => {
+      const percentage = markPercentage(mark)
+      ;(byStudent[mark.studentId] = byStudent[mark.studentId] || []).push(percentage)
+      ;(byExam[mark.examId] = byExam[mark.examId] || []).push(percentage)
     })
-    
-    const total = percentages.reduce((sum, percentage) => sum + percentage, 0)
-    return (total / percentages.length).toFixed(1)
+    const averaged = (lists) => Object.fromEntries(Object.entries(lists).map(([id, values]) => [id, average(values)]))
+    return { students: averaged(byStudent), exams: averaged(byExam) }
+  }, [marks])
+
+  const getStudentAverage = (studentId) => {
+    const value = averages.students[studentId]
+    return value !== undefined ? value.toFixed(1) : 0
   }
 
   const getExamAverage = (examId) => {
-    const examMarks = marks.filter(mark => mark.examId === examId)
-    if (examMarks.length === 0) return 0
-    
-    const exam = exams.find(e => e.id === examId)
-    if (!exam) return 0
-    
-    // Calculate percentage-based average
-    const percentages = examMarks.map(mark => (mark.score / exam.maxScore) * 100)
-    const total = percentages.reduce((sum, percentage) => sum + percentage, 0)
-    return (total / percentages.length).toFixed(1)
+    const value = averages.exams[examId]
+    return value ? value.toFixed(1) : 0
   }
 
   if (loading) {
@@ -109,7 +198,7 @@ const Students = () => {
         <h2 className={`text-2xl font-bold ${theme === 'blackGold' ? 'text-blackGold-500' : 'text-gray-900'}`}>Student Progress</h2>
       </div>
 
-      {students.length === 0 ? (
+      {!manifest.totals?.students ? (
         <div className="card text-center py-12">
           <div className="text-6xl mb-4">📚</div>
           <h3 className={`text-xl font-semibold mb-2 ${theme === 'blackGold' ? 'text-blackGold-500' : 'text-gray-900'}`}>No Student Data</h3>
@@ -146,7 +235,7 @@ const Students = () => {
               </div>
               <div className="grid grid-cols-1 md:grid-cols-3 lg:grid-cols-4 gap-4">
                 {groups.map(group => {
-                  const groupStudents = students.filter(s => s.groupId === group.id)
+                  const studentCount = manifest.groups?.[group.id]?.students || 0
                   return (
                     <div
                       key={group.id}
@@ -159,7 +248,7 @@ const Students = () => {
                     >
                       <div className="font-medium text-gray-900">{group.name}</div>
                       <div className="text-sm text-blue-600 font-medium">{group.position}</div>
-                      <div className="text-sm text-gray-600">{groupStudents.length} students</div>
+                      <div className="text-sm text-gray-600">{studentCount} students</div>
                     </div>
                   )
                 })}
@@ -277,7 +366,7 @@ const Students = () => {
                             <div className="font-medium text-gray-900">{student.name}</div>
                           </td>
                           {exams.map(exam => {
-                            const mark = marks.find(m => m.studentId === student.id && m.examId === exam.id)
+                            const mark = marksByKey.get(`${student.id}|${exam.id}`)
                             const percentage = mark ? Math.round((mark.score / exam.maxScore) * 100) : 0
                             
                             // Check if this is a placement test mark for a NESMA student
@@ -301,6 +390,16 @@ const Students = () => {
                                     <span className="ml-1 text-blue-600">🔗</span>
                                   )}
                                 </span>
+                                {apiAvailable() && (
+                                  <button
+                                    type="button"
+                                    className="ml-1 text-xs text-gray-400 hover:text-blue-600"
+                                    onClick={() => handleGradeClick(student, exam, mark)}
+                                    title="Enter or change this mark"
+                                  >
+                                    ✏️
+                                  </button>
+                                )}
                                 {mark && (
                                   <div className="text-xs text-gray-500 mt-1">
                                     {percentage}%
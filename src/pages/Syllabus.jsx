@@ -1,7 +1,8 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { useSearchParams, useNavigate, useLocation } from 'react-router-dom'
 import { useTheme } from '../components/ThemeContext'
-import { getGroupSyllabusConfig } from '../utils/groupSyllabusMapping'
+import { getGroupSyllabusConfig, getSyllabusIndexFile } from '../utils/groupSyllabusMapping'
+import { fetchData } from '../utils/dataFiles'
 
 const Syllabus = () => {
   const { theme } = useTheme()
@@ -12,11 +13,14 @@ const Syllabus = () => {
   const [loading, setLoading] = useState(true)
   const [selectedUnit, setSelectedUnit] = useState(null)
   const [selectedWeek, setSelectedWeek] = useState(null)
+  const [selectedDay, setSelectedDay] = useState(null)
   const [expandedCourse, setExpandedCourse] = useState(null)
   const [viewMode, setViewMode] = useState('selector') // 'selector', 'syllabus', 'units', 'weekly', 'daily'
   const [currentSyllabusType, setCurrentSyllabusType] = useState(null)
   const [highlightedDate, setHighlightedDate] = useState(null)
   const [highlightedGroup, setHighlightedGroup] = useState(null)
+  // Unit files already requested, by path (see build_syllabus_chunks.py)
+  const unitCache = useRef(new Map())
 
   // Available syllabi configuration
   const availableSyllabi = [
@@ -76,31 +80,62 @@ const Syllabus = () => {
     return dayDate
   }
 
+  // Week numbers of a unit - from its index header, or its weekly plan when loaded whole
+  const getUnitWeeks = (unit) => unit.weeks || unit.weeklyPlan?.map(week => week.week) || []
+
+  // The whole unit (weekly and daily plans included), fetching its file on first use
+  const loadUnit = async (unit) => {
+    if (!unit.chunk || unit.weeklyPlan) return unit
+    if (!unitCache.current.has(unit.chunk)) {
+      unitCache.current.set(unit.chunk, fetchData(unit.chunk).then(response => {
+        if (!response.ok) throw new Error(`HTTP ${response.status}`)
+        return response.json()
+      }))
+    }
+    try {
+      return { ...unit, ...(await unitCache.current.get(unit.chunk)) }
+    } catch (error) {
+      unitCache.current.delete(unit.chunk)
+      throw error
+    }
+  }
+
+  const openUnit = async (unit) => {
+    try {
+      setSelectedUnit(await loadUnit(unit))
+      setViewMode('units')
+    } catch (error) {
+      console.error('Error loading unit:', error)
+    }
+  }
+
   // Helper function to find which syllabus week and day a given date falls into
-  const findWeekAndDayForDate = (targetDate) => {
+  const findWeekAndDayForDate = async (data, targetDate) => {
     const target = new Date(targetDate)
     
-    if (!syllabusData?.units) return null
+    if (!data?.units) return null
     
-    // Search through all units and their weekly plans
-    for (const unit of syllabusData.units) {
-      if (unit.weeklyPlan) {
-        for (const weekPlan of unit.weeklyPlan) {
-          const { startDate, endDate } = getWeekDateRange(weekPlan.week)
+    // Find the week in the unit headers, then load only that unit
+    for (const header of data.units) {
+      for (const weekNumber of getUnitWeeks(header)) {
+        const { startDate, endDate } = getWeekDateRange(weekNumber)
+        
+        // Check if target date falls within this week
+        if (target >= startDate && target <= endDate) {
+          const unit = await loadUnit(header)
+          const weekPlan = unit.weeklyPlan?.find(week => week.week === weekNumber)
+          if (!weekPlan) continue
+
+          // Find the specific day
+          const dayName = target.toLocaleDateString('en-US', { weekday: 'long' })
+          const dayPlan = weekPlan.dailyPlans?.find(day => day.day === dayName)
           
-          // Check if target date falls within this week
-          if (target >= startDate && target <= endDate) {
-            // Find the specific day
-            const dayName = target.toLocaleDateString('en-US', { weekday: 'long' })
-            const dayPlan = weekPlan.dailyPlans?.find(day => day.day === dayName)
-            
-            return {
-              unit,
-              weekPlan,
-              dayPlan,
-              weekNumber: weekPlan.week,
-              dayName
-            }
+          return {
+            unit,
+            weekPlan,
+            dayPlan,
+            weekNumber,
+            dayName
           }
         }
       }
@@ -123,10 +158,11 @@ const Syllabus = () => {
       } else {
         return 'planned'
       }
-    } else if (type === 'unit' && item.weeklyPlan) {
+    } else if (type === 'unit' && (item.weeks || item.weeklyPlan)) {
       // For units, check the date range of all weeks within the unit
-      const firstWeek = item.weeklyPlan[0]?.week
-      const lastWeek = item.weeklyPlan[item.weeklyPlan.length - 1]?.week
+      const weeks = getUnitWeeks(item)
+      const firstWeek = weeks[0]
+      const lastWeek = weeks[weeks.length - 1]
       
       if (firstWeek && lastWeek) {
         const { startDate } = getWeekDateRange(firstWeek)
@@ -199,6 +235,7 @@ const Syllabus = () => {
         setCurrentSyllabusType(null)
         setSelectedUnit(null)
         setSelectedWeek(null)
+        setSelectedDay(null)
         setHighlightedDate(null)
         setHighlightedGroup(null)
       }
@@ -211,29 +248,24 @@ const Syllabus = () => {
 
   const loadSpecificSyllabus = async (syllabusConfig) => {
     try {
-      const basePath = import.meta.env.PROD ? '/studentLMS' : ''
-      const response = await fetch(`${basePath}/data/${syllabusConfig.file}?t=${Date.now()}`)
-      const data = await response.json()
+      let data
+      try {
+        // Chunks are built by publish_data.py, so only published builds have
+        // current ones; the dev server reads the syllabus being edited
+        if (!import.meta.env.PROD) throw new Error('Development build')
+        // Just courseInfo and unit headers - units are loaded when opened
+        const response = await fetchData(getSyllabusIndexFile(syllabusConfig.file))
+        if (!response.ok) throw new Error(`HTTP ${response.status}`)
+        data = await response.json()
+      } catch (error) {
+        // No chunks - load the whole syllabus
+        const response = await fetchData(syllabusConfig.file)
+        data = await response.json()
+      }
       
+      // Day/week highlighting from schedule clicks is handled once the data is set
       setSyllabusData(data)
       setCurrentSyllabusType(syllabusConfig)
-      
-      // Handle URL parameters from schedule clicks for day/week highlighting
-      const date = searchParams.get('date')
-      const group = searchParams.get('group')
-      
-      if (date && group) {
-        setHighlightedDate(date)
-        setHighlightedGroup(group)
-        
-        // Find the exact week and day for this date and auto-navigate
-        const weekDayInfo = findWeekAndDayForDate(date)
-        if (weekDayInfo) {
-          setSelectedUnit(weekDayInfo.unit)
-          setSelectedWeek(weekDayInfo.weekPlan)
-          setViewMode('daily')
-        }
-      }
     } catch (error) {
       console.error('Error loading syllabus:', error)
       setSyllabusData(null)
@@ -249,17 +281,20 @@ const Syllabus = () => {
       setHighlightedDate(date)
       setHighlightedGroup(group)
       
-      // Find the exact week and day for this date
-      const weekDayInfo = findWeekAndDayForDate(date)
-      
-      if (weekDayInfo) {
-        // Auto-expand to show the relevant content
-        setSelectedUnit(weekDayInfo.unit.id)
-        setSelectedWeek(weekDayInfo.weekPlan)
-        
-        // Show daily detail view for specific day content
-        setViewMode('daily')
-      }
+      // Find the exact week and day for this date (loading its unit)
+      findWeekAndDayForDate(syllabusData, date)
+        .then(weekDayInfo => {
+          if (weekDayInfo) {
+            // Auto-expand to show the relevant content
+            setSelectedUnit(weekDayInfo.unit)
+            setSelectedWeek(weekDayInfo.weekPlan)
+            setSelectedDay(weekDayInfo)
+            
+            // Show daily detail view for specific day content
+            setViewMode('daily')
+          }
+        })
+        .catch(error => console.error('Error loading unit:', error))
     }
   }, [searchParams, syllabusData])
 
@@ -461,10 +496,7 @@ const Syllabus = () => {
               <div 
                 key={unit.id} 
                 className="border border-gray-200 rounded-lg p-4 hover:border-gray-300 cursor-pointer transition-all"
-                onClick={() => {
-                  setSelectedUnit(unit)
-                  setViewMode('units')
-                }}
+                onClick={() => openUnit(unit)}
               >
                 <div className="flex items-center justify-between">
                   <div className="flex items-center space-x-4">
@@ -476,11 +508,12 @@ const Syllabus = () => {
                     <div className="flex-1">
                       <div className="flex items-center gap-3 mb-1">
                         <h4 className="font-medium text-gray-900">{unit.title}</h4>
-                        {unit.weeklyPlan && unit.weeklyPlan.length > 0 && (
+                        {getUnitWeeks(unit).length > 0 && (
                           <span className="px-2 py-1 bg-green-100 text-green-800 text-xs rounded-full font-medium">
                             {(() => {
-                              const firstWeek = unit.weeklyPlan[0].week
-                              const lastWeek = unit.weeklyPlan[unit.weeklyPlan.length - 1].week
+                              const weeks = getUnitWeeks(unit)
+                              const firstWeek = weeks[0]
+                              const lastWeek = weeks[weeks.length - 1]
                               const { startDate } = getWeekDateRange(firstWeek)
                               const { endDate } = getWeekDateRange(lastWeek)
                               return `${startDate.toLocaleDateString('en-US', { month: 'short', day: 'numeric' })} - ${endDate.toLocaleDateString('en-US', { month: 'short', day: 'numeric' })}`
@@ -673,10 +706,7 @@ const Syllabus = () => {
                 <div 
                   key={unit.id} 
                   className="border border-gray-200 rounded-lg p-4 hover:border-gray-300 cursor-pointer transition-all"
-                  onClick={() => {
-                    setSelectedUnit(unit)
-                    setViewMode('units')
-                  }}
+                  onClick={() => openUnit(unit)}
                 >
                   <div className="flex items-center justify-between">
                     <div className="flex items-center space-x-4">
@@ -688,9 +718,9 @@ const Syllabus = () => {
                       <div className="flex-1">
                         <div className="flex items-center gap-3 mb-1">
                           <h4 className="font-medium text-gray-900">{unit.title}</h4>
-                          {unit.weeklyPlan && unit.weeklyPlan.length > 0 && (
+                          {getUnitWeeks(unit).length > 0 && (
                             <span className="px-2 py-1 bg-green-100 text-green-800 text-xs rounded-full font-medium">
-                              {unit.weeklyPlan.length} {unit.weeklyPlan.length === 1 ? 'week' : 'weeks'}
+                              {getUnitWeeks(unit).length} {getUnitWeeks(unit).length === 1 ? 'week' : 'weeks'}
                             </span>
                           )}
                         </div>
@@ -969,12 +999,9 @@ const Syllabus = () => {
   )
 
   const renderDayDetail = () => {
-    if (!highlightedDate) return null
-    
-    const weekDayInfo = findWeekAndDayForDate(highlightedDate)
-    if (!weekDayInfo) return null
+    if (!highlightedDate || !selectedDay) return null
 
-    const { unit, weekPlan, dayPlan, dayName } = weekDayInfo
+    const { unit, weekPlan, dayPlan, dayName } = selectedDay
     const dayDate = getDayDateInWeek(weekPlan.week, dayName)
 
     return (
@@ -1054,10 +1081,7 @@ const Syllabus = () => {
                 📅 View Full Week
               </button>
               <button
-                onClick={() => {
-                  setSelectedUnit(unit)
-                  setViewMode('units')
-                }}
+                onClick={() => openUnit(unit)}
                 className="btn-secondary"
               >
                 📚 View Unit
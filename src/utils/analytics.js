@@ -0,0 +1,139 @@
+// Dashboard figures: analytics.json in published builds, computed from the data
+// files on the dev server. analytics.json is built by publish_data.py and not
+// committed, so in development it would be missing or out of date.
+// buildAnalytics mirrors build_analytics.py - keep the two in step
+
+import { fetchData } from './dataFiles'
+
+// Lower bounds of the performance bands used on the dashboard
+const LEVELS = [['excellent', 90], ['good', 70], ['average', 50], ['needsImprovement', 0]]
+
+// Width of the score distribution buckets, in percent
+const BUCKET_WIDTH = 10
+
+// Percentage of a mark as a number (marks store it as text, e.g. '44.3')
+export const markPercentage = (mark) => {
+  const value = parseFloat(mark.percentage)
+  return Number.isNaN(value) ? 0 : value
+}
+
+// Mean rounded to one decimal, 0 when empty
+export const average = (values) =>
+  values.length ? Math.round((values.reduce((sum, v) => sum + v, 0) / values.length) * 10) / 10 : 0
+
+const levelOf = (percentage) => (LEVELS.find(([, lower]) => percentage >= lower) || LEVELS[LEVELS.length - 1])[0]
+
+const distribution = (percentages) => {
+  const buckets = new Array(100 / BUCKET_WIDTH).fill(0)
+  percentages.forEach(value => {
+    const index = Math.min(Math.max(Math.floor(value / BUCKET_WIDTH), 0), buckets.length - 1)
+    buckets[index] += 1
+  })
+  return buckets
+}
+
+const push = (map, key, value) => {
+  if (!map.has(key)) map.set(key, [])
+  map.get(key).push(value)
+}
+
+export const buildAnalytics = ({ students, groups, exams, marks, config }) => {
+  const activeGroups = config?.activeGroups || []
+  const groupOfStudent = new Map(students.map(s => [s.id, s.groupId]))
+  const byGroup = new Map()
+  const byExam = new Map()
+  const byStudent = new Map()
+  const levels = Object.fromEntries(LEVELS.map(([name]) => [name, 0]))
+  const percentages = []
+  const scores = []
+
+  marks.forEach(mark => {
+    const percentage = markPercentage(mark)
+    percentages.push(percentage)
+    scores.push(mark.score || 0)
+    levels[levelOf(percentage)] += 1
+    push(byExam, mark.examId, percentage)
+    push(byStudent, mark.studentId, percentage)
+    const groupId = groupOfStudent.get(mark.studentId)
+    if (groupId !== undefined && groupId !== null) push(byGroup, groupId, percentage)
+  })
+
+  const studentCounts = new Map()
+  students.forEach(s => studentCounts.set(s.groupId, (studentCounts.get(s.groupId) || 0) + 1))
+
+  const groupStats = groups.map(group => {
+    const studentCount = studentCounts.get(group.id) || 0
+    const groupMarks = byGroup.get(group.id) || []
+    const possible = studentCount * exams.length
+    return {
+      id: group.id,
+      name: group.name,
+      studentCount,
+      avgScore: average(groupMarks),
+      evaluations: groupMarks.length,
+      evaluationRate: possible ? Math.round((groupMarks.length / possible) * 1000) / 10 : 0
+    }
+  }).sort((a, b) => b.avgScore - a.avgScore)
+
+  const examStats = exams.map(exam => {
+    const examMarks = byExam.get(exam.id) || []
+    return {
+      id: exam.id,
+      name: exam.name,
+      type: exam.type,
+      maxScore: exam.maxScore,
+      date: exam.date,
+      avgScore: average(examMarks),
+      participantCount: examMarks.length,
+      assignedToGroups: exam.assignedGroups?.length ? exam.assignedGroups.length : groups.length,
+      distribution: distribution(examMarks)
+    }
+  }).sort((a, b) => b.avgScore - a.avgScore)
+
+  const studentStats = {}
+  byStudent.forEach((values, studentId) => {
+    studentStats[studentId] = { average: average(values), evaluated: values.length }
+  })
+
+  return {
+    totals: {
+      students: students.length,
+      activeStudents: students.filter(s => activeGroups.includes(String(s.groupId ?? '').toLowerCase())).length,
+      groups: groups.length,
+      exams: exams.length,
+      evaluations: marks.length,
+      overallAverage: average(percentages),
+      averageScore: average(scores)
+    },
+    levels,
+    bucketWidth: BUCKET_WIDTH,
+    groups: groupStats,
+    exams: examStats,
+    students: studentStats
+  }
+}
+
+const loadJson = async (name, fallback) => {
+  try {
+    const response = await fetchData(name)
+    return response.ok ? await response.json() : fallback
+  } catch (error) {
+    return fallback
+  }
+}
+
+// analytics.json when published, otherwise the same figures from the data files
+export const loadAnalytics = async () => {
+  if (import.meta.env.PROD) {
+    const published = await loadJson('analytics.json', null)
+    if (published) return published
+  }
+  const [students, groups, exams, marks, config] = await Promise.all([
+    loadJson('students.json', []),
+    loadJson('groups.json', []),
+    loadJson('exams.json', []),
+    loadJson('marks.json', []),
+    loadJson('teaching_config.json', {}),
+  ])
+  return buildAnalytics({ students, groups, exams, marks, config })
+}
@@ -0,0 +1,62 @@
+// Client for the local API served by api_server.py
+// Set VITE_API_URL (e.g. http://127.0.0.1:8765/api) to grade against live data;
+// without it the app keeps reading the static files in public/data
+
+export const apiUrl = import.meta.env.VITE_API_URL || ''
+
+export const apiAvailable = () => Boolean(apiUrl)
+
+// Saving marks needs the token api_server.py prints at startup. It comes from
+// VITE_API_TOKEN, or is asked for once and kept in localStorage
+const TOKEN_KEY = 'apiToken'
+
+const getToken = () => import.meta.env.VITE_API_TOKEN || localStorage.getItem(TOKEN_KEY) || ''
+
+const askToken = () => {
+  const token = window.prompt('API token (printed by api_server.py when it starts):')
+  if (token) localStorage.setItem(TOKEN_KEY, token.trim())
+  return Boolean(token)
+}
+
+const request = async (path, options = {}) => {
+  const response = await fetch(`${apiUrl}${path}`, {
+    ...options,
+    headers: { 'Content-Type': 'application/json', ...options.headers }
+  })
+  const data = await response.json()
+  if (!response.ok) {
+    const error = new Error(data.error || `Request failed (${response.status})`)
+    error.status = response.status
+    throw error
+  }
+  return data
+}
+
+// GET a JSON endpoint, e.g. getJson('/groups/nesma/students?page=1')
+export const getJson = (path) => request(path)
+
+// Every item of a paginated list endpoint
+export const getAll = async (path) => {
+  const separator = path.includes('?') ? '&' : '?'
+  const items = []
+  for (let page = 1; ; page++) {
+    const data = await request(`${path}${separator}page=${page}&pageSize=1000`)
+    items.push(...data.items)
+    if (items.length >= data.total || data.items.length === 0) return items
+  }
+}
+
+// Add or update the mark for a (student, exam) pair; returns the saved mark
+export const saveMark = async (studentId, examId, score) => {
+  const put = () => request('/marks', {
+    method: 'PUT',
+    headers: { Authorization: `Bearer ${getToken()}` },
+    body: JSON.stringify({ studentId, examId, score })
+  })
+  try {
+    return await put()
+  } catch (error) {
+    if (error.status !== 401 || import.meta.env.VITE_API_TOKEN || !askToken()) throw error
+    return put()
+  }
+}
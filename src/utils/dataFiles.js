@@ -0,0 +1,31 @@
+// Loads files from public/data through the manifest written by publish_data.py
+// Published files have content-hashed names, so the browser can cache them for good.
+// The dev server always uses the plain file names: a manifest left over from the
+// last publish would otherwise point at stale hashed copies
+
+const basePath = import.meta.env.PROD ? '/studentLMS' : ''
+
+let manifestPromise = null
+
+const loadManifest = () => {
+  if (!import.meta.env.PROD) return Promise.resolve({ files: {} })
+  if (!manifestPromise) {
+    // Always revalidate the manifest itself - it's the only file that changes name-in-place
+    manifestPromise = fetch(`${basePath}/data/data-manifest.json`, { cache: 'no-cache' })
+      .then(response => (response.ok ? response.json() : { files: {} }))
+      .catch(() => ({ files: {} }))
+  }
+  return manifestPromise
+}
+
+// URL of a data file, e.g. dataUrl('groups/nesma/marks.json')
+export const dataUrl = async (name) => {
+  const manifest = await loadManifest()
+  const published = manifest.files?.[name]
+  return `${basePath}/data/${published || name}`
+}
+
+// fetch() for a data file, returning the Response like fetch does
+export const fetchData = async (name, options) => {
+  return fetch(await dataUrl(name), options)
+}
@@ -137,3 +137,13 @@ export const hasGroupAccessToSyllabus = (groupName, syllabusId) => {
   const config = getGroupSyllabusConfig(groupName)
   return config.syllabusId === syllabusId
 }
+
+/**
+ * Get the index file of a syllabus, written by build_syllabus_chunks.py
+ * (courseInfo and unit headers; each header's `chunk` names its unit file)
+ * @param {string} file - Syllabus file name, e.g. 'syllabus_jolly_phonics.json'
+ * @returns {string} Data file path, e.g. 'syllabi/syllabus_jolly_phonics/index.json'
+ */
+export const getSyllabusIndexFile = (file) => {
+  return `syllabi/${file.replace(/\.json$/, '')}/index.json`
+}
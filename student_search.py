@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Student Search
+Name search that tolerates Arabic spelling variants, backed by an index
+kept in cache/student_search_index.json.
+
+Names are normalized before indexing and searching: diacritics and
+tatweel are removed, أ/إ/آ become ا, ة becomes ه and ى becomes ي. So
+"أسمة معازي" finds "أسمه معازي". Each normalized name is indexed by whole
+word and by character trigrams, and results are ranked: exact word >
+word prefix > similar spelling.
+
+The index is rebuilt automatically when students.json changes.
+
+Usage:
+    python student_search.py راشد الكليبي
+    python student_search.py "Abdullah" --group saipem1
+    python student_search.py darwish --marks      # also show each student's marks
+    python student_search.py --rebuild            # force an index rebuild
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from bisect import bisect_left
+
+from data_store import get_store, load_json
+
+INDEX_FILE = os.path.join("cache", "student_search_index.json")
+INDEX_VERSION = 1
+
+# Harakat, tanween, shadda, sukun, superscript alef and Quranic marks
+DIACRITICS = re.compile('[ؐ-ًؚ-ٰٟۖ-ۭ]')
+TATWEEL = 'ـ'
+LETTER_VARIANTS = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ة': 'ه',
+    'ى': 'ي',
+})
+TOKEN_SPLIT = re.compile(r'[^\w]+')
+
+# Score of a query word matching a name word, by kind of match
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.8
+SIMILAR_SCORE = 0.6
+
+# Share of a query word's trigrams a name must contain to count as similar
+MIN_SIMILARITY = 0.5
+
+
+def normalize(text):
+    """Fold Arabic spelling variants and case: 'أسمة' -> 'اسمه'"""
+    text = DIACRITICS.sub('', str(text or '')).replace(TATWEEL, '')
+    return ' '.join(text.translate(LETTER_VARIANTS).lower().split())
+
+
+def tokenize(text):
+    """Normalized words of a name"""
+    return [t for t in TOKEN_SPLIT.split(normalize(text)) if t]
+
+
+def trigrams(token):
+    """Character trigrams of a word, padded so short words still have some"""
+    padded = f" {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def file_hash(filepath):
+    """Content hash of a file, '' if missing"""
+    try:
+        with open(filepath, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return ''
+
+
+class StudentSearch:
+    """Word and trigram index over student names"""
+
+    def __init__(self, students, source_hash=''):
+        self.source_hash = source_hash
+        self.students = {}
+        self.words = {}
+        self.grams = {}
+        self.identifiers = {}
+        for student in students:
+            self._add(student)
+        self.vocabulary = sorted(self.words)
+
+    def _add(self, student):
+        student_id = student.get('id')
+        if student_id in self.students:
+            return
+        self.students[student_id] = student
+        for key in (student_id, student.get('studentId')):
+            if key not in (None, ''):
+                self.identifiers.setdefault(str(key).lower(), []).append(student_id)
+        for token in set(tokenize(student.get('name', ''))):
+            self.words.setdefault(token, []).append(student_id)
+            for gram in trigrams(token):
+                self.grams.setdefault(gram, set()).add(student_id)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_dict(self):
+        return {
+            'version': INDEX_VERSION,
+            'sourceHash': self.source_hash,
+            'students': list(self.students.values()),
+            'words': self.words,
+            'grams': {gram: sorted(ids) for gram, ids in self.grams.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        index = cls([], data.get('sourceHash', ''))
+        index.students = {s.get('id'): s for s in data['students']}
+        index.words = data['words']
+        index.grams = {gram: set(ids) for gram, ids in data['grams'].items()}
+        for student in data['students']:
+            for key in (student.get('id'), student.get('studentId')):
+                if key not in (None, ''):
+                    index.identifiers.setdefault(str(key).lower(), []).append(student.get('id'))
+        index.vocabulary = sorted(index.words)
+        return index
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _word_scores(self, token):
+        """{student_id: best score} for one query word"""
+        scores = {}
+        for student_id in self.words.get(token, []):
+            scores[student_id] = EXACT_SCORE
+
+        # Prefix matches via the sorted vocabulary
+        i = bisect_left(self.vocabulary, token)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(token):
+            for student_id in self.words[self.vocabulary[i]]:
+                scores.setdefault(student_id, PREFIX_SCORE)
+            i += 1
+
+        # Similar spellings via shared trigrams
+        query_grams = trigrams(token)
+        shared = {}
+        for gram in query_grams:
+            for student_id in self.grams.get(gram, ()):
+                shared[student_id] = shared.get(student_id, 0) + 1
+        for student_id, count in shared.items():
+            similarity = count / len(query_grams)
+            if similarity >= MIN_SIMILARITY and student_id not in scores:
+                scores[student_id] = SIMILAR_SCORE * similarity
+        return scores
+
+    def search(self, query, limit=20, group_id=None):
+        """Best matching students for a name, id or student number
+
+        Returns a list of (score, student), best first. A student must match
+        every word of the query; an exact id or number match ranks first.
+        """
+        query = str(query or '').strip()
+        if not query:
+            return []
+
+        totals = {}
+        tokens = tokenize(query)
+        for n, token in enumerate(dict.fromkeys(tokens)):
+            word_scores = self._word_scores(token)
+            if n == 0:
+                totals = word_scores
+            else:
+                totals = {sid: totals[sid] + score for sid, score in word_scores.items() if sid in totals}
+        for student_id in self.identifiers.get(query.lower(), []):
+            totals[student_id] = totals.get(student_id, 0) + len(tokens) + 1
+
+        results = []
+        for student_id, score in totals.items():
+            student = self.students[student_id]
+            if group_id and student.get('groupId') != group_id:
+                continue
+            results.append((round(score / max(len(tokens), 1), 3), student))
+        results.sort(key=lambda r: (-r[0], r[1].get('name', '')))
+        return results[:limit] if limit else results
+
+
+def build_index(store=None, save=True):
+    """Build the index from students.json (and save it to INDEX_FILE)"""
+    store = store or get_store()
+    index = StudentSearch(store.students, file_hash(store.path('students')))
+    if save:
+        os.makedirs(os.path.dirname(INDEX_FILE), exist_ok=True)
+        with open(INDEX_FILE, 'w', encoding='utf-8') as f:
+            json.dump(index.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+    return index
+
+
+def get_index(store=None):
+    """Saved index if it matches students.json, otherwise a fresh one"""
+    store = store or get_store()
+    data = load_json(INDEX_FILE, default={})
+    if (isinstance(data, dict) and data.get('version') == INDEX_VERSION
+            and data.get('sourceHash') == file_hash(store.path('students'))):
+        return StudentSearch.from_dict(data)
+    return build_index(store)
+
+
+def search_students(query, limit=20, group_id=None, store=None):
+    """Search students by name, id or student number, best match first"""
+    return [student for _, student in get_index(store).search(query, limit, group_id)]
+
+
+def print_results(results, store, show_marks=False):
+    """Print search results, optionally with each student's marks"""
+    print(f"\n👨‍🎓 FOUND {len(results)} STUDENT(S):")
+    print("-" * 90)
+    print(f"{'Score':<7} {'ID':<12} {'No.':<6} {'Name':<45} {'Group':<12}")
+    print("-" * 90)
+    for score, student in results:
+        print(f"{score:<7.2f} {student.get('id', 'N/A'):<12} {str(student.get('studentId', '')):<6} "
+              f"{student.get('name', 'N/A'):<45} {student.get('groupId', 'N/A'):<12}")
+        if show_marks:
+            marks = store.student_marks(student.get('id'))
+            if not marks:
+                print(f"{'':<7} 📝 No marks")
+            for mark in marks:
+                exam = store.exam(mark.get('examId')) or {}
+                print(f"{'':<7} 📝 {exam.get('name', mark.get('examId'))}: "
+                      f"{mark.get('score')}/{mark.get('maxScore')} ({mark.get('percentage')}%)")
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    group_id = None
+    limit = 20
+    show_marks = False
+    rebuild = False
+    words = []
+
+    while args:
+        arg = args.pop(0)
+        if arg == '--group' and args:
+            group_id = args.pop(0)
+        elif arg == '--limit' and args and args[0].isdigit():
+            limit = int(args.pop(0))
+        elif arg == '--marks':
+            show_marks = True
+        elif arg == '--rebuild':
+            rebuild = True
+        else:
+            words.append(arg)
+
+    store = get_store()
+    if rebuild:
+        index = build_index(store)
+        print(f"✅ Indexed {len(index.students)} students ({len(index.words)} words) into {INDEX_FILE}")
+        if not words:
+            return
+
+    if not words:
+        print(__doc__)
+        sys.exit(1)
+
+    query = ' '.join(words)
+    print(f"🔍 Searching for {query}...")
+    results = get_index(store).search(query, limit, group_id)
+    if not results:
+        print("❌ No matches found.")
+        return
+    print_results(results, store, show_marks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import json
+
+from build_group_shards import write_shards
+from data_store import DataStore
+
+
+def test_students_without_group_are_counted_not_sharded(tmp_path):
+    files = {
+        'groups': [{'id': 'g1', 'name': 'Group 1'}],
+        'students': [
+            {'id': 's1', 'name': 'A', 'groupId': 'g1'},
+            {'id': 's2', 'name': 'B', 'groupId': None},
+            {'id': 's3', 'name': 'C'},
+        ],
+        'exams': [],
+        'marks': [
+            {'id': 'm1', 'studentId': 's1', 'examId': 'e1'},
+            {'id': 'm2', 'studentId': 's2', 'examId': 'e1'},
+            {'id': 'm3', 'studentId': 'gone', 'examId': 'e1'},
+        ],
+    }
+    for name, data in files.items():
+        (tmp_path / f'{name}.json').write_text(json.dumps(data), encoding='utf-8')
+
+    manifest, _ = write_shards(DataStore(str(tmp_path)))
+
+    assert list(manifest['groups']) == ['g1']
+    assert manifest['totals']['unassignedStudents'] == 2
+    assert manifest['totals']['unassignedMarks'] == 2
+    marks = json.loads((tmp_path / 'groups' / 'g1' / 'marks.json').read_text(encoding='utf-8'))
+    assert [m['id'] for m in marks] == ['m1']
@@ -0,0 +1,89 @@
+"""Merge mode of scripts/excel_to_json.py"""
+
+import json
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+from data_store import get_store  # noqa: E402
+from excel_to_json import MergeError, convert_sheet, diff_records, merge_outputs  # noqa: E402
+
+
+def write(data_dir, name, data):
+    with open(os.path.join(data_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def read(data_dir, name):
+    with open(os.path.join(data_dir, f"{name}.json"), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def merge(key, frame, data_dir):
+    """Convert one sheet and merge it, as --merge does"""
+    _, _, records, present, _ = convert_sheet(key, 'Sheet', frame)
+    return merge_outputs({key: records}, data_dir, {key: [present] * len(records)})[key]
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    # Backups are written relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    data_dir = str(tmp_path / 'data')
+    os.makedirs(data_dir)
+    write(data_dir, 'groups', [{'id': 'saipem6', 'name': 'SAIPEM6'}])
+    write(data_dir, 'students', [{'id': 's001', 'name': 'Ali', 'groupId': 'saipem6'}])
+    write(data_dir, 'exams', [{'id': 'e1', 'name': 'Quiz', 'maxScore': 70.0}])
+    write(data_dir, 'marks', [{'id': 'm1', 'studentId': 's001', 'examId': 'e1', 'score': 60.0,
+                               'maxScore': 70.0, 'percentage': '85.7', 'date': '2025-09-05'}])
+    return data_dir
+
+
+def test_students_without_student_id_are_each_inserted(data_dir):
+    frame = pd.DataFrame({'name': ['Omar', 'Hassan', 'Saleh'], 'email': ['', '', ''],
+                          'group_id': ['saipem6'] * 3})
+
+    assert merge('students', frame, data_dir) == (3, 0, 0)
+    assert [s['name'] for s in read(data_dir, 'students')] == ['Ali', 'Omar', 'Hassan', 'Saleh']
+
+
+def test_student_without_student_id_matches_on_name_and_group():
+    existing = [{'id': 's001', 'name': 'Ali', 'groupId': 'saipem6', 'studentId': '', 'email': 'a@x'}]
+    incoming = [{'id': 'new', 'name': 'Ali', 'groupId': 'saipem6', 'studentId': '', 'email': 'ali@x'}]
+
+    inserts, updates, _ = diff_records(existing, incoming, ('studentId', 'groupId'), ('name', 'groupId'))
+
+    assert inserts == []
+    assert updates[0][1]['id'] == 's001'
+    assert updates[0][1]['email'] == 'ali@x'
+
+
+@pytest.mark.parametrize('names', [['Omar', 'Omar'], ['', 'Omar']])
+def test_repeated_or_blank_keys_stop_the_merge(data_dir, names):
+    frame = pd.DataFrame({'name': names, 'group_id': ['saipem6', 'saipem6']})
+
+    with pytest.raises(MergeError):
+        merge('students', frame, data_dir)
+    assert len(read(data_dir, 'students')) == 1
+
+
+def test_mark_update_keeps_missing_columns_and_recomputes_percentage(data_dir):
+    frame = pd.DataFrame({'student_id': ['s001'], 'exam_id': ['e1'], 'score': [70]})
+
+    assert merge('marks', frame, data_dir) == (0, 1, 0)
+    mark = get_store(data_dir).marks_by_id['m1']
+    assert mark['score'] == 70.0
+    assert mark['percentage'] == '100.0'
+    assert mark['date'] == '2025-09-05'
+
+
+def test_unchanged_mark_is_left_alone(data_dir):
+    frame = pd.DataFrame({'student_id': ['s001'], 'exam_id': ['e1'], 'score': [60]})
+
+    assert merge('marks', frame, data_dir) == (0, 0, 1)
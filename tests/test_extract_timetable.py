@@ -0,0 +1,33 @@
+from extract_timetable import SOURCE, apply_changes, diff_day
+
+
+def slot(time, group, source=None):
+    entry = {'time': time, 'group': group, 'subject': 'English', 'type': 'Lecture'}
+    if source:
+        entry['source'] = source
+    return entry
+
+
+def pdf(time, group):
+    return {'time': time, 'group': group, 'subject': 'English'}
+
+
+def test_manual_slots_are_never_replaced_or_pruned():
+    day = [slot('08:00', 'DYEY'), slot('09:00', 'DABAL'), slot('10:00', 'SAM1', SOURCE)]
+    extracted = {'08:00': pdf('08:00', 'NESMA'), '11:00': pdf('11:00', 'SAM5')}
+
+    changes = diff_day(day, extracted, prune=True)
+    assert [(kind, time) for kind, time, *_ in changes] == [
+        ('kept', '08:00'), ('added', '11:00'), ('removed', '10:00')]
+
+    updated = {s['time']: s for s in apply_changes(day, changes)}
+    assert updated['08:00']['group'] == 'DYEY'
+    assert '09:00' in updated and '10:00' not in updated
+    assert updated['11:00']['source'] == SOURCE
+
+
+def test_extracted_slots_follow_the_pdf():
+    day = [slot('08:00', 'DYEY', SOURCE)]
+    changes = diff_day(day, {'08:00': pdf('08:00', 'NESMA')})
+    assert [kind for kind, *_ in changes] == ['changed']
+    assert apply_changes(day, changes)[0]['group'] == 'NESMA'
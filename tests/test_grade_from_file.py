@@ -0,0 +1,20 @@
+from grade_from_file import read_rows
+
+
+def test_reads_excel_arabic_csv(tmp_path):
+    path = tmp_path / 'scores.csv'
+    path.write_bytes('الاسم,Student ID,Score\nعلي حسن,3,18\n'.encode('cp1256'))
+
+    rows, columns = read_rows(str(path))
+
+    assert columns == {'studentId': 'Student ID', 'score': 'Score'}
+    assert rows == [{'studentId': '3', 'score': '18'}]
+
+
+def test_reads_utf8_csv_with_bom(tmp_path):
+    path = tmp_path / 'scores.csv'
+    path.write_bytes('id,score\nn001,7\n'.encode('utf-8-sig'))
+
+    rows, _ = read_rows(str(path))
+
+    assert rows == [{'id': 'n001', 'score': '7'}]
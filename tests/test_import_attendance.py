@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+from data_store import DataStore
+from import_attendance import StudentMatcher
+
+
+@pytest.fixture
+def store(tmp_path):
+    files = {
+        'groups': [{'id': 'saipem5'}, {'id': 'saipem6'}],
+        'students': [
+            {'id': 's1', 'name': 'Ali Hassan', 'groupId': 'saipem5', 'studentId': '3'},
+            {'id': 's2', 'name': 'Omar Saleh', 'groupId': 'saipem6', 'studentId': '3'},
+        ],
+        'exams': [],
+        'marks': [],
+    }
+    for name, data in files.items():
+        (tmp_path / f'{name}.json').write_text(json.dumps(data), encoding='utf-8')
+    return DataStore(str(tmp_path))
+
+
+def test_number_fallback_stays_in_the_sheet_group(store):
+    matcher = StudentMatcher(store)
+    assert matcher.match('Unknown Name', '3', 'saipem6')['id'] == 's2'
+    assert matcher.match('Unknown Name', '3', 'saipem5')['id'] == 's1'
+
+
+def test_number_fallback_needs_a_group(store):
+    assert StudentMatcher(store).match('Unknown Name', '3', None) is None
@@ -0,0 +1,46 @@
+import json
+
+import mark_journal
+
+
+def test_append_after_torn_line_keeps_new_events(tmp_path):
+    path = tmp_path / mark_journal.JOURNAL_FILE
+    first = mark_journal.make_event('add', {'id': 'm1', 'score': 10})
+    path.write_text(json.dumps(first) + '\n{"op": "add", "mark": {"id": "m2"', encoding='utf-8')
+
+    second = mark_journal.make_event('add', {'id': 'm3', 'score': 30})
+    assert mark_journal.append_events(str(tmp_path), [second]) == 1
+
+    events, end = mark_journal.read_events(str(tmp_path))
+    assert [e['mark']['id'] for e in events] == ['m1', 'm3']
+    assert end == path.stat().st_size
+
+
+def test_append_to_clean_journal_adds_no_blank_lines(tmp_path):
+    events = [mark_journal.make_event('delete', mark_id=f'm{i}') for i in range(3)]
+    mark_journal.append_events(str(tmp_path), events[:1])
+    _, offset = mark_journal.read_events(str(tmp_path))
+    mark_journal.append_events(str(tmp_path), events[1:])
+
+    assert mark_journal.count_events(str(tmp_path)) == 3
+    later, _ = mark_journal.read_events(str(tmp_path), offset)
+    assert [e['id'] for e in later] == ['m1', 'm2']
+    assert b'\n\n' not in (tmp_path / mark_journal.JOURNAL_FILE).read_bytes()
+
+
+def test_compact_pending_folds_journal_into_snapshot(tmp_path, monkeypatch):
+    from data_store import DataStore
+
+    monkeypatch.chdir(tmp_path)  # backups/ is relative to the working directory
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    for name in ('students', 'groups', 'exams', 'marks'):
+        (data_dir / f'{name}.json').write_text('[]', encoding='utf-8')
+    store = DataStore(str(data_dir))
+    assert mark_journal.compact_pending(store) == 0
+
+    store.upsert_mark({'id': 'm1', 'studentId': 's1', 'examId': 'e1', 'score': 5})
+    store.save('marks')
+    assert mark_journal.compact_pending(store) == 1
+    assert mark_journal.journal_size(str(data_dir)) == 0
+    assert [m['id'] for m in json.loads((data_dir / 'marks.json').read_text(encoding='utf-8'))] == ['m1']
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from data_store import DataStore
+from phonics_mastery import MasteryTracker
+
+SOUNDS = ['s', 'a', 't', 'i', 'p', 'n']
+GROUPS = {1: 0b111, 2: 0b111000}
+
+
+def write(data_dir, name, data):
+    (data_dir / f'{name}.json').write_text(json.dumps(data), encoding='utf-8')
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    write(tmp_path, 'groups', [{'id': 'g1'}])
+    write(tmp_path, 'students', [{'id': 's1', 'name': 'A', 'groupId': 'g1'}])
+    write(tmp_path, 'exams', [{'id': 'q1', 'name': 'Quiz', 'maxScore': 10, 'phonicsGroups': [1]}])
+    write(tmp_path, 'marks', [{'id': 'm1', 'studentId': 's1', 'examId': 'q1', 'score': 9,
+                               'maxScore': 10, 'percentage': '90.0', 'date': '2025-09-01'}])
+    return tmp_path
+
+
+def sync(tracker, data_dir):
+    # A fresh tracker per run, as update() loads it from the state file
+    tracker = MasteryTracker(SOUNDS, GROUPS, tracker.to_dict())
+    return tracker, tracker.sync(DataStore(str(data_dir)))
+
+
+def test_unchanged_data_applies_nothing(data_dir):
+    tracker, changes = sync(MasteryTracker(SOUNDS, GROUPS), data_dir)
+    assert changes == 1 and tracker.students['s1'] == (0b111, 0b111)
+    _, changes = sync(tracker, data_dir)
+    assert changes == 0
+
+
+def test_changed_exams_reconcile_the_tested_sounds(data_dir):
+    tracker, _ = sync(MasteryTracker(SOUNDS, GROUPS), data_dir)
+    write(data_dir, 'exams', [{'id': 'q1', 'name': 'Quiz', 'maxScore': 10, 'phonicsGroups': [2]}])
+
+    tracker, changes = sync(tracker, data_dir)
+    assert changes == 1
+    assert tracker.students['s1'] == (0b111000, 0b111000)
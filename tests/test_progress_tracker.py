@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from data_store import DataStore
+from progress_tracker import ProgressTracker
+
+
+def mark(mark_id, student_id, exam_id, percentage, day):
+    return {'id': mark_id, 'studentId': student_id, 'examId': exam_id, 'score': percentage,
+            'maxScore': 100, 'percentage': f'{percentage:.1f}', 'date': day}
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    files = {
+        'groups': [{'id': 'g1'}],
+        'students': [{'id': 's1', 'name': 'A', 'groupId': 'g1'}],
+        'exams': [{'id': 'e1', 'maxScore': 100}, {'id': 'e2', 'maxScore': 100}],
+        'marks': [mark('m1', 's1', 'e1', 80, '2025-09-01')],
+    }
+    for name, data in files.items():
+        (tmp_path / f'{name}.json').write_text(json.dumps(data), encoding='utf-8')
+    return str(tmp_path)
+
+
+def test_sync_reads_only_new_journal_events(data_dir):
+    tracker = ProgressTracker()
+    assert tracker.sync(DataStore(data_dir)) == 1
+    assert tracker.sync(DataStore(data_dir)) == 0
+
+    writer = DataStore(data_dir)
+    writer.upsert_mark(mark('m2', 's1', 'e2', 40, '2025-09-20'))
+    writer.save('marks')
+
+    assert tracker.sync(DataStore(data_dir)) == 1
+    assert [value for _, value, _ in tracker.students['s1']] == [80.0, 40.0]
+    assert tracker.source['journalOffset'] > 0
+
+
+def test_sync_reconciles_after_compaction(data_dir):
+    tracker = ProgressTracker()
+    tracker.sync(DataStore(data_dir))
+
+    writer = DataStore(data_dir)
+    writer.delete_mark('m1')
+    writer.upsert_mark(mark('m2', 's1', 'e2', 40, '2025-09-20'))
+    writer.write_snapshot('marks')
+
+    assert tracker.sync(DataStore(data_dir)) == 2
+    assert list(tracker.marks) == ['s1|e2']
+    assert tracker.source['journalOffset'] == 0
@@ -0,0 +1,34 @@
+from remove_duplicate_students import DEFAULT_MIN_SCORE, cluster_proposals, core_name, find_duplicates
+
+
+def student(student_id, name, group_id, number, enrolled):
+    return {'id': student_id, 'name': name, 'groupId': group_id, 'studentId': number, 'dateEnrolled': enrolled}
+
+
+def test_yeh_spellings_and_article_fold_together():
+    assert core_name('راشد محمد يحيى الكليبي') == core_name('راشد محمد يحي كليبي')
+
+
+def test_cross_group_spelling_variant_is_proposed():
+    students = [
+        student('s5_rashid', 'راشد محمد يحيى الكليبي', 'saipem5', '7', '2025-09-07'),
+        student('s020', 'راشد محمد يحي كليبي', 'saipem6', '24', '2024-09-01'),
+        student('s019', 'أحمد بن محمد بن يحي كليبي', 'saipem6', '22', '2025-09-07'),
+    ]
+    proposals = find_duplicates(students, DEFAULT_MIN_SCORE)
+    assert [(a['id'], b['id']) for _, _, a, b in proposals] in ([('s5_rashid', 's020')], [('s020', 's5_rashid')])
+
+
+class NoMarks:
+    def student_marks(self, student_id):
+        return []
+
+
+def test_chained_proposals_only_merge_direct_pairs():
+    a = student('a', 'A', 'g1', '1', '2025-01-01')
+    b = student('b', 'B', 'g1', '2', '2025-01-02')
+    c = student('c', 'C', 'g1', '3', '2025-01-03')
+    merges, review = cluster_proposals([(0.9, [], a, b), (0.9, [], b, c)], NoMarks())
+
+    assert [(keep['id'], [d['id'] for d in dups]) for keep, dups in merges] == [('a', ['b'])]
+    assert [(keep['id'], [m['id'] for m in members]) for keep, members in review] == [('a', ['c'])]
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Validate Data
+Checks the data files against each other in a single pass over each file
+and reports every problem found:
+
+    errors:   orphan marks, unknown exams, duplicate (student, exam) marks,
+              scores above maxScore, duplicate IDs, active groups missing
+              from groups.json
+    warnings: percentages that don't match score/maxScore, marks whose
+              maxScore differs from the exam's, students in unknown groups,
+              exams assigned to unknown groups, IDs that don't follow the
+              usual formats
+
+Usage:
+    python validate_data.py                       # summary + problems
+    python validate_data.py --json report.json    # also write a JSON report
+    python validate_data.py --json -              # JSON report to stdout only
+
+Exits with status 1 when there are errors, so it can gate a publish.
+"""
+
+import json
+import os
+import re
+import sys
+
+from data_store import get_store, load_json
+
+# Expected ID formats. 8 hex characters are IDs generated by excel_to_json.py
+GENERATED_ID = r'[0-9a-f]{8}'
+ID_FORMATS = {
+    'students': re.compile(rf'^(s\d{{3}}(_new\d*)?|n\d{{3}}|[a-z]+\d*_\d{{3}}|{GENERATED_ID})$'),
+    'marks': re.compile(rf'^(mark_\d{{8}}_\d{{6}}_[0-9a-f]{{8}}|{GENERATED_ID})$'),
+    'exams': re.compile(rf'^(exam_\d{{8}}_\d{{6}}_[0-9a-f]{{8}}(_[a-z0-9_]+)?|{GENERATED_ID})$'),
+    'groups': re.compile(r'^[a-z0-9_]+$'),
+}
+
+# Largest allowed gap between a stored percentage and score/maxScore
+# (percentages are stored rounded to one decimal)
+PERCENTAGE_TOLERANCE = 0.051
+
+ERROR_CHECKS = {
+    'orphan_mark', 'unknown_exam', 'duplicate_mark', 'score_out_of_range',
+    'duplicate_id', 'missing_active_group', 'missing_id',
+}
+
+
+class Report:
+    """Collects issues and counts them per check"""
+
+    def __init__(self):
+        self.issues = []
+        self.counts = {}
+
+    def add(self, check, file, record_id, message, **details):
+        self.issues.append({
+            'check': check,
+            'severity': 'error' if check in ERROR_CHECKS else 'warning',
+            'file': file,
+            'id': record_id,
+            'message': message,
+            **details
+        })
+        self.counts[check] = self.counts.get(check, 0) + 1
+
+    @property
+    def errors(self):
+        return sum(1 for issue in self.issues if issue['severity'] == 'error')
+
+    @property
+    def warnings(self):
+        return len(self.issues) - self.errors
+
+    def to_dict(self, totals):
+        return {
+            'valid': self.errors == 0,
+            'totals': totals,
+            'summary': {'errors': self.errors, 'warnings': self.warnings, 'checks': self.counts},
+            'issues': self.issues
+        }
+
+
+def check_ids(report, name, records):
+    """Missing, duplicate and badly formatted IDs; returns the set of IDs"""
+    seen = set()
+    pattern = ID_FORMATS[name]
+    for position, record in enumerate(records):
+        record_id = record.get('id')
+        if record_id in (None, ''):
+            report.add('missing_id', f"{name}.json", None, f"Record #{position + 1} has no id")
+            continue
+        record_id = str(record_id)
+        if record_id in seen:
+            report.add('duplicate_id', f"{name}.json", record_id, f"ID {record_id} is used more than once")
+        seen.add(record_id)
+        if not pattern.match(record_id):
+            report.add('invalid_id_format', f"{name}.json", record_id, f"ID {record_id} doesn't match the usual format")
+    return seen
+
+
+def validate(store):
+    """Run every check; returns (report, totals)"""
+    report = Report()
+    students, groups, exams, marks = store.students, store.groups, store.exams, store.marks
+    config = load_json(os.path.join(store.data_dir, 'teaching_config.json'), default={})
+
+    student_ids = check_ids(report, 'students', students)
+    group_ids = check_ids(report, 'groups', groups)
+    check_ids(report, 'exams', exams)
+    check_ids(report, 'marks', marks)
+    exams_by_id = {str(e.get('id')): e for e in exams}
+
+    for group_id in (config.get('activeGroups', []) if isinstance(config, dict) else []):
+        if group_id not in group_ids:
+            report.add('missing_active_group', 'teaching_config.json', group_id,
+                       f"Active group {group_id} is not in groups.json")
+
+    for student in students:
+        if student.get('groupId') not in group_ids:
+            report.add('unknown_group', 'students.json', student.get('id'),
+                       f"Student {student.get('id')} is in unknown group {student.get('groupId')}")
+
+    for exam in exams:
+        for group_id in exam.get('assignedGroups') or []:
+            if group_id not in group_ids:
+                report.add('unknown_group', 'exams.json', exam.get('id'),
+                           f"Exam {exam.get('id')} is assigned to unknown group {group_id}")
+
+    pairs = {}
+    for mark in marks:
+        mark_id = mark.get('id')
+        student_id = mark.get('studentId')
+        exam_id = mark.get('examId')
+
+        if str(student_id) not in student_ids:
+            report.add('orphan_mark', 'marks.json', mark_id, f"Mark {mark_id} belongs to unknown student {student_id}",
+                       studentId=student_id)
+
+        exam = exams_by_id.get(str(exam_id))
+        if exam is None:
+            report.add('unknown_exam', 'marks.json', mark_id, f"Mark {mark_id} is for unknown exam {exam_id}",
+                       examId=exam_id)
+
+        key = (student_id, exam_id)
+        if key in pairs:
+            report.add('duplicate_mark', 'marks.json', mark_id,
+                       f"Mark {mark_id} duplicates {pairs[key]} for student {student_id}",
+                       studentId=student_id, examId=exam_id, duplicateOf=pairs[key])
+        else:
+            pairs[key] = mark_id
+
+        score = mark.get('score')
+        max_score = mark.get('maxScore') or (exam or {}).get('maxScore')
+        if not isinstance(score, (int, float)) or not isinstance(max_score, (int, float)) or max_score <= 0:
+            report.add('score_out_of_range', 'marks.json', mark_id,
+                       f"Mark {mark_id} has score {score!r} / maxScore {max_score!r}")
+            continue
+        if exam is not None and isinstance(exam.get('maxScore'), (int, float)) and mark.get('maxScore') not in (None, exam['maxScore']):
+            report.add('max_score_mismatch', 'marks.json', mark_id,
+                       f"Mark {mark_id} has maxScore {mark.get('maxScore')} but the exam's is {exam['maxScore']}")
+        if not 0 <= score <= max_score:
+            report.add('score_out_of_range', 'marks.json', mark_id,
+                       f"Mark {mark_id} score {score} is outside 0-{max_score}", score=score, maxScore=max_score)
+
+        expected = score / max_score * 100
+        try:
+            stored = float(mark.get('percentage'))
+        except (TypeError, ValueError):
+            stored = None
+        if stored is None or abs(stored - expected) > PERCENTAGE_TOLERANCE:
+            report.add('percentage_mismatch', 'marks.json', mark_id,
+                       f"Mark {mark_id} percentage {mark.get('percentage')!r} should be {expected:.1f}",
+                       percentage=mark.get('percentage'), expected=f"{expected:.1f}")
+
+    totals = {'students': len(students), 'groups': len(groups), 'exams': len(exams), 'marks': len(marks)}
+    return report, totals
+
+
+def print_report(report, totals):
+    """Human-readable summary"""
+    print("🔎 DATA VALIDATION")
+    print("=" * 60)
+    print(f"📊 Checked {totals['students']} students, {totals['groups']} groups, "
+          f"{totals['exams']} exams, {totals['marks']} marks")
+
+    for issue in report.issues:
+        icon = "❌" if issue['severity'] == 'error' else "⚠️"
+        print(f"{icon} [{issue['check']}] {issue['message']}")
+
+    if report.counts:
+        print("\n📋 Summary:")
+        for check, count in sorted(report.counts.items()):
+            print(f"   • {check}: {count}")
+    if report.errors:
+        print(f"\n❌ {report.errors} error(s), {report.warnings} warning(s)")
+    else:
+        print(f"\n✅ No errors ({report.warnings} warning(s))")
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    json_target = args[args.index('--json') + 1] if '--json' in args and args.index('--json') + 1 < len(args) else None
+
+    report, totals = validate(get_store())
+    result = report.to_dict(totals)
+
+    if json_target == '-':
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print_report(report, totals)
+        if json_target:
+            with open(json_target, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+            print(f"📁 Report saved to {json_target}")
+
+    sys.exit(1 if report.errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,35 @@
+import fs from 'fs'
+import path from 'path'
 import { defineConfig } from 'vite'
 import react from '@vitejs/plugin-react'
 
+// Files in public/data the site never reads: the mark journal, file_lock lock
+// files, ID sequences and old backups. Vite copies all of public/, so they are
+// removed from the build (see publish_data.py)
+const INTERNAL_DATA = [/^marks\.journal\.jsonl$/, /\.lock$/, /^id_sequences\.json$/, /backup/]
+
+const pruneInternalData = () => {
+  let dataDir
+  return {
+    name: 'prune-internal-data',
+    apply: 'build',
+    configResolved(config) {
+      dataDir = path.resolve(config.root, config.build.outDir, 'data')
+    },
+    closeBundle() {
+      if (!fs.existsSync(dataDir)) return
+      for (const name of fs.readdirSync(dataDir)) {
+        if (INTERNAL_DATA.some(pattern => pattern.test(name))) {
+          fs.rmSync(path.join(dataDir, name), { recursive: true, force: true })
+        }
+      }
+    },
+  }
+}
+
 // https://vitejs.dev/config/
 export default defineConfig({
-  plugins: [react()],
+  plugins: [react(), pruneInternalData()],
   base: process.env.NODE_ENV === 'production' ? '/studentLMS/' : '/',
   build: {
     outDir: 'dist',